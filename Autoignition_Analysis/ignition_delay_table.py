@@ -0,0 +1,35 @@
+"""
+Tabulating the ignition time delay of methane-air mixtures over temperature, pressure and equivalence ratio
+"""
+
+import os
+import sys
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import cantera as ct
+from combustion import plots
+from combustion.ignition_table import load_or_build
+
+
+t_end = 10
+T_range = (950, 1450) # K
+P_range = (1*ct.one_atm, 40*ct.one_atm)
+phi_range = (0.5, 2.0)
+tol = 0.05 # largest estimated error in ln(tau), about 5 %
+integration = 'auto' # 'dense' or 'sparse' reactor integration, see combustion.reactors
+
+table_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ignition_table_ch4.npz')
+
+if __name__ == '__main__':
+
+	# the grid is refined where interpolation is not accurate enough, only new points are computed
+	# a stored table is reused only if it was built for the same ranges and settings
+	table = load_or_build(table_file, 'gri30.cti', 'CH4', 'O2:1, N2:3.76', T_range, P_range, phi_range, tol = tol, t_end = t_end,
+		integration = integration)
+	print('Table of %d x %d x %d points, largest estimated cell error = %g' %(table.ln_tau.shape + (table.cell_error.max(),)))
+
+	# looking up the ignition delay at stoichiometric conditions for a few pressures
+	T = np.linspace(T_range[0], T_range[1], 500)
+	plots.ignition_table(table, T, np.array([1, 10, 40])*ct.one_atm, phi = 1.0, fuel = 'CH4')
+	plots.show()
@@ -2,38 +2,23 @@
 Program to study the effect of preheating temperature on the adiabatic flame temperauture at constant volume
 """
 
-import cantera as ct
-import matplotlib.pyplot as plt
+import os
+import sys
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from combustion import plots
+from combustion.analyses import preheating
 
 min_temp = 298
 max_temp = 600
-T_air = list(range(min_temp, max_temp+1))
+T_air = np.arange(min_temp, max_temp+1)
 plot_interval = 10
 
-gas = ct.Solution('gri30.cti')
-
-for i in T_air:
-	
-	air = ct.Quantity(gas)
-	air.TPX = i, ct.one_atm, 'O2: 0.21, N2: 0.79'
-	air.moles = 9.52
-
-	fuel = ct.Quantity(gas)
-	fuel.TPX = 298, ct.one_atm, 'CH4: 1'
-	fuel.moles = 1
-
-	mix = air + fuel
-	print('T_air = ', i)
-	print('Temp. before combustion = ', mix.T)
+if __name__ == '__main__':
 
-	mix.equilibrate('UV')
-	print('T_ad = ', mix.T)
-	print('Enthalpy = ', mix.h)
+	# unburnt mixture temperature and adiabatic flame temperature for every air temperature
+	result = preheating('gri30.cti', T_air, fuel = 'CH4')
 
-	if i%plot_interval is 0:
-		plt.plot(i, mix.T, '*')
-	
-plt.title('Effect of Preheating on Adiabatic Flame Temperature')
-plt.xlabel('Temperature of preheated air at inlet (K)')
-plt.ylabel('Adiabatic flame temperature (K)')
-plt.show()
\ No newline at end of file
+	plots.preheat_temperature(result, interval = plot_interval)
+	plots.show()
@@ -0,0 +1,29 @@
+"""
+flame speed map for combustion of methane over equivalence ratio, inlet temperature and pressure
+"""
+
+import os
+import sys
+import cantera as ct
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from combustion import plots
+from combustion.flame import flame_map
+
+# grid of initial conditions
+phi = np.arange(0.5, 1.6 + 0.05, 0.1)
+temp = np.arange(300, 700 + 50, 100) # K
+pres = np.array([1, 5, 10, 20, 40]) # atm
+
+# converged profiles of every point are kept here, reruns and extended grids only solve new points
+store_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'flame_map_ch4')
+
+if __name__ == '__main__':
+
+	# every (T, P) is a continuation branch over phi, the branches are solved in parallel
+	Su = flame_map('gri30.cti', 'gri30_mix', 'CH4', 'O2:1, N2:3.76', phi, temp, pres*ct.one_atm, store_dir)
+
+	# plotting the flame speed against equivalence ratio at 1 atm
+	plots.flame_speed_map(phi, temp, Su[:, :, 0], pres[0]*ct.one_atm, fuel = 'CH4')
+	plots.show()
@@ -0,0 +1,31 @@
+"""
+Explicit, implicit and adaptive integrators on the stiff ODE
+dy/dt = -1000*y + 3000 - 2000*e^-t
+
+Explicit Euler, backward Euler, trapezoidal and BDF2 run with several fixed step sizes, the
+Rosenbrock (ROS2) and Runge-Kutta (Bogacki-Shampine 3(2)) pairs with several tolerances. Each run
+reports its largest error against the analytical solution, its error at t_end, and its cost in steps
+and right-hand side and Jacobian evaluations, and the plot shows error against cost for every method.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from combustion import plots
+from combustion.analyses import ode_methods
+from combustion.ode import print_comparison
+
+t_end = 0.5	# simulation time
+h = [0.0005, 0.001, 0.002, 0.005, 0.01]	# step sizes of the fixed step methods
+rtol = [1e-3, 1e-5, 1e-7]	# relative tolerances of the adaptive methods
+y0 = 0	# initial value
+
+if __name__ == '__main__':
+
+	result = ode_methods(h = h, rtol = rtol, y0 = y0, t_end = t_end)
+	print_comparison(vars(result))
+
+	# plot
+	plots.ode_methods(result)
+	plots.show()
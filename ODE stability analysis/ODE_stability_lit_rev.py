@@ -9,35 +9,22 @@ The numerical explicit solution is
 y_(n+1) = y_n + h*(-1000*y_n + 3000 - 2000*e^-t)
 """
 
-import numpy as np
-import matplotlib.pyplot as plt
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from combustion import plots
+from combustion.analyses import ode_stability
 
 t_end = 0.5	# simulation time
 h = 0.002	# step size
-t_array = np.arange(h, t_end, h)
-time = np.arange(0, t_end, h)
 y0 = 0	# initial value
-y_numerical = [y0]
-y_analytical = [y0]
-y_old = y0
-
-# loop for solution advance
-for t in t_array:
-	
-	# numerical solution using explicit Euler or forward difference
-	y_new = y_old + h*(-1000*y_old + 3000 - 2000*np.exp(-t))
-	y_numerical.append(y_new)
-	y_old = y_new
-
-	# analytical solution
-	y_analytical.append(3 - 0.998*np.exp(-1000*t) - 2.002*np.exp(-t))
-
-# plot
-fig1 = plt.figure(1)
-plt.plot(time, y_numerical, alpha = 0.7, label = 'Numerical Sol')
-plt.plot(time, y_analytical, alpha = 0.7, label = 'Analytical Sol')
-plt.legend(loc = 'best')
-plt.xlabel('time')
-plt.ylabel('y = f(t)')
-fig1.suptitle('Stability analysis for a simple ODE for time step h = {}'.format(h))
-plt.show()
\ No newline at end of file
+
+if __name__ == '__main__':
+
+	# numerical solution using explicit Euler or forward difference, and the analytical solution
+	result = ode_stability(h = h, t_end = t_end, y0 = y0)
+
+	# plot
+	plots.ode_stability(result)
+	plots.show()
@@ -0,0 +1,94 @@
+"""
+Dense against sparse reactor integration across mechanism sizes
+
+Runs one constant-volume ignition case per mechanism with both integration modes of
+combustion.reactors and prints the wall time, steps and ignition delay of each, and the mechanism
+size from which sparse integration wins (the crossover).
+
+	python integration_modes.py                run the mechanisms found in the Cantera data directories
+	python integration_modes.py h2o2 gri30     run some of them
+	python integration_modes.py --save         also store the crossover as the 'auto' threshold
+
+--save writes the crossover to combustion.reactors.INTEGRATION_SETTINGS, which sets the size from
+which integration = 'auto' picks sparse on this machine. The n-hexane case takes a couple of minutes.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# name: mechanism file, phase, mixture, initial temperature (K) and pressure (Pa), end time (s)
+MECHANISMS = {
+	'h2o2': ('h2o2.yaml', '', 'H2:2, O2:1, N2:3.76', 1000.0, 20*101325.0, 0.05),
+	'gri30': ('gri30.yaml', '', 'CH4:1, O2:2, N2:7.52', 1200.0, 20*101325.0, 0.05),
+	'ndodecane': ('nDodecane_Reitz.yaml', 'nDodecane_IG', 'c12h26:1, o2:18.5, n2:69.56', 900.0, 20*101325.0, 0.05),
+	'nhexane': ('example_data/n-hexane-NUIG-2015.yaml', '', 'NC6H14:1, O2:9.5, N2:35.72', 900.0, 20*101325.0, 0.05),
+}
+
+
+def run(name):
+	# wall time, steps and ignition delay of both modes for one mechanism
+	from combustion import counters
+	from combustion.ignition import ignition_delay
+	from combustion.mechanism import solution
+
+	path, phase, X, T, P, t_end = MECHANISMS[name]
+	gas = solution(path, phase)
+	result = {'n_species': gas.n_species}
+
+	for mode in ('dense', 'sparse'):
+		counters.reset()
+		start = time.perf_counter()
+		t_ign = ignition_delay(gas, T, P, X, t_end = t_end, integration = mode)
+		result[mode] = {'wall': time.perf_counter() - start, 'steps': counters.snapshot().get('steps', 0), 't_ign': t_ign}
+	return result
+
+
+def main():
+	from combustion.mechanism import locate
+	from combustion.reactors import INTEGRATION_SETTINGS, crossover, sparse_available
+
+	parser = argparse.ArgumentParser(description = 'Dense against sparse reactor integration')
+	parser.add_argument('mechanisms', nargs = '*', help = 'mechanisms to run, all available by default: %s' %', '.join(MECHANISMS))
+	parser.add_argument('--save', action = 'store_true', help = 'store the crossover as the threshold of the auto mode')
+	args = parser.parse_args()
+
+	if not sparse_available():
+		print('Sparse integration needs Cantera 3.0 or later')
+		return 1
+
+	names = args.mechanisms or [name for name in MECHANISMS if locate(MECHANISMS[name][0]) is not None]
+	unknown = [name for name in names if name not in MECHANISMS]
+	if unknown:
+		parser.error('unknown mechanisms: %s' %', '.join(unknown))
+
+	print('%-10s %8s %12s %12s %8s %8s %10s' %('mechanism', 'species', 'dense (s)', 'sparse (s)', 'speedup', 'steps', 'dt_ign (%)'))
+	results = []
+	for name in names:
+		res = run(name)
+		results.append(res)
+		dense, sparse = res['dense'], res['sparse']
+		print('%-10s %8d %12.3f %12.3f %8.2f %8d %10.4f' %(name, res['n_species'], dense['wall'], sparse['wall'],
+			dense['wall']/sparse['wall'], sparse['steps'], 100*abs(sparse['t_ign']/dense['t_ign'] - 1)))
+
+	n_species = crossover([res['n_species'] for res in results], [res['dense']['wall'] for res in results],
+		[res['sparse']['wall'] for res in results])
+	if n_species is None:
+		print('Dense integration was faster for every mechanism')
+		return 0
+	print('Sparse integration is faster from about %d species' %n_species)
+
+	if args.save:
+		os.makedirs(os.path.dirname(INTEGRATION_SETTINGS), exist_ok = True)
+		with open(INTEGRATION_SETTINGS, 'w') as f:
+			json.dump({'sparse_species': n_species}, f)
+		print('Threshold written to %s' %INTEGRATION_SETTINGS)
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,291 @@
+"""
+Benchmarks for every analysis in the repository
+
+Each scenario is a headless, reduced-size version of one of the analysis scripts. It runs in a fresh
+Python process with the result cache turned off and a non-interactive matplotlib backend. The run
+records the wall time of the timed part, the peak resident memory of the process and the number
+of integrator steps counted by combustion.counters.
+
+	python run_benchmarks.py                      run all scenarios and compare with baseline.json
+	python run_benchmarks.py ignition_T flame_h2  run some of them
+	python run_benchmarks.py --save-baseline      store the results as the new baseline
+
+A scenario is flagged when its wall time or peak memory is more than --tolerance (default 25 %)
+above the baseline, or when its step count changed by more than 5 %. The exit status is 1 if any
+scenario is flagged. Baselines are machine specific, so store one before changing the code.
+"""
+
+import argparse
+import json
+import os
+import runpy
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# allowed change of the step count before a scenario is flagged
+STEP_TOLERANCE = 0.05
+
+
+def _mechanism():
+	# GRI30 as YAML where the installed Cantera has it, as CTI for older versions
+	from combustion.mechanism import locate
+	return 'gri30.yaml' if locate('gri30.yaml') is not None else 'gri30.cti'
+
+
+# every scenario does its setup and returns the function that is timed
+
+def aft_newton():
+	import numpy as np
+	from combustion.aft import adiabatic_flame_temperature
+
+	rng = np.random.default_rng(0)
+	n = 100000
+	fuel = rng.choice(['CH4', 'C2H6', 'C3H8', 'C2H4', 'C2H2'], n)
+	phi = rng.uniform(0.4, 2.0, n)
+	loss = rng.uniform(0, 0.3, n)
+	mode = rng.choice(['HP', 'UV'], n)
+	return lambda: adiabatic_flame_temperature(fuel, phi, heat_loss = loss, mode = mode)
+
+
+def equilibrium():
+	import numpy as np
+	from combustion.equilibrium import equilibrium_sweep
+	from combustion.mechanism import solution
+
+	gas = solution(_mechanism())
+	phi = np.linspace(0.4, 2.0, 40)[:, None]
+	T = np.linspace(300, 800, 10)[None, :]
+	return lambda: equilibrium_sweep(gas, 'CH4', phi, T, mode = 'HP')
+
+
+def preheat():
+	import numpy as np
+	from combustion.mechanism import solution
+	from combustion.preheat import efficiency, flame_temperature
+
+	gas = solution(_mechanism())
+	T_air = np.arange(298, 601)
+
+	def run():
+		flame_temperature(gas, 'CH4', T_air)
+		efficiency(gas, 'CH4', T_air)
+	return run
+
+
+def ignition_T():
+	import numpy as np
+	import cantera as ct
+	from combustion.ignition import sweep
+
+	mech = _mechanism()
+	T = np.arange(950, 1450 + 50, 50)
+	return lambda: sweep(mech, T, 5*ct.one_atm, 'CH4:1, O2:2, N2:7.52', processes = 1, t_end = 10)
+
+
+def ignition_P():
+	import numpy as np
+	import cantera as ct
+	from combustion.ignition import sweep
+
+	mech = _mechanism()
+	P = np.arange(1, 5 + 0.5, 0.5)
+	return lambda: sweep(mech, 1250, P*ct.one_atm, 'CH4:1, O2:2, N2:7.52', processes = 1, t_end = 10)
+
+
+def sensitivity():
+	import cantera as ct
+	from combustion.mechanism import solution
+	from combustion.sensitivity import max_temperature_sensitivity
+
+	gas = solution(_mechanism())
+
+	def run():
+		gas.TPX = 1500, ct.one_atm, 'CH4:1, O2:2, N2:7.52'
+		max_temperature_sensitivity(gas, range(100), 2e-3, reactor = ct.IdealGasConstPressureReactor, processes = 1)
+	return run
+
+
+def sensitivity_chunked():
+	# the sensitivity scenario split over all cores; its steps are taken in the workers and not counted
+	import cantera as ct
+	from combustion.mechanism import solution
+	from combustion.sensitivity import max_temperature_sensitivity
+
+	gas = solution(_mechanism())
+
+	def run():
+		gas.TPX = 1500, ct.one_atm, 'CH4:1, O2:2, N2:7.52'
+		max_temperature_sensitivity(gas, range(100), 2e-3, reactor = ct.IdealGasConstPressureReactor)
+	return run
+
+
+def reduction_state():
+	from combustion.mechanism import solution
+	from combustion.reduction import rank_state, search_size
+
+	gas = solution(_mechanism())
+	state = ('CH4', 'O2:1, N2:3.76', 1150, 4e5, 1.0)
+
+	def run():
+		ref = rank_state(gas, *state, t_end = 5)
+		search_size(gas, *state, t_end = 5, R_ordered = list(ref['order']), ign_delay_ref = ref['ign_delay_ref'],
+			T_max_ref = ref['T_max_ref'], tol_ign_delay = 0.01, tol_T_max = 0.01)
+	return run
+
+
+def _flame(reactants):
+	import cantera as ct
+	from combustion.flame import staged_solve
+	from combustion.mechanism import solution
+
+	gas = solution(_mechanism())
+
+	def run():
+		gas.TPX = 300, ct.one_atm, reactants
+		staged_solve(gas, width = 0.03)
+	return run
+
+
+def flame_ch4():
+	return _flame('CH4:1, O2:2, N2:7.52')
+
+
+def flame_h2():
+	return _flame('H2:2, O2:1, N2:3.76')
+
+
+def ode_stability():
+	path = os.path.join(ROOT, 'ODE stability analysis', 'ODE_stability_lit_rev.py')
+	return lambda: runpy.run_path(path, run_name = '__main__')
+
+
+def ode_methods():
+	from combustion.ode import compare
+	return lambda: compare()
+
+
+SCENARIOS = {
+	'aft_newton': aft_newton,
+	'equilibrium': equilibrium,
+	'preheat': preheat,
+	'ignition_T': ignition_T,
+	'ignition_P': ignition_P,
+	'sensitivity': sensitivity,
+	'sensitivity_chunked': sensitivity_chunked,
+	'reduction_state': reduction_state,
+	'flame_ch4': flame_ch4,
+	'flame_h2': flame_h2,
+	'ode_stability': ode_stability,
+	'ode_methods': ode_methods,
+}
+
+
+def _peak_rss_mb():
+	# peak resident set size of this process in MB, None where the resource module is missing
+	try:
+		import resource
+	except ImportError:
+		return None
+	peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	return peak/2**20 if sys.platform == 'darwin' else peak/2**10
+
+
+def run_scenario(name, repeat=1):
+	# run one scenario in this process: best wall time over repeat runs, peak memory and steps per run
+	from combustion import counters
+
+	run = SCENARIOS[name]()
+	times = []
+	for i in range(repeat):
+		counters.reset()
+		start = time.perf_counter()
+		run()
+		times.append(time.perf_counter() - start)
+
+	return {'wall': min(times), 'peak_rss_mb': _peak_rss_mb(), 'steps': counters.snapshot().get('steps', 0)}
+
+
+def run_isolated(name, repeat=1):
+	# run one scenario in a fresh process and return its results
+	env = dict(os.environ, COMBUSTION_RESULT_CACHE = '', MPLBACKEND = 'Agg')
+	out = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', name, '--repeat', str(repeat)],
+		env = env, stdout = subprocess.PIPE, check = True, universal_newlines = True).stdout
+	return json.loads(out.strip().splitlines()[-1])
+
+
+def compare(result, base, tolerance):
+	# reasons a result is flagged against its baseline entry
+	flags = []
+	if result['wall'] > base['wall']*(1 + tolerance):
+		flags.append('slower')
+	if result['peak_rss_mb'] and base.get('peak_rss_mb') and result['peak_rss_mb'] > base['peak_rss_mb']*(1 + tolerance):
+		flags.append('more memory')
+	if abs(result['steps'] - base['steps']) > STEP_TOLERANCE*max(base['steps'], 1):
+		flags.append('steps changed')
+	return flags
+
+
+def main():
+	parser = argparse.ArgumentParser(description = 'Benchmarks of the combustion analyses')
+	parser.add_argument('scenarios', nargs = '*', help = 'scenarios to run, all by default: %s' %', '.join(SCENARIOS))
+	parser.add_argument('--baseline', default = BASELINE, help = 'baseline file')
+	parser.add_argument('--save-baseline', action = 'store_true', help = 'store the results as the baseline')
+	parser.add_argument('--tolerance', type = float, default = 0.25, help = 'allowed relative increase of wall time and memory')
+	parser.add_argument('--repeat', type = int, default = 1, help = 'runs per scenario, the fastest one is kept')
+	parser.add_argument('--output', help = 'also write the results to this JSON file')
+	parser.add_argument('--child', help = argparse.SUPPRESS)
+	args = parser.parse_args()
+
+	if args.child:
+		print(json.dumps(run_scenario(args.child, args.repeat)))
+		return 0
+
+	names = args.scenarios or list(SCENARIOS)
+	unknown = [name for name in names if name not in SCENARIOS]
+	if unknown:
+		parser.error('unknown scenarios: %s' %', '.join(unknown))
+
+	baseline = {}
+	if os.path.isfile(args.baseline) and not args.save_baseline:
+		with open(args.baseline) as f:
+			baseline = json.load(f)
+
+	results = {}
+	flagged = 0
+	print('%-20s %10s %10s %10s   %s' %('scenario', 'wall (s)', 'RSS (MB)', 'steps', 'vs baseline'))
+
+	for name in names:
+		results[name] = result = run_isolated(name, args.repeat)
+
+		note = ''
+		if name in baseline:
+			flags = compare(result, baseline[name], args.tolerance)
+			flagged = flagged + bool(flags)
+			note = '%+.0f %% time  %s' %(100*(result['wall']/baseline[name]['wall'] - 1), ', '.join(flags).upper())
+		print('%-20s %10.3f %10.1f %10d   %s' %(name, result['wall'], result['peak_rss_mb'] or 0, result['steps'], note))
+
+	if args.output:
+		with open(args.output, 'w') as f:
+			json.dump(results, f, indent = 1)
+
+	if args.save_baseline:
+		# scenarios not run this time keep their old baseline
+		if os.path.isfile(args.baseline):
+			with open(args.baseline) as f:
+				baseline = json.load(f)
+		baseline.update(results)
+		with open(args.baseline, 'w') as f:
+			json.dump(baseline, f, indent = 1)
+		print('Baseline written to %s' %args.baseline)
+
+	return 1 if flagged else 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,7 @@
+"""
+Shared computational routines used by the analysis scripts in this repository
+
+The scripts in each folder import from this package after putting the repository root on sys.path.
+Every analysis is also available headless through combustion.analyses, and from the command line
+with python -m combustion (see combustion.cli).
+"""
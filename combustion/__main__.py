@@ -0,0 +1,5 @@
+import sys
+
+from combustion.cli import main
+
+sys.exit(main())
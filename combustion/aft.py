@@ -0,0 +1,126 @@
+"""
+Batched adiabatic flame temperature solver
+
+Solves the energy balance of any number of hydrocarbon-air mixtures at once. Each case is given by
+its fuel (CxHy), equivalence ratio, heat-loss fraction and mode ('HP' for constant pressure, 'UV' for
+constant volume), and the arguments are broadcast against each other. Reactants enter at T_std.
+
+Products of lean and stoichiometric mixtures are CO2, H2O, O2 and N2. Rich products are CO2, CO,
+H2O, H2 and N2, with the oxygen shared out by a fixed water-gas shift ratio
+[CO2][H2]/([CO][H2O]) = K_WGS. This needs enough oxygen to burn all the carbon to CO, which bounds phi
+by 2 + y/(2x): 4 for CH4, 3 for C2H4, 2.5 for C2H2. Products and flame temperatures of richer
+mixtures, which would form soot, are nan.
+
+The energy balance E_r(T_std) - E_p(T) - loss*(E_r(T_std) - E_p(T_std)) = 0 is solved by Newton
+iteration for all cases together, with E = H or U. The Jacobian is the analytic -Cp or -Cv of the products.
+"""
+
+import re
+
+import numpy as np
+
+from combustion import thermo
+
+# product species, in the column order of the product mole matrix
+PRODUCTS = ('CO2', 'H2O', 'O2', 'N2', 'CO', 'H2')
+
+# water-gas shift ratio for rich products, gives CH4 at phi = 2 -> 0.5 CO2 + 0.5 H2O + 0.5 CO + 1.5 H2
+K_WGS = 3.0
+
+
+def fuel_atoms(fuel):
+	# number of C and H atoms in a CxHy fuel name
+	match = re.fullmatch(r'C(\d*)H(\d*)', fuel)
+	if match is None:
+		raise ValueError('Not a CxHy fuel: {0}'.format(fuel))
+	return int(match.group(1) or 1), int(match.group(2) or 1)
+
+
+def products(x, y, phi):
+	# moles of PRODUCTS per mole of CxHy burnt in air at equivalence ratio phi, shape phi.shape + (6,)
+	# nan for phi above 2 + y/(2x), where there is not enough oxygen to turn all the carbon into CO
+	x, y, phi = np.broadcast_arrays(np.asarray(x, dtype = float), np.asarray(y, dtype = float), np.asarray(phi, dtype = float))
+	n_o2 = (x + y/4)/phi
+	O = 2*n_o2 # oxygen atoms available
+	lean = phi <= 1
+
+	# rich: CO2 from the stable root of (1 - K) a^2 + (y/2 + x - O + K O) a - K x (O - x) = 0
+	A = 1 - K_WGS
+	B = y/2 + x - O + K_WGS*O
+	C = -K_WGS*x*(O - x)
+	with np.errstate(invalid = 'ignore', divide = 'ignore'):
+		a = 2*C/(-B - np.sqrt(B**2 - 4*A*C))
+
+	N = np.zeros(phi.shape + (len(PRODUCTS),))
+	N[..., 0] = np.where(lean, x, a)
+	N[..., 1] = np.where(lean, y/2, O - x - a)
+	N[..., 2] = np.where(lean, n_o2 - x - y/4, 0)
+	N[..., 3] = 3.76*n_o2
+	N[..., 4] = np.where(lean, 0, x - a)
+	N[..., 5] = np.where(lean, 0, y/2 - O + x + a)
+	N[O < x] = np.nan
+
+	return N
+
+
+def adiabatic_flame_temperature(fuel, phi, heat_loss=0.0, mode='HP', T_std=298.15, T_guess=1500.0, tol=1e-3, max_iter=50):
+	"""
+	Adiabatic flame temperature (K) of every case, with the broadcast shape of the arguments
+
+	heat_loss is the fraction of the maximum heat release (products at T_std) lost to the surroundings.
+	Cases whose energy balance is not within tol (J/mol of fuel) after max_iter iterations are nan.
+	"""
+	fuel, phi, heat_loss, mode = np.broadcast_arrays(np.asarray(fuel), np.asarray(phi, dtype = float), np.asarray(heat_loss, dtype = float), np.asarray(mode))
+	shape = phi.shape
+	fuel = fuel.ravel()
+	phi = phi.ravel()
+	heat_loss = heat_loss.ravel()
+	unknown = sorted(set(mode.ravel()) - {'HP', 'UV'})
+	if unknown:
+		raise ValueError('Unknown mode: {0}'.format(', '.join(unknown)))
+	const_volume = (mode.ravel() == 'UV')
+
+	# atoms and formation enthalpy of each distinct fuel
+	names, inverse = np.unique(fuel, return_inverse = True)
+	atoms = np.array([fuel_atoms(name) for name in names], dtype = float)
+	x = atoms[inverse, 0]
+	y = atoms[inverse, 1]
+	h_fuel = thermo.h(T_std, list(names))[inverse]
+
+	# reactants: 1 fuel + n_o2 (O2 + 3.76 N2) at T_std
+	n_o2 = (x + y/4)/phi
+	n_r = 1 + 4.76*n_o2
+	h_r = h_fuel + n_o2*(thermo.h(T_std, 'O2') + 3.76*thermo.h(T_std, 'N2'))
+	e_r = h_r - const_volume*n_r*thermo.R*T_std
+
+	# products: enthalpy is a matrix product with the mole matrix, U = H - n_p R T
+	N = products(x, y, phi)
+	n_p = N.sum(axis = 1)
+	e_p_std = thermo.h(T_std, PRODUCTS) @ N.T - const_volume*n_p*thermo.R*T_std
+	target = e_r - heat_loss*(e_r - e_p_std)
+
+	T = np.full(phi.shape, float(T_guess))
+	active = np.isfinite(n_p)
+	converged = np.zeros(phi.shape, dtype = bool)
+
+	# Newton iterations on the cases that have not converged yet
+	for i in range(max_iter):
+
+		idx = np.flatnonzero(active)
+		if len(idx) == 0:
+			break
+
+		T_a = T[idx]
+		N_a = N[idx]
+		f = target[idx] - (np.einsum('ij,ij->i', thermo.h(T_a, PRODUCTS), N_a) - const_volume[idx]*n_p[idx]*thermo.R*T_a)
+		fprime = -(np.einsum('ij,ij->i', thermo.cp(T_a, PRODUCTS), N_a) - const_volume[idx]*n_p[idx]*thermo.R)
+
+		done = np.abs(f) <= tol
+		converged[idx[done]] = True
+		active[idx[done]] = False
+
+		T[idx[~done]] = np.clip(T_a[~done] - f[~done]/fprime[~done], 200.0, 6000.0)
+
+	T[~converged] = np.nan
+
+	return T.reshape(shape)
@@ -0,0 +1,316 @@
+"""
+Headless versions of the analyses in this repository
+
+Each function runs one analysis and returns a dataclass of arrays, without touching matplotlib.
+Plots of the results are in combustion.plots, and the command line entry point in combustion.cli
+writes them to files. The scripts in the analysis folders are thin callers of these functions.
+
+save() writes any of the result dataclasses to an .npz file: one entry per field, and one entry
+per key for fields that are dicts (named field__key).
+"""
+
+import dataclasses
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from combustion.mechanism import solution
+
+
+@dataclass
+class AFTResult:
+	fuel: np.ndarray
+	phi: np.ndarray
+	heat_loss: np.ndarray
+	mode: np.ndarray
+	T_newton: np.ndarray # K, products of complete combustion
+	T_equilibrium: np.ndarray = None # K, Cantera equilibrium, only without heat loss
+
+
+@dataclass
+class PreheatResult:
+	T_air: np.ndarray # K
+	T_mix: np.ndarray # K, unburnt mixture, None without the flame temperature sweep
+	T_ad: np.ndarray # K, constant volume, None without the flame temperature sweep
+	efficiency: np.ndarray
+
+
+@dataclass
+class IgnitionResult:
+	T: np.ndarray # K
+	P: np.ndarray # Pa
+	t_ign: np.ndarray # s
+	wall_time: np.ndarray # s
+
+
+@dataclass
+class SpeciesHistory:
+	T0: float # K
+	P0: float # Pa
+	time: np.ndarray # s
+	T: np.ndarray # K
+	X: dict # mole fractions by species
+
+
+@dataclass
+class FlameResult:
+	Su: float # m/s
+	grid: np.ndarray # m
+	T: np.ndarray # K
+	velocity: np.ndarray # m/s
+	concentrations: dict # kmol/m^3 by species
+	stages: dict # name, wall time (s), grid points and flame speed of every solver stage
+
+
+@dataclass
+class SensitivityResult:
+	index: np.ndarray # reactions, most sensitive first
+	equation: np.ndarray
+	S: np.ndarray # signed maximum temperature sensitivity, or d ln(tau)/d ln(k)
+
+
+@dataclass
+class ReductionResult:
+	states: np.ndarray # (T, P, phi) per row
+	R_ordered: np.ndarray
+	ign_delay_ref: np.ndarray # s
+	T_max_ref: np.ndarray # K
+	size: np.ndarray # 0 where no reduced mechanism is within tolerance
+	ign_delay: np.ndarray # s, of the reduced mechanism
+	T_max: np.ndarray # K, of the reduced mechanism
+	curve_ign_delay: np.ndarray = None # (state, size), with curves = True
+	curve_T_max: np.ndarray = None
+	species: np.ndarray = None # of the exported reduced mechanism, with export
+	validation: dict = None # see combustion.export.validate()
+
+
+@dataclass
+class ODEResult:
+	h: float
+	t: np.ndarray
+	y_numerical: np.ndarray
+	y_analytical: np.ndarray
+	error: float = field(init = False) # largest absolute error
+
+	def __post_init__(self):
+		self.error = float(np.max(np.abs(self.y_numerical - self.y_analytical)))
+
+
+@dataclass
+class ODEComparison:
+	method: np.ndarray # one entry per run
+	h: np.ndarray # step size of the fixed step methods, nan for the adaptive ones
+	rtol: np.ndarray # of the adaptive methods, nan for the fixed step ones
+	error: np.ndarray # largest absolute error against the analytical solution
+	end_error: np.ndarray # absolute error at t_end
+	steps: np.ndarray
+	rejected: np.ndarray
+	rhs_evals: np.ndarray
+	jac_evals: np.ndarray
+
+
+def save(result, path):
+	# write a result dataclass to an .npz file
+	data = {}
+	for name, value in dataclasses.asdict(result).items():
+		if value is None:
+			continue
+		if isinstance(value, dict):
+			for key, item in value.items():
+				data['%s__%s' %(name, key)] = np.asarray(item)
+		else:
+			data[name] = np.asarray(value)
+	np.savez(path, **data)
+
+
+def adiabatic_flame(fuel, phi, heat_loss=0.0, mode='HP', mech=None):
+	"""
+	Adiabatic flame temperatures of CxHy-air mixtures from reactants at 298.15 K and 1 atm
+
+	T_newton comes from combustion.aft. With a mechanism, T_equilibrium is the Cantera equilibrium
+	temperature of the same cases (heat loss is not applied to it).
+	"""
+	from combustion.aft import adiabatic_flame_temperature
+
+	fuel, phi, heat_loss, mode = np.broadcast_arrays(np.asarray(fuel), np.asarray(phi, dtype = float), np.asarray(heat_loss, dtype = float), np.asarray(mode))
+	result = AFTResult(fuel, phi, heat_loss, mode, adiabatic_flame_temperature(fuel, phi, heat_loss = heat_loss, mode = mode))
+
+	if mech is not None:
+		from combustion.equilibrium import equilibrium_sweep
+		result.T_equilibrium = equilibrium_sweep(solution(mech), fuel, phi, T = 298.15, P = 101325, mode = mode)['T']
+	return result
+
+
+def preheating(mech, T_air, fuel='CH4', phi=1.0, T_fuel=298.0, T_flue=1700.0, LHV=50e6, flame=True):
+	# flame temperature and efficiency of fuel burnt with air preheated to each of T_air
+	# flame = False skips the equilibrium sweep of the flame temperature, the efficiency is closed form
+	from combustion.preheat import efficiency, flame_temperature
+
+	gas = solution(mech)
+	balance = efficiency(gas, fuel, T_air, phi = phi, T_fuel = T_fuel, T_flue = T_flue, LHV = LHV)
+	if not flame:
+		return PreheatResult(balance['T_air'], None, None, balance['efficiency'])
+
+	flame = flame_temperature(gas, fuel, T_air, phi = phi, T_fuel = T_fuel)
+	return PreheatResult(flame['T_air'], flame['T_mix'], flame['T_ad'], balance['efficiency'])
+
+
+def autoignition(mech, T, P, X, processes=None, **kwargs):
+	# ignition delays of a sweep over T and P (broadcast), see combustion.ignition.sweep()
+	from combustion.ignition import sweep
+
+	T, P = np.broadcast_arrays(np.atleast_1d(np.asarray(T, dtype = float)), np.atleast_1d(np.asarray(P, dtype = float)))
+	t_ign, wall_time = sweep(mech, T, P, X, processes = processes, **kwargs)
+	return IgnitionResult(T.ravel(), P.ravel(), t_ign, wall_time)
+
+
+def species_history(mech, T, P, X, species, t_end, dt, integration='auto'):
+	# temperature and mole fractions of the given species of a constant-volume reactor, sampled every dt
+	from combustion.reactors import reactor_network
+	from combustion.recorder import TrajectoryRecorder
+
+	gas = solution(mech)
+	gas.TPX = T, P, X
+	r, sim = reactor_network(gas, integration)
+
+	time = np.arange(0, t_end + dt, dt)
+	rec = TrajectoryRecorder(gas, species, capacity = len(time))
+	for t in time:
+		sim.advance(t)
+		rec.append(t, r.thermo)
+
+	return SpeciesHistory(T, P, np.array(rec.time), np.array(rec.T), {name: np.array(rec.X(name)) for name in species})
+
+
+def flame_speed(mech, reactants, T, P, phase='', width=0.03, multicomponent=False, species=('CO2',)):
+	# freely propagating flame solved with the staged refinement of combustion.flame.staged_solve()
+	from combustion.flame import _velocity, staged_solve
+
+	gas = solution(mech, phase)
+	gas.TPX = T, P, reactants
+	f, report = staged_solve(gas, width = width, multicomponent = multicomponent)
+
+	velocity = f.profile(f.flame, _velocity(f))
+	conc = f.concentrations
+	stages = {key: np.array([stage[i] for stage in report]) for i, key in enumerate(('name', 'time', 'points', 'Su'))}
+	return FlameResult(float(velocity[0]), np.array(f.grid), np.array(f.T), np.array(velocity),
+		{name: np.array(conc[gas.species_index(name)]) for name in species}, stages)
+
+
+def sensitivity_ranking(mech, T, P, X, n_param, n_plot, t_end, reactor=None, processes=None):
+	# the n_plot reactions out of the first n_param with the largest maximum temperature sensitivity
+	import cantera as ct
+	from combustion.sensitivity import max_temperature_sensitivity
+
+	gas = solution(mech)
+	gas.TPX = T, P, X
+	S_max = max_temperature_sensitivity(gas, range(n_param), t_end, reactor = reactor or ct.IdealGasConstPressureReactor, processes = processes)
+
+	index = np.argsort(-np.abs(S_max))[:n_plot]
+	return SensitivityResult(index, np.array([gas.reaction(i).equation for i in index]), S_max[index])
+
+
+def delay_sensitivity_ranking(mech, T, P, X, n_plot, delta=0.05, warm_start=0.0, t_end=10, processes=None):
+	# the n_plot reactions with the largest brute-force d ln(tau)/d ln(k), see combustion.delay_sensitivity
+	from combustion.delay_sensitivity import ignition_delay_sensitivity
+
+	res = ignition_delay_sensitivity(mech, T, P, X, delta = delta, warm_start = warm_start, t_end = t_end, processes = processes)
+	gas = solution(mech)
+	index = np.argsort(-np.abs(np.nan_to_num(res['S'])))[:n_plot]
+	return SensitivityResult(index, np.array([gas.reaction(i).equation for i in index]), res['S'][index])
+
+
+def reduction(mech, fuel, air, states, checkpoint_dir, t_end, tol_ign_delay, tol_T_max, curves=False, processes=None,
+		integration='auto', method='sensitivity', export=None):
+	"""
+	Reduction over the (T, P, phi) states, see combustion.reduction
+
+	The reduced size of every state comes from the bisection search, or with curves = True from the
+	full reduction curve, which is returned as well. integration is a mode of combustion.reactors,
+	method ranks the reactions by temperature sensitivity ('sensitivity') or by graph search ('drg', 'drgep').
+
+	With export, the reduced mechanism that covers every state (the largest reduced size), stripped
+	of the species it does not use, is written to that YAML file and validated against the full
+	mechanism on all states; the report goes to <export>_report.json as well.
+	"""
+	from combustion.reduction import merge_rankings, reduced_size, run_states
+
+	ranking = run_states(mech, 'rank', fuel, air, states, checkpoint_dir, processes = processes, t_end = t_end, integration = integration,
+		method = method)
+	R_ordered = merge_rankings([res['order'] for res in ranking])
+	refs = [{'ign_delay_ref': float(res['ign_delay_ref']), 'T_max_ref': float(res['T_max_ref'])} for res in ranking]
+	ign_delay_ref = np.array([ref['ign_delay_ref'] for ref in refs])
+	T_max_ref = np.array([ref['T_max_ref'] for ref in refs])
+
+	if not curves:
+		sizes = run_states(mech, 'search', fuel, air, states, checkpoint_dir, processes = processes, state_kwargs = refs,
+			t_end = t_end, R_ordered = R_ordered, tol_ign_delay = tol_ign_delay, tol_T_max = tol_T_max, integration = integration)
+		result = ReductionResult(np.array(states), np.array(R_ordered), ign_delay_ref, T_max_ref,
+			np.array([int(res['size']) for res in sizes]), np.array([float(res['ign_delay']) for res in sizes]),
+			np.array([float(res['T_max']) for res in sizes]))
+
+	else:
+		data = run_states(mech, 'reduce', fuel, air, states, checkpoint_dir, processes = processes, t_end = t_end, R_ordered = R_ordered,
+			integration = integration)
+		curve_ign_delay = np.array([curve['ign_delay'] for curve in data])
+		curve_T_max = np.array([curve['T_max'] for curve in data])
+		size = np.array([reduced_size(curve, ref['ign_delay_ref'], ref['T_max_ref'], tol_ign_delay, tol_T_max) for curve, ref in zip(data, refs)])
+
+		rows = np.arange(len(states))
+		ign_delay = np.where(size > 0, curve_ign_delay[rows, size - 1], np.nan)
+		T_max = np.where(size > 0, curve_T_max[rows, size - 1], np.nan)
+		result = ReductionResult(np.array(states), np.array(R_ordered), ign_delay_ref, T_max_ref, size, ign_delay, T_max,
+			curve_ign_delay, curve_T_max)
+
+	if export is not None:
+		_export(mech, fuel, air, result, export, t_end, tol_ign_delay, tol_T_max, integration)
+	return result
+
+
+def _export(mech, fuel, air, result, path, t_end, tol_ign_delay, tol_T_max, integration):
+	# write the reduced mechanism of a ReductionResult and its validation report, and add both to the result
+	import os
+	import cantera as ct
+	from combustion.drg import mixture_species
+	from combustion.export import reduced_solution, validate, write_mechanism, write_report
+
+	size = int(result.size.max())
+	if size == 0:
+		raise ValueError('No reduced mechanism is within tolerance, nothing to export')
+
+	gas = solution(mech)
+	keep = mixture_species(gas, fuel) + mixture_species(gas, air)
+	write_mechanism(reduced_solution(gas, result.R_ordered[:size], keep = keep), path)
+
+	# validate the file as later runs will load it
+	reduced = ct.Solution(path)
+	result.species = np.array(reduced.species_names)
+	result.validation = validate(gas, reduced, fuel, air, result.states, t_end, tol_ign_delay, tol_T_max, integration = integration)
+	write_report(result.validation, os.path.splitext(path)[0] + '_report.json')
+
+
+def ode_stability(h=0.002, t_end=0.5, y0=0.0):
+	"""
+	Explicit Euler solution of dy/dt = -1000*y + 3000 - 2000*e^-t against the analytical solution
+
+	y = 3 - 0.998*e^(-1000*t) - 2.002*e^-t. Each step uses the source term at the end of the step,
+	as in the original study.
+	"""
+	t = np.arange(0, t_end, h)
+	source = h*(3000 - 2000*np.exp(-t[1:]))
+
+	y = np.empty(len(t))
+	y[0] = y0
+	for n in range(len(t) - 1):
+		y[n+1] = y[n] + h*(-1000*y[n]) + source[n]
+
+	y_analytical = 3 - 0.998*np.exp(-1000*t) - 2.002*np.exp(-t)
+	y_analytical[0] = y0
+	return ODEResult(h, t, y, y_analytical)
+
+
+def ode_methods(methods=None, h=(0.0005, 0.001, 0.002, 0.005, 0.01), rtol=(1e-3, 1e-5, 1e-7), y0=0.0, t_end=0.5):
+	# error and cost of the integrators of combustion.ode on the stiff test equation of the stability study
+	from combustion import ode
+
+	return ODEComparison(**ode.compare(methods or ode.METHODS, h = h, rtol = rtol, y0 = y0, t_end = t_end))
@@ -0,0 +1,202 @@
+"""
+Persistent result cache
+
+Results of expensive runs (ignition delays, equilibrium states, sensitivity vectors, reduction trials)
+are stored in one SQLite database, keyed by a hash of everything the result depends on: the kind of
+run, the content hash of the mechanism file and phase, the reactor model, the initial state, the
+run parameters and tolerances, and the Cantera version. A rerun of a sweep, or a sweep extended with
+new points, only computes the points that are not in the database.
+
+Every lookup updates the access time of the rows it hits. When the database grows beyond
+max_bytes, the least recently used rows are dropped. Each process keeps a running total of the size
+it wrote and only sums the whole table every RECOUNT_EVERY writes, so a write costs no table scan.
+
+The database lives at RESULT_CACHE, which can be moved with the COMBUSTION_RESULT_CACHE environment
+variable. Setting that variable to an empty string turns the cache off.
+"""
+
+import hashlib
+import inspect
+import os
+import pickle
+import re
+import sqlite3
+import time
+
+import cantera as ct
+import numpy as np
+
+RESULT_CACHE = os.environ.get('COMBUSTION_RESULT_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'combustion', 'results.sqlite'))
+
+# size limit of the database in bytes, COMBUSTION_RESULT_CACHE_SIZE overrides the default of 1 GB
+MAX_BYTES = int(os.environ.get('COMBUSTION_RESULT_CACHE_SIZE', 1 << 30))
+
+# writes between two reads of the true database size, which also has the rows of other processes
+RECOUNT_EVERY = 100
+
+_caches = {}
+
+
+def _canonical(value):
+	# plain, reproducible Python structure of a key part
+	if isinstance(value, dict):
+		return tuple(sorted((str(k), _canonical(v)) for k, v in value.items()))
+	if isinstance(value, (list, tuple)):
+		return tuple(_canonical(v) for v in value)
+	if isinstance(value, np.ndarray):
+		return tuple(_canonical(v) for v in value.tolist())
+	if isinstance(value, np.generic):
+		return value.item()
+	return value
+
+
+def make_key(kind, *parts):
+	# hex key of a result of the given kind that depends on parts
+	text = repr((kind, ct.__version__) + _canonical(parts))
+	return hashlib.sha256(text.encode()).hexdigest()
+
+
+def arguments(func, kwargs):
+	# keyword arguments of a call to func with the defaults filled in, so that a key does not
+	# depend on whether a default was passed explicitly
+	parameters = inspect.signature(func).parameters.items()
+	return {name: kwargs.get(name, p.default) for name, p in parameters if p.default is not p.empty}
+
+
+def composition(X):
+	# mole fractions of a Cantera composition string or dict as a normalized dict, so that
+	# 'CH4:1, O2:2' and {'O2': 4, 'CH4': 2} give the same key
+	if isinstance(X, str):
+		X = {name: float(x) for name, x in re.findall(r'([^\s,:]+)\s*:\s*([^\s,]+)', X)}
+	total = sum(X.values())
+	return {name: x/total for name, x in X.items() if x}
+
+
+def state(gas):
+	# thermodynamic state of a gas object as a key part
+	return (gas.T, gas.P, gas.X)
+
+
+class ResultCache:
+
+	def __init__(self, path, max_bytes=MAX_BYTES):
+		self.path = path
+		self.max_bytes = max_bytes
+		self._size = None # running estimate of the stored bytes
+		self._writes = 0
+
+		directory = os.path.dirname(path)
+		if directory:
+			os.makedirs(directory, exist_ok = True)
+
+		# pool workers share the file, WAL lets them read while one of them writes
+		self._db = sqlite3.connect(path, timeout = 60, isolation_level = None)
+		self._db.execute('PRAGMA journal_mode=WAL')
+		self._db.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB, size INTEGER, accessed REAL)')
+		self._db.execute('CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)')
+
+	def _write(self, sql, rows):
+		# one transaction for all rows
+		self._db.execute('BEGIN IMMEDIATE')
+		try:
+			self._db.executemany(sql, rows)
+		except BaseException:
+			self._db.execute('ROLLBACK')
+			raise
+		self._db.execute('COMMIT')
+
+	def get_many(self, keys):
+		# dict of the stored values of those keys that are in the cache
+		keys = list(keys)
+		found = {}
+
+		# SQLite limits the number of parameters of one statement
+		for start in range(0, len(keys), 500):
+			chunk = keys[start:start+500]
+			rows = self._db.execute('SELECT key, value FROM results WHERE key IN (%s)' %(','.join('?'*len(chunk))), chunk).fetchall()
+			for key, value in rows:
+				found[key] = pickle.loads(value)
+
+		if found:
+			now = time.time()
+			self._write('UPDATE results SET accessed = ? WHERE key = ?', [(now, key) for key in found])
+		return found
+
+	def get(self, key, default=None):
+		return self.get_many([key]).get(key, default)
+
+	def put_many(self, items):
+		# store (key, value) pairs, then drop old rows if the database is over its size limit
+		now = time.time()
+		rows = []
+		for key, value in items:
+			blob = pickle.dumps(value, protocol = pickle.HIGHEST_PROTOCOL)
+			rows.append((key, blob, len(blob), now))
+
+		if not rows:
+			return
+		self._write('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)', rows)
+
+		# the size is only summed over the whole table now and then, in between it is added up here
+		self._writes += 1
+		if self._size is None or self._writes % RECOUNT_EVERY == 0:
+			self._size = self._total()
+		else:
+			self._size += sum(row[2] for row in rows)
+		if self._size > self.max_bytes:
+			self.evict()
+
+	def put(self, key, value):
+		self.put_many([(key, value)])
+
+	def _total(self):
+		return self._db.execute('SELECT TOTAL(size) FROM results').fetchone()[0] or 0
+
+	def evict(self):
+		# delete least recently used rows down to 90 % of max_bytes, so that the next writes do not evict again
+		excess = self._total() - 0.9*self.max_bytes
+		while excess > 0:
+			rows = self._db.execute('SELECT key, size FROM results ORDER BY accessed LIMIT 256').fetchall()
+			if not rows:
+				break
+			drop = []
+			for key, size in rows:
+				drop.append((key,))
+				excess = excess - size
+				if excess <= 0:
+					break
+			self._write('DELETE FROM results WHERE key = ?', drop)
+		self._size = self._total()
+
+	def clear(self):
+		self._db.execute('DELETE FROM results')
+		self._size = 0
+
+	def __len__(self):
+		return self._db.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+
+def result_cache(path=None):
+	# ResultCache of the current process for path (default RESULT_CACHE), None when the cache is off
+	path = RESULT_CACHE if path is None else path
+	if not path:
+		return None
+
+	# a connection must not be shared with forked worker processes
+	key = (path, os.getpid())
+	if key not in _caches:
+		_caches[key] = ResultCache(path)
+	return _caches[key]
+
+
+def cached(cache, key, compute):
+	# value of key from cache, computed with compute() and stored when it is missing;
+	# without a cache or a key compute() is always called
+	if cache is None or key is None:
+		return compute()
+
+	value = cache.get(key)
+	if value is None:
+		value = compute()
+		cache.put(key, value)
+	return value
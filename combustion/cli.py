@@ -0,0 +1,221 @@
+"""
+Command line entry point for batch runs
+
+	python -m combustion <analysis> [options] [--out result.npz] [--plot DIR] [--show]
+
+Runs one analysis of combustion.analyses and writes its result to an .npz file, by default
+<analysis>.npz. --plot saves the figures as PNG files in DIR with a non-interactive backend,
+--show displays them. Without either matplotlib is never imported. Lists of numbers can be given
+as values or as start:stop:step ranges that include stop, e.g. --T 950:1450:50.
+Pressures are in atm except for the reduction states, which are in Pa as in its input file.
+"""
+
+import argparse
+import os
+
+import numpy as np
+
+from combustion import analyses
+from combustion.drg import METHODS
+from combustion.ode import METHODS as METHODS_ODE
+from combustion.reactors import MODES
+
+ONE_ATM = 101325.0
+
+
+def _values(tokens):
+	# floats from a list of values and start:stop:step ranges
+	values = []
+	for token in tokens:
+		if ':' in token:
+			start, stop, step = (float(x) for x in token.split(':'))
+			values.extend(np.arange(start, stop + step/2, step))
+		else:
+			values.append(float(token))
+	return np.array(values)
+
+
+def _parser():
+	parser = argparse.ArgumentParser(prog = 'python -m combustion', description = 'Headless combustion analyses')
+	sub = parser.add_subparsers(dest = 'analysis')
+	sub.required = True
+
+	def add(name, help):
+		p = sub.add_parser(name, help = help)
+		p.add_argument('--out', help = 'result file, default <analysis>.npz')
+		p.add_argument('--plot', metavar = 'DIR', help = 'save the figures as PNG files in DIR')
+		p.add_argument('--show', action = 'store_true', help = 'display the figures')
+		return p
+
+	p = add('aft', 'adiabatic flame temperature of CxHy-air mixtures')
+	p.add_argument('--fuel', nargs = '+', default = ['CH4'])
+	p.add_argument('--phi', nargs = '+', default = ['1'])
+	p.add_argument('--heat-loss', type = float, default = 0.0, help = 'fraction of the maximum heat release')
+	p.add_argument('--mode', choices = ['HP', 'UV'], default = 'HP')
+	p.add_argument('--mech', help = 'also compute the Cantera equilibrium with this mechanism')
+
+	p = add('preheat', 'flame temperature and efficiency against air preheat temperature')
+	p.add_argument('--mech', default = 'gri30.cti')
+	p.add_argument('--fuel', default = 'CH4')
+	p.add_argument('--T-air', nargs = '+', default = ['298:600:1'])
+	p.add_argument('--phi', type = float, default = 1.0)
+
+	p = add('ignition', 'ignition delay sweep over temperature and pressure')
+	p.add_argument('--mech', default = 'gri30.cti')
+	p.add_argument('--T', nargs = '+', default = ['950:1450:50'])
+	p.add_argument('--P', nargs = '+', default = ['5'], help = 'atm, broadcast against T')
+	p.add_argument('--X', default = 'CH4:1, O2:2, N2:7.52')
+	p.add_argument('--t-end', type = float, default = 10.0)
+	p.add_argument('--integration', choices = MODES, default = 'auto', help = 'dense or sparse reactor integration')
+	p.add_argument('--processes', type = int)
+
+	p = add('flame', 'freely propagating flame speed')
+	p.add_argument('--mech', default = 'gri30.cti')
+	p.add_argument('--phase', default = '')
+	p.add_argument('--reactants', default = 'CH4:1, O2:2, N2:7.52')
+	p.add_argument('--T', type = float, default = 300.0)
+	p.add_argument('--P', type = float, default = 1.0, help = 'atm')
+	p.add_argument('--width', type = float, default = 0.03)
+	p.add_argument('--multicomponent', action = 'store_true')
+	p.add_argument('--species', nargs = '+', default = ['CO2'])
+
+	p = add('sensitivity', 'reactions with the largest temperature sensitivity')
+	p.add_argument('--mech', default = 'gri30.cti')
+	p.add_argument('--T', type = float, default = 1500.0)
+	p.add_argument('--P', type = float, default = 1.0, help = 'atm')
+	p.add_argument('--X', default = 'CH4:1, O2:2, N2:7.52')
+	p.add_argument('--n-param', type = int, default = 100)
+	p.add_argument('--n-plot', type = int, default = 10)
+	p.add_argument('--t-end', type = float, default = 2e-3)
+	p.add_argument('--processes', type = int, help = 'workers sharing the sensitivity parameters')
+
+	p = add('delay-sensitivity', 'reactions with the largest brute-force ignition delay sensitivity')
+	p.add_argument('--mech', default = 'gri30.cti')
+	p.add_argument('--T', type = float, default = 1200.0)
+	p.add_argument('--P', type = float, default = 20.0, help = 'atm')
+	p.add_argument('--X', default = 'CH4:1, O2:2, N2:7.52')
+	p.add_argument('--n-plot', type = int, default = 10)
+	p.add_argument('--delta', type = float, default = 0.05, help = 'relative change of the multipliers')
+	p.add_argument('--warm-start', type = float, default = 0.0, help = 'fraction of the ignition delay')
+	p.add_argument('--t-end', type = float, default = 10.0)
+	p.add_argument('--processes', type = int)
+
+	p = add('reduction', 'mechanism reduction over (T, P, phi) states')
+	p.add_argument('--mech', default = 'gri30.cti')
+	p.add_argument('--fuel', default = 'CH4')
+	p.add_argument('--T', nargs = '+', default = ['950', '1050', '1150'])
+	p.add_argument('--P', nargs = '+', default = ['300000', '400000', '500000'], help = 'Pa')
+	p.add_argument('--phi', nargs = '+', default = ['0.5', '1.0', '1.5'])
+	p.add_argument('--t-end', type = float, default = 5.0)
+	p.add_argument('--tol-ign-delay', type = float, default = 0.01, help = '%%')
+	p.add_argument('--tol-T-max', type = float, default = 0.01, help = '%%')
+	p.add_argument('--checkpoints', default = 'checkpoints')
+	p.add_argument('--curves', action = 'store_true', help = 'compute the full reduction curves')
+	p.add_argument('--method', choices = ('sensitivity',) + METHODS, default = 'sensitivity', help = 'ranking of the reactions')
+	p.add_argument('--export', metavar = 'YAML', help = 'write the reduced mechanism and its validation report')
+	p.add_argument('--integration', choices = MODES, default = 'auto', help = 'dense or sparse reactor integration')
+	p.add_argument('--processes', type = int)
+
+	p = add('ode', 'explicit Euler stability study')
+	p.add_argument('--h', type = float, default = 0.002)
+	p.add_argument('--t-end', type = float, default = 0.5)
+
+	p = add('ode-methods', 'error and cost of explicit, implicit and adaptive integrators on the stiff test equation')
+	p.add_argument('--methods', nargs = '+', choices = METHODS_ODE, default = list(METHODS_ODE))
+	p.add_argument('--h', nargs = '+', default = ['0.0005', '0.001', '0.002', '0.005', '0.01'], help = 'step sizes of the fixed step methods')
+	p.add_argument('--rtol', nargs = '+', default = ['1e-3', '1e-5', '1e-7'], help = 'tolerances of the adaptive methods')
+	p.add_argument('--y0', type = float, default = 0.0)
+	p.add_argument('--t-end', type = float, default = 0.5)
+
+	return parser
+
+
+def run(args):
+	# result of the analysis and a function drawing its figures
+	from combustion import plots
+
+	if args.analysis == 'aft':
+		phi = _values(args.phi)
+		fuel = np.array(args.fuel)
+		if len(fuel) > 1 and len(phi) == 1:
+			x, xlabel = fuel, 'Fuel'
+		else:
+			x, xlabel = phi, 'Equivalence ratio ($\\phi$)'
+		result = analyses.adiabatic_flame(fuel if len(fuel) > 1 else fuel[0], phi, heat_loss = args.heat_loss, mode = args.mode, mech = args.mech)
+		return result, lambda: [plots.aft_comparison(x, result, xlabel, 'Adiabatic flame temperature (%s)' %args.mode)]
+
+	if args.analysis == 'preheat':
+		result = analyses.preheating(args.mech, _values(args.T_air), fuel = args.fuel, phi = args.phi)
+		return result, lambda: [plots.preheat_temperature(result), plots.preheat_efficiency(result, fuel = args.fuel)]
+
+	if args.analysis == 'ignition':
+		result = analyses.autoignition(args.mech, _values(args.T), _values(args.P)*ONE_ATM, args.X, processes = args.processes, t_end = args.t_end,
+			integration = args.integration)
+		if len(np.unique(result.T)) > 1:
+			x, xlabel = result.T, 'Temperature (K)'
+		else:
+			x, xlabel = result.P/ONE_ATM, 'Pressure (atm)'
+		return result, lambda: [plots.ignition_delay(x, result, xlabel, 'Ignition time delay')]
+
+	if args.analysis == 'flame':
+		result = analyses.flame_speed(args.mech, args.reactants, args.T, args.P*ONE_ATM, phase = args.phase, width = args.width,
+			multicomponent = args.multicomponent, species = args.species)
+		return result, lambda: plots.flame(result, args.reactants)
+
+	if args.analysis == 'sensitivity':
+		result = analyses.sensitivity_ranking(args.mech, args.T, args.P*ONE_ATM, args.X, args.n_param, args.n_plot, args.t_end,
+			processes = args.processes)
+		return result, lambda: [plots.sensitivity(result)]
+
+	if args.analysis == 'delay-sensitivity':
+		result = analyses.delay_sensitivity_ranking(args.mech, args.T, args.P*ONE_ATM, args.X, args.n_plot, delta = args.delta,
+			warm_start = args.warm_start, t_end = args.t_end, processes = args.processes)
+		return result, lambda: [plots.sensitivity(result, quantity = 'Ignition Delay', xlabel = 'd ln(tau) / d ln(k)')]
+
+	if args.analysis == 'reduction':
+		states = [(T, P, phi) for T in _values(args.T) for P in _values(args.P) for phi in _values(args.phi)]
+		result = analyses.reduction(args.mech, args.fuel, 'O2:1, N2:3.76', states, args.checkpoints, args.t_end,
+			args.tol_ign_delay, args.tol_T_max, curves = args.curves, processes = args.processes, integration = args.integration,
+			method = args.method, export = args.export)
+		from combustion.reduction import print_sizes
+		print_sizes(result)
+		if args.export:
+			from combustion.export import print_report
+			print_report(result.validation)
+		return result, lambda: plots.reduction_curves(result) if args.curves else []
+
+	if args.analysis == 'ode-methods':
+		from combustion.ode import print_comparison
+		result = analyses.ode_methods(args.methods, _values(args.h), _values(args.rtol), y0 = args.y0, t_end = args.t_end)
+		print_comparison(vars(result))
+		return result, lambda: [plots.ode_methods(result)]
+
+	result = analyses.ode_stability(h = args.h, t_end = args.t_end)
+	return result, lambda: [plots.ode_stability(result)]
+
+
+def main(argv=None):
+	args = _parser().parse_args(argv)
+
+	if args.plot and not args.show:
+		import matplotlib
+		matplotlib.use('Agg')
+
+	result, draw = run(args)
+
+	out = args.out or args.analysis + '.npz'
+	analyses.save(result, out)
+	print('%s result written to %s' %(type(result).__name__, out))
+
+	if args.plot or args.show:
+		figures = draw()
+		if args.plot:
+			os.makedirs(args.plot, exist_ok = True)
+			for i, fig in enumerate(figures):
+				path = os.path.join(args.plot, '%s_%d.png' %(args.analysis, i + 1))
+				fig.savefig(path)
+				print('Figure written to %s' %path)
+		if args.show:
+			from combustion import plots
+			plots.show()
+	return 0
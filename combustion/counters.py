@@ -0,0 +1,24 @@
+"""
+Process-wide work counters
+
+Library loops that step a ReactorNet add the number of integrator steps they take here, so that
+benchmarks can report solver work without access to the reactor networks themselves. Counts are
+per process: work done in pool workers is not seen by the parent.
+"""
+
+from collections import Counter
+
+_counts = Counter()
+
+
+def add(name, n=1):
+	_counts[name] += n
+
+
+def reset():
+	_counts.clear()
+
+
+def snapshot():
+	# current counts as a plain dict
+	return dict(_counts)
@@ -0,0 +1,100 @@
+"""
+Brute-force ignition delay sensitivity
+
+The sensitivity of the ignition delay to the rate constant of reaction i, d ln(tau)/d ln(k_i), is
+found by central differences: the multiplier of reaction i is set to 1 + delta and to 1 - delta, and
+the ignition delay of each perturbed mechanism is found as in combustion.ignition. This replaces one
+large CVODES sensitivity system (n_species x n_reactions equations) with 2 n_reactions small,
+independent runs, which are farmed out to a pool of worker processes.
+
+Perturbed runs can be warm-started from the unperturbed trajectory: with warm_start > 0 they begin
+at warm_start*tau_0 from the state of the unperturbed reactor at that time, so only the interval
+that is left before ignition is integrated. The perturbation then only acts after the warm start,
+which leaves out its effect on the early part of the induction period. For GRI30 methane at 1200 K
+and 20 atm, warm_start = 0.5 saved 10 % of the time but halved the largest sensitivities and
+reordered the ranking, and 0.8 cut them to a fifth. The default of 0 gives the exact central
+differences; warm starts are only meant for a quick look at the reactions that act late.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from combustion.cache import cached, composition, make_key, result_cache
+from combustion.ignition import detect_ignition
+from combustion.mechanism import mechanism_key, solution
+from combustion.reactors import reactor_network, resolve
+
+# gas object owned by the current worker process
+_gas = None
+
+
+def _init_worker(mech):
+	global _gas
+	_gas = solution(mech)
+
+
+def _start(gas, T, P, X, t_start, integration):
+	# state (T, density, Y) of the unperturbed reactor at t_start
+	gas.TPX = T, P, X
+	r, sim = reactor_network(gas, integration)
+	if t_start > 0:
+		sim.advance(t_start)
+	return r.T, r.density, r.thermo.Y
+
+
+def _perturbed_delay(task):
+	# ignition delay of the mechanism with the multiplier of one reaction changed, from the warm-start state
+	i, multiplier, state, t_start, T_ign, t_end, integration = task
+	_gas.set_multiplier(multiplier, i)
+	try:
+		_gas.TDY = state
+		r, sim = reactor_network(_gas, integration)
+		sim.initial_time = t_start
+		return detect_ignition(sim, r, T_ign, t_end = t_end, kind = 'delay_sensitivity')[0]
+	finally:
+		_gas.set_multiplier(1.0, i)
+
+
+def ignition_delay_sensitivity(mech, T, P, X, reactions=None, delta=0.05, warm_start=0.0, dT_ign=400, t_end=10,
+		integration='auto', processes=None, cache=True):
+	"""
+	d ln(tau)/d ln(k) of a constant-volume reactor for every reaction in reactions (all by default)
+
+	Returns a dict with the unperturbed ignition delay tau (s), the reaction indices, the
+	sensitivities S, and the delays tau_plus and tau_minus of the perturbed runs. S is nan for
+	reactions whose perturbed runs do not ignite before t_end.
+	"""
+	gas = solution(mech)
+	reactions = np.arange(gas.n_reactions) if reactions is None else np.array([int(i) for i in reactions])
+
+	def compute():
+		gas.TPX = T, P, X
+		r, sim = reactor_network(gas, integration)
+		tau = detect_ignition(sim, r, T + dT_ign, t_end = t_end, kind = 'delay_sensitivity')[0]
+		if np.isnan(tau):
+			raise ValueError('The unperturbed mixture does not ignite before t_end = %g s' %t_end)
+
+		t_start = warm_start*tau
+		state = _start(gas, T, P, X, t_start, integration)
+		tasks = [(int(i), 1 + sign*delta, state, t_start, T + dT_ign, t_end, integration) for sign in (1, -1) for i in reactions]
+
+		n = processes or os.cpu_count() or 1
+		n = max(1, min(n, len(tasks)))
+		if n == 1:
+			_init_worker(mech)
+			delays = [_perturbed_delay(task) for task in tasks]
+		else:
+			chunksize = max(1, len(tasks) // (4*n))
+			with ProcessPoolExecutor(max_workers = n, initializer = _init_worker, initargs = (mech,)) as pool:
+				delays = list(pool.map(_perturbed_delay, tasks, chunksize = chunksize))
+
+		tau_plus = np.array(delays[:len(reactions)])
+		tau_minus = np.array(delays[len(reactions):])
+		S = (np.log(tau_plus) - np.log(tau_minus))/(np.log(1 + delta) - np.log(1 - delta))
+		return {'tau': tau, 'reactions': reactions, 'S': S, 'tau_plus': tau_plus, 'tau_minus': tau_minus}
+
+	key = make_key('delay_sensitivity', mechanism_key(mech), float(T), float(P), composition(X), reactions, delta,
+		warm_start, dT_ign, t_end, resolve(integration, gas))
+	return cached(result_cache() if cache else None, key, compute)
@@ -0,0 +1,207 @@
+"""
+Directed relation graph reduction (DRG and DRGEP)
+
+Species are the nodes of a graph whose edge A -> B says how much the production rate of A depends
+on B, from the net rates of progress w_i of the reactions that involve both:
+
+	DRG     r_AB = sum_i |nu_Ai w_i d_Bi| / sum_i |nu_Ai w_i|
+	DRGEP   r_AB = |sum_i nu_Ai w_i d_Bi| / max(P_A, C_A)
+
+with d_Bi = 1 where species B takes part in reaction i, and P_A and C_A the production and
+consumption rates of A. Heat release is one more node, with the heat release rates -dH_i w_i of the
+reactions in place of nu_Ai w_i, so that species which matter for the temperature are kept as well.
+
+The importance of species B is its coupling to the targets (fuel, O2 and heat release): for DRG the
+largest value, over all paths from a target, of the smallest edge on the path, i.e. the largest
+threshold at which DRG keeps B; for DRGEP the largest product of the edges along a path. Both are
+taken as the maximum over states sampled along plain ignition trajectories, so no sensitivity
+system is integrated.
+
+The graph is stored as edge lists, one entry per (A, B) pair that shares a reaction, and the path
+searches relax all edges of all samples at once until nothing changes.
+"""
+
+import numpy as np
+
+from combustion.cache import composition
+from combustion.reactors import reactor_network
+
+METHODS = ('drg', 'drgep')
+
+
+def _stoich(gas):
+	# net stoichiometric coefficients and participation (n_species, n_reactions) of a Solution
+	coeffs = []
+	for name in ('reactant_stoich_coeffs', 'product_stoich_coeffs'):
+		value = getattr(gas, name)
+		value = value() if callable(value) else value # a method before Cantera 3.0
+		coeffs.append(np.asarray(value.toarray() if hasattr(value, 'toarray') else value, dtype = float))
+	reactants, products = coeffs
+	involved = (reactants + products) > 0
+	for k, i in colliders(gas):
+		involved[k, i] = True
+	return products - reactants, involved
+
+
+def colliders(gas):
+	# (species, reaction) of the explicit third bodies (H + O2 + AR <=> HO2 + AR), which the stoichiometric coefficients leave out
+	pairs = []
+	for i in range(gas.n_reactions):
+		r = gas.reaction(i)
+		body = getattr(r, 'third_body', None)
+		name = getattr(body, 'name', 'M')
+		if body is None and getattr(r, 'default_efficiency', 1.0) == 0 and len(r.efficiencies) == 1:
+			name = list(r.efficiencies)[0] # Cantera 2.x
+		if name != 'M' and name in gas.species_names:
+			pairs.append((gas.species_index(name), i))
+	return pairs
+
+
+class _Graph:
+
+	# edge lists of the relation graph of a mechanism; node n_species is the heat release
+
+	def __init__(self, gas):
+		nu, involved = _stoich(gas)
+		n_species, n_reactions = nu.shape
+		self.n_nodes = n_species + 1
+
+		# (A, i) with nu_Ai != 0, the heat release node takes part in every reaction
+		A, i = np.nonzero(nu)
+		self.A_i = np.concatenate([A, np.full(n_reactions, n_species)])
+		self.i_A = np.concatenate([i, np.arange(n_reactions)])
+		self.nu = np.concatenate([nu[A, i], np.zeros(n_reactions)])
+		self.heat = self.A_i == n_species
+
+		# species taking part in each reaction, as slices of B_r
+		i_r, B_r = np.nonzero(involved.T)
+		count = np.bincount(i_r, minlength = n_reactions)
+		first = np.concatenate([[0], np.cumsum(count)[:-1]])
+
+		# (A, B, i) triples: every (A, i) pair with every species B of reaction i, sorted by the edge (A, B)
+		n = count[self.i_A]
+		k = np.repeat(np.arange(len(self.A_i)), n)
+		B = B_r[np.repeat(first[self.i_A], n) + np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)]
+		A = self.A_i[k]
+		order = np.lexsort((B, A))
+		order = order[B[order] != A[order]]
+		A, B, self.k_t = A[order], B[order], k[order] # k_t indexes the (A, i) list
+
+		# edges and the start of their triples
+		self.starts = np.concatenate([[0], np.nonzero(np.diff(A*self.n_nodes + B))[0] + 1])
+		self.edge_A = A[self.starts]
+		self.edge_B = B[self.starts]
+
+	def rates(self, rates, dH):
+		# nu_Ai w_i of every (A, i) pair and sample, with the heat release rates for the heat release node
+		nu = np.where(self.heat, -dH[:, self.i_A], self.nu)
+		return nu*rates[:, self.i_A]
+
+	def coefficients(self, rates, dH, method):
+		# r_AB of every edge (columns) and sample (rows)
+		c = self.rates(rates, dH)
+		n = len(rates)
+
+		if method == 'drg':
+			denom = np.zeros((n, self.n_nodes))
+			np.add.at(denom.T, self.A_i, np.abs(c).T)
+			num = np.add.reduceat(np.abs(c[:, self.k_t]), self.starts, axis = 1)
+		else:
+			production = np.zeros((n, self.n_nodes))
+			consumption = np.zeros((n, self.n_nodes))
+			np.add.at(production.T, self.A_i, np.maximum(c, 0).T)
+			np.add.at(consumption.T, self.A_i, np.maximum(-c, 0).T)
+			denom = np.maximum(production, consumption)
+			num = np.abs(np.add.reduceat(c[:, self.k_t], self.starts, axis = 1))
+
+		denom = denom[:, self.edge_A]
+		# rounding can put an edge just above 1, and a cycle of those would keep growing in search()
+		return np.minimum(np.divide(num, denom, out = np.zeros_like(num), where = denom > 0), 1.0)
+
+	def search(self, r, targets, method):
+		# importance of every node and sample from the targets: best path of minimum (DRG) or product (DRGEP) edges
+		R = np.zeros((len(r), self.n_nodes))
+		R[:, targets] = 1.0
+		while True:
+			if method == 'drg':
+				reach = np.minimum(R[:, self.edge_A], r)
+			else:
+				reach = R[:, self.edge_A]*r
+			new = R.T.copy()
+			np.maximum.at(new, self.edge_B, reach.T)
+			if np.array_equal(new.T, R):
+				return R
+			R = new.T
+
+
+def sample_states(gas, t_end, n_samples=50, integration='auto'):
+	"""
+	States (T, P, Y) of a reactor started from the state of gas, at n_samples of its integrator steps
+
+	The integrator clusters its steps where the composition changes fastest, so samples evenly
+	spaced in step number cover the induction period and the ignition front.
+	"""
+	r, sim = reactor_network(gas, integration)
+	states = [r.thermo.TPY]
+	while sim.time < t_end:
+		sim.step()
+		states.append(r.thermo.TPY)
+	keep = np.unique(np.linspace(0, len(states) - 1, n_samples).astype(int))
+	return [states[k] for k in keep]
+
+
+def species_importance(gas, states, targets, method='drgep'):
+	"""
+	Importance (0 to 1) of every species of gas for the target species over the sampled states
+
+	targets are species names; the heat release is always a target. Leaves gas in the last sampled state.
+	"""
+	if method not in METHODS:
+		raise ValueError('Unknown graph reduction method: {0}'.format(method))
+	graph = _Graph(gas)
+
+	rates = np.empty((len(states), gas.n_reactions))
+	dH = np.empty((len(states), gas.n_reactions))
+	for j, state in enumerate(states):
+		gas.TPY = state
+		rates[j] = gas.net_rates_of_progress
+		dH[j] = gas.delta_enthalpy
+
+	target_nodes = [gas.species_index(name) for name in targets] + [gas.n_species]
+	R = graph.search(graph.coefficients(rates, dH, method), target_nodes, method)
+	importance = R[:, :gas.n_species].max(axis = 0)
+	importance[target_nodes[:-1]] = 1.0
+	return importance
+
+
+def reaction_order(gas, importance):
+	# reactions by decreasing importance of the least important species they involve, as used by search_size()
+	involved = _stoich(gas)[1]
+	score = np.where(involved, importance[:, None], np.inf).min(axis = 0)
+	return np.argsort(-score, kind = 'stable'), score
+
+
+def mixture_species(gas, X):
+	# species names of a composition string or dict; a bare name such as 'CH4' is the pure species
+	if isinstance(X, str) and ':' not in X:
+		names = [name.strip() for name in X.split(',') if name.strip()]
+	else:
+		names = list(composition(X))
+	unknown = [name for name in names if name not in gas.species_names]
+	if unknown:
+		raise ValueError('Species not in the mechanism: %s' %', '.join(unknown))
+	return names
+
+
+def targets(gas, fuel, air):
+	# fuel species and O2 of a mixture, the default targets of the graph search
+	names = mixture_species(gas, fuel) + [name for name in mixture_species(gas, air) if name.upper() == 'O2']
+	return list(dict.fromkeys(names))
+
+
+def skeleton(gas, importance, threshold):
+	# species with an importance of at least threshold, and the reactions among them only
+	keep = importance >= threshold
+	involved = _stoich(gas)[1]
+	reactions = np.nonzero(~(involved & ~keep[:, None]).any(axis = 0))[0]
+	return [gas.species_name(k) for k in np.nonzero(keep)[0]], reactions
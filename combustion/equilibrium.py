@@ -0,0 +1,120 @@
+"""
+Equilibrium sweeps over many hydrocarbon-air mixtures
+
+Each case is a CxHy fuel burnt in air (O2 + 3.76 N2) at an equivalence ratio phi, from reactants at
+(T, P), equilibrated at constant 'HP' or 'UV'. The arguments are broadcast against each other as in
+combustion.aft, and every case is solved with one gas object.
+
+How each solve starts is chosen by seed:
+
+	'reactants'    - from the unburnt mixture, like gas.equilibrate() on its own
+	'products'     - from the major products of combustion.aft.products(), brought to the energy
+	                 of the case, so that only the dissociation is left for the solver; from the
+	                 reactants beyond the rich limit of those products
+	'continuation' - from the equilibrium of the previous case of the same fuel, otherwise as 'products'
+
+For continuation the cases of each fuel are solved from rich to lean. A leaner case has the same
+carbon and hydrogen and more air per mole of fuel, so its seed is the previous equilibrium plus the
+extra O2 and N2: the element totals are exactly those of the new case, and no mole number goes negative.
+A seeded solve that fails is repeated from the reactants. Solved cases are kept in the result cache
+(combustion.cache) when gas comes from combustion.mechanism.solution(), and only new cases are solved.
+"""
+
+import cantera as ct
+import numpy as np
+
+from combustion.aft import PRODUCTS, fuel_atoms, products
+from combustion.cache import make_key, result_cache
+from combustion.mechanism import solution_key
+
+MODES = ('HP', 'UV')
+SEEDS = ('reactants', 'products', 'continuation')
+
+
+def equilibrium_sweep(gas, fuel, phi, T=298.15, P=ct.one_atm, mode='HP', seed='continuation', species=(), cache=True):
+	"""
+	Equilibrium temperature (K) of every case, with the broadcast shape of the arguments
+
+	Returns a dict with 'T' and the equilibrium mole fractions of each of the given species.
+	The state of gas is changed.
+	"""
+	fuel, phi, T, P, mode = np.broadcast_arrays(np.asarray(fuel), np.asarray(phi, dtype = float),
+		np.asarray(T, dtype = float), np.asarray(P, dtype = float), np.asarray(mode))
+	shape = phi.shape
+	fuel, phi, T, P, mode = fuel.ravel(), phi.ravel(), T.ravel(), P.ravel(), mode.ravel()
+	unknown = sorted(set(mode) - set(MODES))
+	if unknown:
+		raise ValueError('Unknown mode: {0}'.format(', '.join(unknown)))
+	if seed not in SEEDS:
+		raise ValueError('Unknown seed: {0}'.format(seed))
+
+	# oxygen demand of each distinct fuel and the major products of every case
+	names, inverse = np.unique(fuel, return_inverse = True)
+	atoms = np.array([fuel_atoms(name) for name in names], dtype = float)
+	n_o2 = (atoms[inverse, 0] + atoms[inverse, 1]/4)/phi
+	majors = products(atoms[inverse, 0], atoms[inverse, 1], phi)
+
+	i_o2 = gas.species_index('O2')
+	i_n2 = gas.species_index('N2')
+	i_products = [gas.species_index(name) for name in PRODUCTS]
+
+	# continuation path: fuel by fuel, rich to lean
+	order = np.lexsort((P, T, -phi, inverse)) if seed == 'continuation' else range(len(phi))
+
+	T_eq = np.zeros(len(phi))
+	X_eq = np.zeros((len(phi), len(species)))
+	index = [gas.species_index(name) for name in species]
+
+	store = result_cache() if cache and solution_key(gas) is not None else None
+	if store is not None:
+		# the seed is part of the key, a seeded solve can end on a slightly different equilibrium
+		keys = [make_key('equilibrium', solution_key(gas), fuel[k], phi[k], T[k], P[k], mode[k], seed, species) for k in range(len(phi))]
+		found = store.get_many(keys)
+		for k, key in enumerate(keys):
+			if key in found:
+				T_eq[k], X_eq[k] = found[key]
+		order = [k for k in order if keys[k] not in found]
+
+	previous = None # fuel index, O2 per mole of fuel, equilibrium moles per mole of fuel and T of the last case
+
+	for k in order:
+
+		reactants = {fuel[k]: 1, 'O2': n_o2[k], 'N2': 3.76*n_o2[k]}
+		gas.TPX = T[k], P[k], reactants
+		h, u, v = gas.enthalpy_mass, gas.int_energy_mass, gas.volume_mass
+		mass = (1 + 4.76*n_o2[k])*gas.mean_molecular_weight # kg per kmol of fuel
+
+		moles = None
+		if seed == 'continuation' and previous is not None and previous[0] == inverse[k]:
+			moles = previous[2].copy()
+			moles[i_o2] += n_o2[k] - previous[1]
+			moles[i_n2] += 3.76*(n_o2[k] - previous[1])
+			T_start = previous[3]
+		elif seed != 'reactants' and np.all(np.isfinite(majors[k])):
+			moles = np.zeros(gas.n_species)
+			moles[i_products] = majors[k]
+			T_start = T[k]
+
+		try:
+			if moles is not None:
+				gas.TPX = T_start, P[k], moles
+				if mode[k] == 'UV':
+					gas.UV = u, v
+				else:
+					gas.HP = h, P[k]
+			gas.equilibrate(mode[k])
+		except ct.CanteraError:
+			gas.TPX = T[k], P[k], reactants
+			gas.equilibrate(mode[k])
+
+		T_eq[k] = gas.T
+		X_eq[k] = gas.X[index]
+		previous = (inverse[k], n_o2[k], gas.X*mass/gas.mean_molecular_weight, gas.T)
+
+	if store is not None:
+		store.put_many((keys[k], (T_eq[k], X_eq[k])) for k in order)
+
+	result = {'T': T_eq.reshape(shape)}
+	for j, name in enumerate(species):
+		result[name] = X_eq[:, j].reshape(shape)
+	return result
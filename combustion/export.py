@@ -0,0 +1,113 @@
+"""
+Reduced mechanisms as standalone files
+
+A reduction (combustion.reduction) keeps a set of reactions of the full mechanism. reduced_solution()
+builds a Solution with only those reactions and the species they use, so that inactive species no
+longer add equations to the reactor and rows to its Jacobian, and write_mechanism() saves it as a
+YAML mechanism file that later sweeps load like any other.
+
+validate() compares the reduced and the full mechanism on a set of (T, P, phi) states with fresh
+reactor runs: ignition delay, maximum temperature and their errors, and the cost per integrator step
+of both, which is what the reduction saves in every later run.
+"""
+
+import json
+import time
+
+import cantera as ct
+import numpy as np
+
+from combustion import counters
+from combustion.drg import _stoich
+from combustion.ignition import detect_ignition
+from combustion.reactors import reactor_network
+
+
+def used_species(gas, reactions, keep=()):
+	# names of the species of gas that take part in the given reactions (explicit third bodies
+	# included) or are listed in keep, in the order of gas
+	involved = _stoich(gas)[1][:, list(reactions)].any(axis = 1)
+	keep = set(keep)
+	return [name for k, name in enumerate(gas.species_names) if involved[k] or name in keep]
+
+
+def reduced_solution(gas, reactions, keep=(), name='reduced'):
+	"""
+	Solution made of the given reactions of gas and only the species they use
+
+	Species listed in keep (fuel, oxidizer and diluents) stay even if no reaction uses them.
+	Third-body efficiencies of removed species are ignored, as Cantera does for undeclared third bodies.
+	"""
+	reactions = sorted(int(i) for i in reactions)
+	species = [gas.species(name) for name in used_species(gas, reactions, keep)]
+	transport = gas.transport_model if gas.transport_model not in ('None', 'none', None) else None
+
+	reduced = ct.Solution(thermo = 'ideal-gas', kinetics = 'gas', transport_model = transport, name = name,
+		species = species, reactions = [gas.reaction(i) for i in reactions])
+	if reduced.n_reactions != len(reactions):
+		raise ValueError('%d of %d reactions were dropped while building the reduced mechanism'
+			%(len(reactions) - reduced.n_reactions, len(reactions)))
+	return reduced
+
+
+def write_mechanism(reduced, path):
+	# write a Solution as a YAML mechanism file
+	if not hasattr(reduced, 'write_yaml'):
+		raise RuntimeError('Writing YAML mechanisms needs Cantera 2.6 or later, this is %s' %ct.__version__)
+	reduced.write_yaml(path)
+
+
+def _run(gas, fuel, air, T, P, phi, t_end, integration):
+	# ignition delay, maximum temperature, steps and wall time of one state
+	gas.TP = T, P
+	gas.set_equivalence_ratio(phi, fuel, air)
+	r, sim = reactor_network(gas, integration)
+
+	steps = counters.snapshot().get('steps', 0)
+	start = time.perf_counter()
+	ign_delay, T_max = detect_ignition(sim, r, T + 400, t_end = t_end, full = True)
+	return ign_delay, T_max, counters.snapshot().get('steps', 0) - steps, time.perf_counter() - start
+
+
+def validate(full, reduced, fuel, air, states, t_end, tol_ign_delay, tol_T_max, integration='auto'):
+	"""
+	Ignition delay and maximum temperature of the reduced against the full mechanism for every (T, P, phi)
+
+	Returns a dict of arrays with one entry per state: the results of both mechanisms, their errors
+	(%), whether both errors are within tolerance (%), and the wall time per integrator step (s) of
+	both mechanisms.
+	"""
+	rows = []
+	for T, P, phi in states:
+		rows.append(_run(full, fuel, air, T, P, phi, t_end, integration) + _run(reduced, fuel, air, T, P, phi, t_end, integration))
+	rows = np.array(rows).reshape(-1, 8)
+
+	states = np.array(states, dtype = float).reshape(-1, 3)
+	report = {'T': states[:, 0], 'P': states[:, 1], 'phi': states[:, 2],
+		'ign_delay_full': rows[:, 0], 'T_max_full': rows[:, 1], 'ign_delay': rows[:, 4], 'T_max': rows[:, 5],
+		'steps_full': rows[:, 2], 'steps': rows[:, 6],
+		'step_cost_full': rows[:, 3]/np.maximum(rows[:, 2], 1), 'step_cost': rows[:, 7]/np.maximum(rows[:, 6], 1)}
+	report['err_ign_delay'] = 100*np.abs(report['ign_delay']/report['ign_delay_full'] - 1)
+	report['err_T_max'] = 100*np.abs(report['T_max']/report['T_max_full'] - 1)
+	report['passed'] = (report['err_ign_delay'] <= tol_ign_delay) & (report['err_T_max'] <= tol_T_max)
+	report['n_species'] = np.array([full.n_species, reduced.n_species])
+	report['n_reactions'] = np.array([full.n_reactions, reduced.n_reactions])
+	return report
+
+
+def print_report(report):
+	print('Reduced mechanism: %d of %d species, %d of %d reactions' %(report['n_species'][1], report['n_species'][0],
+		report['n_reactions'][1], report['n_reactions'][0]))
+	print('%8s %10s %6s %12s %10s %10s %10s %12s %8s' %('T (K)', 'P (Pa)', 'phi', 'ign_delay', 'err (%)',
+		'T_max', 'err (%)', 'us per step', 'speedup'))
+	for j in range(len(report['T'])):
+		print('%8g %10g %6g %12.4e %10.4f %10.1f %10.4f %12.1f %8.2f %s' %(report['T'][j], report['P'][j], report['phi'][j],
+			report['ign_delay'][j], report['err_ign_delay'][j], report['T_max'][j], report['err_T_max'][j],
+			1e6*report['step_cost'][j], report['step_cost_full'][j]/report['step_cost'][j],
+			'' if report['passed'][j] else 'OUT OF TOLERANCE'))
+
+
+def write_report(report, path):
+	# the validation report as JSON, one list per column
+	with open(path, 'w') as f:
+		json.dump({key: np.asarray(value).tolist() for key, value in report.items()}, f, indent = 1)
@@ -0,0 +1,245 @@
+"""
+Freely propagating flame solves and flame speed maps
+
+solve_flame() solves one ct.FreeFlame, either from the default initial guess or warm-started from
+the converged profiles of a neighbouring condition. The neighbour's grid is reused and its
+temperature profile is shifted to the new inlet temperature.
+
+staged_solve() solves one flame in stages: first on the initial grid with the energy equation off, then
+with refinement criteria tightened step by step, and optionally once more with multicomponent
+transport. Each stage is timed so the cost of every accuracy level can be seen.
+
+flame_map() fills a phi x T x P table of laminar flame speeds. Every (T, P) pair is a continuation
+branch solved on a pool of worker processes. A branch starts at the equivalence ratio closest to 1,
+walks up to the richest mixture, then walks down from the start to the leanest. Each solve restarts
+from the previous converged point. Converged profiles are saved to one .npz file per point, together
+with the settings they were solved for, so a rerun or an extended grid only solves the new points.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cantera as ct
+import numpy as np
+
+from combustion.mechanism import mechanism_key, solution
+
+# default grid refinement of the flame speed scripts
+REFINE = {'ratio': 3, 'slope': 0.07, 'curve': 0.14}
+
+# stages of staged_solve(), each one solved on the result of the previous one
+STAGES = (
+	{'name': 'fixed temperature', 'energy': False, 'refine_grid': False},
+	{'name': 'coarse', 'ratio': 3, 'slope': 0.3, 'curve': 0.6},
+	{'name': 'medium', 'ratio': 3, 'slope': 0.14, 'curve': 0.28},
+	dict(REFINE, name = 'fine'),
+)
+
+# gas object owned by the current worker process
+_gas = None
+
+
+def _init_worker(mech, phase):
+	global _gas
+	_gas = solution(mech, phase)
+
+
+def _velocity(f):
+	# name of the axial velocity component, 'u' before Cantera 3.0 and 'velocity' after
+	return 'velocity' if 'velocity' in f.flame.component_names else 'u'
+
+
+def profiles(f):
+	# converged solution of a flame as a dict of arrays: grid, every component and the flame speed
+	data = {name: f.profile(f.flame, name) for name in f.flame.component_names}
+	data['grid'] = np.array(f.grid)
+	data['Su'] = data[_velocity(f)][0]
+	return data
+
+
+def solve_flame(gas, width=0.03, seed=None, refine=REFINE, loglevel=0):
+	"""
+	Solve a FreeFlame for the current state of gas and return profiles(f)
+
+	seed is the profiles() dict of a converged neighbouring flame. Without one the flame is solved
+	from the default initial guess with auto = True.
+	"""
+	if seed is None:
+		f = ct.FreeFlame(gas, width = width)
+		f.set_refine_criteria(**refine)
+		f.solve(loglevel = loglevel, auto = True)
+		return profiles(f)
+
+	# inlet state, read before the initial guess equilibrates gas
+	T_in = gas.T
+	rho_in = gas.density
+
+	grid = seed['grid']
+	f = ct.FreeFlame(gas, grid = grid)
+	f.set_refine_criteria(**refine)
+	f.set_initial_guess()
+
+	# neighbour's profiles on the neighbour's grid, with the temperature moved to the new inlet temperature,
+	# the velocity scaled with it, and the inlet mass flux matching the neighbour's flame speed
+	positions = (grid - grid[0])/(grid[-1] - grid[0])
+	velocity = _velocity(f)
+	T = seed['T'] - seed['T'][0] + T_in
+	f.set_profile(velocity, positions, seed[velocity]*T/seed['T'])
+	f.set_profile('T', positions, T)
+	for name in gas.species_names:
+		f.set_profile(name, positions, seed[name])
+	f.inlet.mdot = rho_in*seed['Su']
+
+	f.solve(loglevel = loglevel, auto = False)
+	return profiles(f)
+
+
+def staged_solve(gas, width=0.03, stages=STAGES, multicomponent=False, loglevel=0):
+	"""
+	Solve a FreeFlame for the current state of gas stage by stage
+
+	A stage is a dict with a name and optionally: energy (False to hold the temperature profile),
+	refine_grid (False to keep the grid), ratio/slope/curve (new refinement criteria) and
+	multicomponent (True to switch to multicomponent transport). With multicomponent = True a final
+	multicomponent stage is added. Returns the flame and a report with one
+	(name, wall time, grid points, flame speed) tuple per stage. The transport model of gas, which
+	may be a shared Solution, is restored on return.
+	"""
+	if multicomponent:
+		stages = list(stages) + [{'name': 'multicomponent', 'multicomponent': True}]
+
+	f = ct.FreeFlame(gas, width = width)
+	velocity = _velocity(f)
+	report = []
+	transport_model = gas.transport_model
+
+	try:
+		for stage in stages:
+
+			start = time.perf_counter()
+
+			if 'ratio' in stage:
+				f.set_refine_criteria(ratio = stage['ratio'], slope = stage['slope'], curve = stage['curve'])
+			if stage.get('multicomponent', False):
+				# 'Mix'/'Multi' before Cantera 3.0, 'mixture-averaged'/'multicomponent' after
+				f.transport_model = 'Multi' if f.transport_model == 'Mix' else 'multicomponent'
+			f.energy_enabled = stage.get('energy', True)
+
+			f.solve(loglevel = loglevel, refine_grid = stage.get('refine_grid', True), auto = False)
+			report.append((stage['name'], time.perf_counter() - start, len(f.grid), f.profile(f.flame, velocity)[0]))
+	finally:
+		if gas.transport_model != transport_model:
+			gas.transport_model = transport_model
+
+	return f, report
+
+
+def print_report(report):
+	# one line per stage of a staged_solve() report
+	for name, seconds, points, Su in report:
+		print('%-18s %8.3f s %6d points   Su = %.5f m/s' %(name, seconds, points, Su))
+	print('%-18s %8.3f s' %('total', sum(stage[1] for stage in report)))
+
+
+def _point_path(store_dir, phi, T, P):
+	return os.path.join(store_dir, 'phi%g_T%g_P%g.npz' %(phi, T, P))
+
+
+def _inputs(mech, phase, fuel, oxidizer, width, refine):
+	# settings a stored point was solved for, saved next to its profiles
+	inputs = {'mech': mechanism_key(mech, phase)[0], 'phase': phase, 'fuel': fuel, 'oxidizer': oxidizer, 'width': width}
+	inputs.update(('refine_%s' %key, value) for key, value in refine.items())
+	return inputs
+
+
+def _load(path, inputs):
+	# stored profiles, or None if they are missing or were solved for different inputs
+	if not os.path.isfile(path):
+		return None
+	with np.load(path) as data:
+		data = {key: data[key] for key in data.files}
+	for key, value in inputs.items():
+		if key not in data or not np.array_equal(data[key], value):
+			return None
+	return data
+
+
+def _save(path, data):
+	tmp = path + '.tmp.npz'
+	np.savez(tmp, **data)
+	os.replace(tmp, path)
+
+
+def continuation_order(phi):
+	# indices of phi starting closest to 1, going up, then going down from the start
+	phi = np.asarray(phi, dtype = float)
+	order = np.argsort(phi)
+	start = int(np.argmin(np.abs(phi[order] - 1)))
+	return list(order[start:]) + list(order[:start][::-1]), start
+
+
+def _solve_branch(task):
+	# flame speeds along phi for one (T, P), each solve seeded from the previous converged point
+	phi, T, P, fuel, oxidizer, width, refine, store_dir, inputs = task
+	order, start = continuation_order(phi)
+	Su = np.full(len(phi), np.nan)
+	first = None
+	seed = None
+
+	for k, i in enumerate(order):
+
+		# going down starts again from the first point of the branch
+		if k == len(order) - start:
+			seed = first
+
+		path = _point_path(store_dir, phi[i], T, P)
+		data = _load(path, inputs)
+
+		if data is None:
+			_gas.TP = T, P
+			_gas.set_equivalence_ratio(phi[i], fuel, oxidizer)
+			try:
+				data = solve_flame(_gas, width = width, seed = seed, refine = refine)
+			except ct.CanteraError:
+				# a failed warm start gets one cold start before the point is given up
+				try:
+					data = solve_flame(_gas, width = width, refine = refine) if seed is not None else None
+				except ct.CanteraError:
+					data = None
+			if data is not None:
+				_save(path, dict(data, **inputs))
+
+		if data is not None:
+			Su[i] = float(data['Su'])
+			seed = data
+		if k == 0:
+			first = data
+
+	return Su
+
+
+def flame_map(mech, phase, fuel, oxidizer, phi, T, P, store_dir, width=0.03, refine=REFINE, processes=None):
+	"""
+	Laminar flame speeds (m/s) of shape (len(phi), len(T), len(P)); nan where a solve failed
+
+	P is in Pa. Profiles of every converged point are kept in store_dir with the mechanism, mixture,
+	width and refinement they were solved for, and are only reused when those match.
+	"""
+	os.makedirs(store_dir, exist_ok = True)
+	phi = [float(x) for x in phi]
+	inputs = _inputs(mech, phase, fuel, oxidizer, width, refine)
+	branches = [(phi, float(T_i), float(P_j), fuel, oxidizer, width, refine, store_dir, inputs) for T_i in T for P_j in P]
+
+	if processes is None:
+		processes = os.cpu_count() or 1
+	processes = min(processes, len(branches))
+
+	if processes <= 1:
+		_init_worker(mech, phase)
+		results = [_solve_branch(branch) for branch in branches]
+	else:
+		with ProcessPoolExecutor(max_workers = processes, initializer = _init_worker, initargs = (mech, phase)) as pool:
+			results = list(pool.map(_solve_branch, branches))
+
+	return np.array(results).reshape(len(T), len(P), len(phi)).transpose(2, 0, 1)
@@ -0,0 +1,186 @@
+"""
+Ignition delay sweep engine
+
+Every (T, P, mixture) point of an ignition delay sweep is an independent constant-volume reactor run,
+so the points are farmed out to a pool of worker processes. Each worker builds its gas object once
+and reuses it for all the points it is handed. Results come back in input order together with the
+wall time spent on each point. Finished points are kept in the result cache (combustion.cache), and
+only the points that are not there are run.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from combustion import counters, profiling
+from combustion.cache import arguments, composition, make_key, result_cache
+from combustion.mechanism import mechanism_key, solution
+from combustion.reactors import reactor_network, resolve
+
+# gas object owned by the current worker process
+_gas = None
+
+
+def _init_worker(mech):
+	global _gas
+	_gas = solution(mech)
+
+
+def detect_ignition(sim, r, T_ign, t_end=10, method='threshold', full=False, kind='ignition'):
+	"""
+	Ignition time and maximum temperature of a reactor network
+
+	The integrator takes its own internal steps. With method = 'threshold' the ignition time is the
+	crossing of T_ign, interpolated linearly between the two steps that bracket it. With
+	method = 'dTdt' it is the time of the maximum temperature rise rate, located by a parabola
+	through the finite-difference rates of the three steps around the peak.
+	The run stops once ignition is found unless full is True, in which case it carries on to t_end
+	so that T_max covers the whole interval. t_ign is nan if the mixture does not ignite by t_end.
+	Once the next step could pass t_end, the run advances to t_end instead, so that no state after t_end
+	is used: CVODES lets its second step grow up to 1e4 times the first one and later steps tenfold.
+	The run is logged as kind when solver statistics are on (combustion.profiling).
+	"""
+	clock = profiling.clock(sim)
+	step = clock.step if clock else sim.step
+	advance = clock.advance if clock else sim.advance
+
+	t_old = t_prev = sim.time
+	T_old = T0 = r.T
+	P0 = r.thermo.P
+	T_max = T_old
+	t_ign = np.nan
+
+	# finite-difference dT/dt at step midpoints: the previous one, and the largest with its neighbours
+	rate_old = None
+	peak = None
+	steps = 0
+
+	while sim.time < t_end:
+
+		growth = 1e4 if steps == 1 else 10
+		if t_old + growth*(t_old - t_prev) < t_end:
+			t_new = step()
+		else:
+			advance(t_end)
+			t_new = t_end
+		steps = steps + 1
+		T_new = r.T
+		T_max = max(T_max, T_new)
+
+		if method == 'threshold':
+			if np.isnan(t_ign) and T_new >= T_ign:
+				t_ign = t_old + (T_ign - T_old)*(t_new - t_old)/(T_new - T_old)
+
+		elif method == 'dTdt':
+			rate = ((t_old + t_new)/2, (T_new - T_old)/(t_new - t_old))
+			if peak is None or rate[1] > peak[1][1]:
+				peak = [rate_old, rate, None]
+			elif peak[2] is None:
+				peak[2] = rate
+			rate_old = rate
+
+			# the peak is final once the temperature has passed T_ign and the rate has dropped well below it
+			if np.isnan(t_ign) and T_new >= T_ign and rate[1] < 0.1*peak[1][1]:
+				t_ign = _parabola_peak(peak)
+
+		else:
+			raise ValueError('Unknown ignition criterion: {0}'.format(method))
+
+		if not np.isnan(t_ign) and not full:
+			break
+
+		t_prev = t_old
+		t_old = t_new
+		T_old = T_new
+
+	counters.add('steps', steps)
+	profiling.record(kind, clock, steps, T0, P0, t_ign = t_ign, T_max = T_max)
+	return t_ign, T_max
+
+
+def _parabola_peak(peak):
+	# abscissa of the vertex of the parabola through three (t, dT/dt) points
+	first, (t1, y1), last = peak
+	if first is None or last is None:
+		return t1
+	(t0, y0), (t2, y2) = first, last
+	denom = (t0 - t1)*(t0 - t2)*(t1 - t2)
+	a = (t2*(y1 - y0) + t1*(y0 - y2) + t0*(y2 - y1))/denom
+	b = (t2**2*(y0 - y1) + t1**2*(y2 - y0) + t0**2*(y1 - y2))/denom
+	if a >= 0:
+		return t1
+	return -b/(2*a)
+
+
+def ignition_delay(gas, T, P, X, dT_ign=400, t_end=10, method='threshold', integration='auto'):
+	# ignition delay (s) of a constant-volume reactor, by default the time at which T exceeds T0 + dT_ign
+	# returns nan if the mixture does not ignite before t_end; integration is a mode of combustion.reactors
+	gas.TPX = T, P, X
+
+	r, sim = reactor_network(gas, integration)
+
+	return detect_ignition(sim, r, T + dT_ign, t_end = t_end, method = method)[0]
+
+
+def _run_point(task):
+	T, P, X, kwargs = task
+	start = time.perf_counter()
+	with profiling.profiled('ignition'):
+		t_ign = ignition_delay(_gas, T, P, X, **kwargs)
+	return t_ign, time.perf_counter() - start
+
+
+def sweep(mech, T, P, X, processes=None, cache=True, **kwargs):
+	"""
+	Ignition delays for every point of a sweep
+
+	T and P (Pa) are broadcast against each other; X is either one mixture used for every point
+	or a sequence with one mixture per point. Remaining keyword arguments go to ignition_delay().
+	Returns the arrays (t_ign, wall_time) in seconds, in the order of the input points. The wall
+	time of a point taken from the cache is that of the run that computed it.
+	"""
+	T, P = np.broadcast_arrays(np.atleast_1d(T), np.atleast_1d(P))
+	T = T.ravel()
+	P = P.ravel()
+	if isinstance(X, (str, dict)):
+		X = [X]*len(T)
+	tasks = [(float(T[i]), float(P[i]), X[i], kwargs) for i in range(len(T))]
+	results = [None]*len(tasks)
+
+	store = result_cache() if cache else None
+	if store is not None:
+		mech_key = mechanism_key(mech)
+		# keyed on the mode 'auto' resolves to, so that dense and sparse results never share an entry
+		options = arguments(ignition_delay, kwargs)
+		options['integration'] = resolve(options['integration'], solution(mech))
+		keys = [make_key('ignition', mech_key, T_i, P_i, composition(X_i), options) for T_i, P_i, X_i, _ in tasks]
+		found = store.get_many(keys)
+		results = [found.get(key) for key in keys]
+
+	todo = [i for i in range(len(tasks)) if results[i] is None]
+
+	if processes is None:
+		processes = os.cpu_count() or 1
+	processes = max(1, min(processes, len(todo)))
+
+	if processes == 1:
+		if todo:
+			_init_worker(mech)
+		computed = [_run_point(tasks[i]) for i in todo]
+	else:
+		# a few chunks per worker keeps the pool busy when point costs differ
+		chunksize = max(1, len(todo) // (4*processes))
+		with ProcessPoolExecutor(max_workers = processes, initializer = _init_worker, initargs = (mech,)) as pool:
+			computed = list(pool.map(_run_point, [tasks[i] for i in todo], chunksize = chunksize))
+
+	for i, result in zip(todo, computed):
+		results[i] = result
+	if store is not None:
+		store.put_many((keys[i], results[i]) for i in todo)
+
+	t_ign = np.array([res[0] for res in results])
+	wall_time = np.array([res[1] for res in results])
+
+	return t_ign, wall_time
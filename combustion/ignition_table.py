@@ -0,0 +1,210 @@
+"""
+Tabulated ignition delays for fast lookups
+
+The ignition delay of a fuel-oxidizer mixture is computed with combustion.ignition.sweep() on a
+tensor grid in (1000/T, ln P, phi) and stored as ln(tau). Interpolation is multilinear in those
+coordinates. This is exact for an Arrhenius temperature dependence, tau ~ exp(E/RT), and for a
+power law in pressure, tau ~ P^n, so a coarse grid is enough away from the NTC region.
+
+The error of each grid interval is estimated from the curvature of ln(tau) along that axis:
+linear interpolation over an interval of length h misses about h^2/8 |f''|. While any interval
+is above tol, build_table() splits it at its midpoint and computes only the new grid points.
+tol is in units of ln(tau), so 0.05 is about 5% relative error. Lookups return this estimate for
+the cell of each query.
+
+Tables are stored as .npz with ln(tau) in single precision, together with the inputs they were built
+for (mechanism, mixture, ranges, tol and the ignition settings). load_or_build() only reuses a stored
+table when those match and builds a new one otherwise.
+"""
+
+import itertools
+import os
+
+import numpy as np
+
+from combustion.cache import arguments
+from combustion.ignition import ignition_delay, sweep
+from combustion.mechanism import mechanism_key, solution
+
+
+def _curvature_error(x, F, axis):
+	# estimated linear interpolation error h^2/8 |f''| on every interval of x along axis of F
+	F = np.moveaxis(F, axis, 0)
+	h = np.diff(x).reshape((-1,) + (1,)*(F.ndim - 1))
+	d2 = np.zeros(F.shape)
+
+	if len(x) > 2:
+		h0 = h[:-1]
+		h1 = h[1:]
+		d2[1:-1] = 2*(h0*F[2:] - (h0 + h1)*F[1:-1] + h1*F[:-2])/(h0*h1*(h0 + h1))
+		d2[0] = d2[1]
+		d2[-1] = d2[-2]
+
+	# points that did not ignite are left out of the estimate
+	d2 = np.nan_to_num(np.abs(d2))
+	error = h**2/8*np.maximum(d2[:-1], d2[1:])
+	return np.moveaxis(error, 0, axis)
+
+
+class IgnitionTable:
+
+	def __init__(self, inv_T, ln_P, phi, ln_tau, inputs=None):
+		# axes are 1000/T (1/K), ln P (P in Pa) and phi, all increasing; ln_tau has tau in s
+		# inputs are the arguments of build_table() the table was built with
+		self.axes = [np.asarray(inv_T, dtype = float), np.asarray(ln_P, dtype = float), np.asarray(phi, dtype = float)]
+		self.ln_tau = np.asarray(ln_tau, dtype = float)
+		self.inputs = dict(inputs or {})
+		self.cell_error = self._cell_error()
+
+	def matches(self, inputs):
+		# whether the table was built for exactly the given inputs, no more and no fewer
+		if set(self.inputs) != set(inputs):
+			return False
+		return all(np.array_equal(self.inputs[key], value) for key, value in inputs.items())
+
+	def interval_errors(self):
+		# estimated error of every interval along each axis, one array per axis
+		return [_curvature_error(x, self.ln_tau, a) if len(x) > 1 else np.zeros(self.ln_tau.shape)
+			for a, x in enumerate(self.axes)]
+
+	def _cell_error(self):
+		# sum over the axes of the largest interval error on the edges of every cell
+		total = 0
+		for a, error in enumerate(self.interval_errors()):
+			for b in range(3):
+				if b != a and error.shape[b] > 1:
+					error = np.maximum(np.take(error, range(error.shape[b] - 1), axis = b),
+						np.take(error, range(1, error.shape[b]), axis = b))
+			total = total + error
+		return total
+
+	def _locate(self, T, P, phi):
+		# cell index and weight along each axis for every query, queries outside the grid are moved onto its edge
+		coords = np.broadcast_arrays(1000/np.asarray(T, dtype = float), np.log(np.asarray(P, dtype = float)), np.asarray(phi, dtype = float))
+		index = []
+		weight = []
+		for x, q in zip(self.axes, coords):
+			if len(x) == 1:
+				index.append(np.zeros(q.shape, dtype = int))
+				weight.append(np.zeros(q.shape))
+				continue
+			q = np.clip(q, x[0], x[-1])
+			i = np.clip(np.searchsorted(x, q) - 1, 0, len(x) - 2)
+			index.append(i)
+			weight.append((q - x[i])/(x[i+1] - x[i]))
+		return index, weight
+
+	def lookup(self, T, P, phi):
+		# interpolated ignition delay (s) of every query (T in K, P in Pa), broadcast; nan next to points that do not ignite
+		index, weight = self._locate(T, P, phi)
+		ln_tau = 0
+		for corner in itertools.product((0, 1), repeat = 3):
+			w = 1
+			node = []
+			for a in range(3):
+				w = w*(weight[a] if corner[a] else 1 - weight[a])
+				node.append(np.minimum(index[a] + corner[a], len(self.axes[a]) - 1))
+			ln_tau = ln_tau + w*self.ln_tau[tuple(node)]
+		return np.exp(ln_tau)
+
+	def error(self, T, P, phi):
+		# estimated error in ln(tau), about the relative error, of lookup() for every query
+		index, weight = self._locate(T, P, phi)
+		cell = tuple(np.minimum(i, n - 1) for i, n in zip(index, self.cell_error.shape))
+		return self.cell_error[cell]
+
+	def save(self, path):
+		inputs = {'input_' + key: value for key, value in self.inputs.items()}
+		np.savez_compressed(path, inv_T = self.axes[0], ln_P = self.axes[1], phi = self.axes[2], ln_tau = self.ln_tau.astype(np.float32),
+			**inputs)
+
+	@classmethod
+	def load(cls, path):
+		with np.load(path) as data:
+			inputs = {key[len('input_'):]: data[key] for key in data.files if key.startswith('input_')}
+			return cls(data['inv_T'], data['ln_P'], data['phi'], data['ln_tau'], inputs)
+
+
+def _fill(mech, fuel, oxidizer, axes, ln_tau, known, processes, kwargs):
+	# compute ln(tau) at every grid point that is not known yet
+	todo = np.argwhere(~known)
+	if len(todo) == 0:
+		return
+
+	# mixture of every equivalence ratio
+	gas = solution(mech)
+	mixtures = []
+	for phi in axes[2]:
+		gas.set_equivalence_ratio(phi, fuel, oxidizer)
+		mixtures.append(gas.mole_fraction_dict())
+
+	T = 1000/axes[0][todo[:, 0]]
+	P = np.exp(axes[1][todo[:, 1]])
+	X = [mixtures[k] for k in todo[:, 2]]
+	t_ign = sweep(mech, T, P, X, processes = processes, **kwargs)[0]
+
+	ln_tau[tuple(todo.T)] = np.log(t_ign)
+	known[tuple(todo.T)] = True
+
+
+def _inputs(mech, fuel, oxidizer, T_range, P_range, phi_range, n, tol, max_points, kwargs):
+	# everything a table depends on, stored with it; the ignition settings with the defaults of
+	# ignition_delay() filled in, so that an omitted setting is not taken to match any stored one
+	inputs = {'mech': mechanism_key(mech)[0], 'fuel': fuel, 'oxidizer': oxidizer, 'T_range': T_range, 'P_range': P_range,
+		'phi_range': phi_range, 'n': n, 'tol': tol, 'max_points': max_points}
+	inputs.update(arguments(ignition_delay, kwargs))
+	return inputs
+
+
+def build_table(mech, fuel, oxidizer, T_range, P_range, phi_range, n=(5, 3, 3), tol=0.05, max_points=20000,
+		processes=None, **kwargs):
+	"""
+	IgnitionTable of fuel burnt in oxidizer, refined until every interval is within tol
+
+	T_range (K), P_range (Pa) and phi_range are (min, max) pairs. The starting grid has n points per
+	axis, evenly spaced in 1000/T, ln P and phi. Refinement stops early when the next grid would have
+	more than max_points points. Remaining keyword arguments go to ignition_delay() (t_end, dT_ign, ...).
+	"""
+	axes = [np.linspace(1000/T_range[1], 1000/T_range[0], n[0]), np.linspace(np.log(P_range[0]), np.log(P_range[1]), n[1]),
+		np.linspace(phi_range[0], phi_range[1], n[2])]
+	ln_tau = np.zeros(tuple(len(x) for x in axes))
+	known = np.zeros(ln_tau.shape, dtype = bool)
+	inputs = _inputs(mech, fuel, oxidizer, T_range, P_range, phi_range, n, tol, max_points, kwargs)
+
+	while True:
+
+		_fill(mech, fuel, oxidizer, axes, ln_tau, known, processes, kwargs)
+		table = IgnitionTable(axes[0], axes[1], axes[2], ln_tau, inputs)
+
+		# intervals with too large an error on any line of the grid get a midpoint
+		split = [np.flatnonzero(np.any(np.moveaxis(error, a, 0) > tol, axis = (1, 2))) if len(x) > 1 else np.array([], dtype = int)
+			for a, (x, error) in enumerate(zip(axes, table.interval_errors()))]
+		if not any(len(s) for s in split):
+			return table
+
+		new_axes = [np.sort(np.concatenate([x, (x[s] + x[s+1])/2])) for x, s in zip(axes, split)]
+		if np.prod([len(x) for x in new_axes]) > max_points:
+			return table
+
+		# old grid points keep their values
+		position = np.ix_(*[np.searchsorted(x_new, x) for x, x_new in zip(axes, new_axes)])
+		new_ln_tau = np.zeros(tuple(len(x) for x in new_axes))
+		new_known = np.zeros(new_ln_tau.shape, dtype = bool)
+		new_ln_tau[position] = ln_tau
+		new_known[position] = known
+
+		axes, ln_tau, known = new_axes, new_ln_tau, new_known
+
+
+def load_or_build(path, mech, fuel, oxidizer, T_range, P_range, phi_range, n=(5, 3, 3), tol=0.05, max_points=20000,
+		processes=None, **kwargs):
+	# table stored in path if it was built for the same inputs, otherwise build_table() saved to path
+	if os.path.isfile(path):
+		table = IgnitionTable.load(path)
+		if table.matches(_inputs(mech, fuel, oxidizer, T_range, P_range, phi_range, n, tol, max_points, kwargs)):
+			return table
+
+	table = build_table(mech, fuel, oxidizer, T_range, P_range, phi_range, n = n, tol = tol, max_points = max_points,
+		processes = processes, **kwargs)
+	table.save(path)
+	return table
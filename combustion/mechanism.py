@@ -0,0 +1,131 @@
+"""
+Mechanism registry
+
+Loads every mechanism once per process: Solution objects are memoized by (path, phase) and species lists
+by path. Solution objects handed out by solution() are shared, so callers set the state they need before
+using them, as the scripts always do.
+
+.cti and .xml mechanisms are converted to YAML the first time they are seen, and the converted file
+is kept in CACHE_DIR under a name that contains the hash of the source file. Later runs and pool
+workers load the YAML directly instead of re-parsing the original input. The same hash identifies
+the mechanism in the keys of the result cache (combustion.cache).
+
+A .cti or .xml mechanism that cannot be found is replaced by the .yaml of the same name, so the
+defaults written for older Cantera versions (gri30.cti) load the YAML files of Cantera 3.0 and later.
+"""
+
+import hashlib
+import os
+
+import cantera as ct
+
+# converted mechanisms, can be moved with the COMBUSTION_MECH_CACHE environment variable
+CACHE_DIR = os.environ.get('COMBUSTION_MECH_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'combustion', 'mechanisms'))
+
+_solutions = {}
+_species = {}
+_keys = {} # mechanism_key() of every Solution handed out by solution(), by id
+_sources = {} # (path, phase) of every Solution handed out by solution(), by id
+
+
+def locate(path):
+	# full path of a mechanism file, looked up like Cantera does in the working and data directories, or None
+	if os.path.isfile(path):
+		return os.path.abspath(path)
+
+	for directory in ct.get_data_directories():
+		candidate = os.path.join(directory, path)
+		if os.path.isfile(candidate):
+			return os.path.abspath(candidate)
+
+	return None
+
+
+def file_hash(path):
+	# short content hash of a file
+	sha = hashlib.sha256()
+	with open(path, 'rb') as f:
+		for block in iter(lambda: f.read(1 << 20), b''):
+			sha.update(block)
+	return sha.hexdigest()[:16]
+
+
+def yaml_fallback(path):
+	# the .yaml of the same name as a .cti or .xml mechanism that cannot be found, as Cantera 3.0 and
+	# later ship gri30.yaml but no gri30.cti; any other input is returned unchanged
+	base, ext = os.path.splitext(path)
+	if ext.lower() in ('.cti', '.xml') and locate(path) is None and locate(base + '.yaml') is not None:
+		return base + '.yaml'
+	return path
+
+
+def compiled(path):
+	# YAML version of a .cti or .xml mechanism, converted on first use; any other input is returned unchanged
+	path = yaml_fallback(path)
+	ext = os.path.splitext(path)[1].lower()
+	source = locate(path)
+	if ext not in ('.cti', '.xml') or source is None:
+		return path
+
+	name = os.path.splitext(os.path.basename(path))[0]
+	target = os.path.join(CACHE_DIR, '%s-%s.yaml' %(name, file_hash(source)))
+
+	if not os.path.isfile(target):
+		try:
+			if ext == '.cti':
+				from cantera.cti2yaml import convert
+			else:
+				from cantera.ctml2yaml import convert
+		except ImportError:
+			# Cantera versions without YAML support load the original file
+			return path
+
+		os.makedirs(CACHE_DIR, exist_ok = True)
+
+		# several processes may convert the same file at once, each writes its own temporary file
+		tmp = '%s.%d.tmp' %(target, os.getpid())
+		convert(source, tmp)
+		os.replace(tmp, target)
+
+	return target
+
+
+def mechanism_key(path, phase=''):
+	# content hash and phase identifying a mechanism in result cache keys
+	source = locate(yaml_fallback(path))
+	return (file_hash(source) if source is not None else path, phase)
+
+
+def solution(path, phase=''):
+	# memoized Solution of one phase of a mechanism
+	key = (path, phase)
+	if key not in _solutions:
+		try:
+			_solutions[key] = ct.Solution(compiled(path), phase)
+		except ct.CanteraError:
+			# the YAML files of Cantera 3.0 have one phase where the .cti files had several (gri30_mix is
+			# gri30 of gri30.yaml, which has mixture-averaged transport), so fall back to the default phase
+			if not phase or yaml_fallback(path) == path:
+				raise
+			_solutions[key] = ct.Solution(compiled(path))
+		_keys[id(_solutions[key])] = mechanism_key(path, phase)
+		_sources[id(_solutions[key])] = key
+	return _solutions[key]
+
+
+def solution_key(gas):
+	# mechanism_key() of a Solution returned by solution(), None for any other Solution
+	return _keys.get(id(gas))
+
+
+def source(gas):
+	# (path, phase) that solution() loaded a Solution from, so that other processes can load it too; None for any other Solution
+	return _sources.get(id(gas))
+
+
+def species(path):
+	# memoized list of all species objects of a mechanism
+	if path not in _species:
+		list_from_file = getattr(ct.Species, 'list_from_file', None) or ct.Species.listFromFile
+		_species[path] = list_from_file(compiled(path))
+	return _species[path]
@@ -0,0 +1,246 @@
+"""
+Integrator lab for stiff scalar ODEs dy/dt = f(t, y)
+
+	euler         explicit Euler, order 1
+	backward      backward Euler, order 1, L-stable
+	trapezoidal   trapezoidal rule, order 2, A-stable but not L-stable
+	bdf2          two-step backward differentiation formula, order 2, started with a backward Euler
+	              step extrapolated from two half steps, which is also of order 2
+	rosenbrock    ROS2, a two-stage L-stable Rosenbrock method of order 2 with an embedded order 1
+	              solution, adaptive step size
+	rk23          Bogacki-Shampine explicit Runge-Kutta 3(2) pair, adaptive step size
+
+Every method integrates a batch at once: y0 and the step sizes h (or the tolerances of the adaptive
+methods) are broadcast against each other and each element is an independent ODE, so many step
+sizes or initial conditions run in one set of array operations. Implicit stages are solved by
+Newton iterations on all elements together.
+
+Every run reports, per element, the largest error against the analytical solution over the run and
+the error at the end, and the cost: steps, rejected steps, right-hand side and Jacobian evaluations.
+On the stiff problem the largest error is that of the first steps through the initial transient,
+and the error at the end is that of the smooth solution, which shows the order of the method.
+"""
+
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+FIXED = ('euler', 'backward', 'trapezoidal', 'bdf2')
+ADAPTIVE = ('rosenbrock', 'rk23')
+METHODS = FIXED + ADAPTIVE
+
+# ROS2 parameter, 1 + 1/sqrt(2) makes the method L-stable
+GAMMA = 1 + 1/np.sqrt(2)
+
+
+@dataclass
+class Problem:
+	f: object # f(t, y)
+	jac: object # df/dy (t, y)
+	dfdt: object # df/dt (t, y), used by the Rosenbrock method
+	exact: object # exact(t, y0)
+
+
+def _stiff_exact(t, y0):
+	a = 2000/999
+	return 3 - a*np.exp(-t) + (y0 - 3 + a)*np.exp(-1000*t)
+
+# dy/dt = -1000*y + 3000 - 2000*e^-t of the stability study; its exact solution has 2000/999 where
+# the study rounds to 2.002 and 0.998
+STIFF = Problem(f = lambda t, y: -1000*y + 3000 - 2000*np.exp(-t), jac = lambda t, y: np.full_like(y, -1000.0),
+	dfdt = lambda t, y: 2000*np.exp(-t), exact = _stiff_exact)
+
+
+class _Counter:
+
+	# right-hand side and Jacobian of a problem, counting evaluations per element
+
+	def __init__(self, problem, shape):
+		self.problem = problem
+		self.rhs = np.zeros(shape, dtype = int)
+		self.jac_evals = np.zeros(shape, dtype = int)
+
+	def f(self, t, y, active):
+		self.rhs += active
+		return self.problem.f(t, y)
+
+	def jac(self, t, y, active):
+		self.jac_evals += active
+		return self.problem.jac(t, y)
+
+
+def _newton(F, rhs_fn, jac_fn, Y, active, tol=1e-12, max_iter=20):
+	# solve Y = F + c*f(t, Y) elementwise, with rhs_fn(Y) = c*f(t, Y) and jac_fn(Y) = c*df/dy
+	for i in range(max_iter):
+		g = Y - F - rhs_fn(Y)
+		if np.all(np.abs(g[active]) <= tol*np.maximum(1, np.abs(Y[active]))):
+			break
+		Y = Y - g/(1 - jac_fn(Y))
+	return Y
+
+
+def _backward(counter, y, t_new, h, active):
+	# backward Euler step of size h ending at t_new
+	return _newton(y, lambda Y: h*counter.f(t_new, Y, active), lambda Y: h*counter.jac(t_new, Y, active), y, active)
+
+
+def _fixed(method, problem, y0, h, t_end, trajectory):
+	y = y0.copy()
+	t = np.zeros_like(y)
+	n_steps = int(np.ceil(t_end/h.min() - 1e-9))
+	counter = _Counter(problem, y.shape)
+	steps = np.zeros(y.shape, dtype = int)
+	error = np.zeros_like(y)
+	y_old = None
+	path = [y.copy()] if trajectory else None
+
+	for n in range(n_steps):
+		active = t < t_end - 1e-9*h
+		if not active.any():
+			break
+		t_new = t + h
+
+		if method == 'euler':
+			Y = y + h*counter.f(t, y, active)
+		elif method == 'backward':
+			Y = _backward(counter, y, t_new, h, active)
+		elif method == 'bdf2' and y_old is None:
+			# Richardson extrapolation of one full and two half backward Euler steps
+			Y = 2*_backward(counter, _backward(counter, y, t + h/2, h/2, active), t_new, h/2, active) - _backward(counter, y, t_new, h, active)
+		elif method == 'trapezoidal':
+			F = y + h/2*counter.f(t, y, active)
+			Y = _newton(F, lambda Y: h/2*counter.f(t_new, Y, active), lambda Y: h/2*counter.jac(t_new, Y, active), y, active)
+		elif method == 'bdf2':
+			F = 4/3*y - 1/3*y_old
+			Y = _newton(F, lambda Y: 2/3*h*counter.f(t_new, Y, active), lambda Y: 2/3*h*counter.jac(t_new, Y, active), y, active)
+
+		y_old = np.where(active, y, y_old if y_old is not None else y)
+		y = np.where(active, Y, y)
+		t = np.where(active, t_new, t)
+		steps += active
+		error = np.maximum(error, np.where(active, np.abs(y - problem.exact(t, y0)), 0))
+		if trajectory:
+			path.append(np.where(active, y, np.nan))
+
+	return y, error, np.abs(y - problem.exact(t, y0)), steps, np.zeros_like(steps), counter, path
+
+
+def _rosenbrock_step(problem, counter, t, y, h, active):
+	# ROS2 solution and its error estimate against the embedded first order solution
+	J = counter.jac(t, y, active)
+	f0 = counter.f(t, y, active)
+	ft = problem.dfdt(t, y)
+	W = 1 - GAMMA*h*J
+	k1 = (f0 + GAMMA*h*ft)/W
+	k2 = (counter.f(t + h, y + h*k1, active) - 2*k1 - GAMMA*h*ft)/W
+	return y + h*(1.5*k1 + 0.5*k2), h/2*(k1 + k2)
+
+
+def _rk23_step(problem, counter, t, y, h, active):
+	# Bogacki-Shampine third order solution and its error estimate against the second order one
+	k1 = counter.f(t, y, active)
+	k2 = counter.f(t + h/2, y + h/2*k1, active)
+	k3 = counter.f(t + 3*h/4, y + 3*h/4*k2, active)
+	Y = y + h*(2/9*k1 + 1/3*k2 + 4/9*k3)
+	k4 = counter.f(t + h, Y, active)
+	return Y, h*(-5/72*k1 + 1/12*k2 + 1/9*k3 - 1/8*k4)
+
+
+def _adaptive(method, problem, y0, h, t_end, rtol, atol, trajectory, max_steps=1000000):
+	step, order = (_rosenbrock_step, 1) if method == 'rosenbrock' else (_rk23_step, 2)
+	y = y0.copy()
+	t = np.zeros_like(y)
+	h = h.copy()
+	counter = _Counter(problem, y.shape)
+	steps = np.zeros(y.shape, dtype = int)
+	rejected = np.zeros(y.shape, dtype = int)
+	error = np.zeros_like(y)
+	path = [(t.copy(), y.copy())] if trajectory else None
+
+	for n in range(max_steps):
+		active = t < t_end*(1 - 1e-12)
+		if not active.any():
+			break
+		h = np.minimum(h, t_end - t)
+		Y, est = step(problem, counter, t, y, h, active)
+
+		# error norm, accepted when at most 1; the step changes by at most a factor of 5
+		err = np.abs(est)/(atol + rtol*np.maximum(np.abs(y), np.abs(Y)))
+		accept = active & (err <= 1)
+		y = np.where(accept, Y, y)
+		t = np.where(accept, t + h, t)
+		steps += accept
+		rejected += active & ~accept
+		error = np.maximum(error, np.where(accept, np.abs(y - problem.exact(t, y0)), 0))
+		with np.errstate(divide = 'ignore'):
+			factor = np.clip(0.9*err**(-1/(order + 1)), 0.2, 5.0)
+		h = np.where(active, h*factor, h)
+		if trajectory:
+			path.append((np.where(accept, t, np.nan), np.where(accept, y, np.nan)))
+
+	return y, error, np.abs(y - problem.exact(t, y0)), steps, rejected, counter, path
+
+
+def integrate(method, y0=0.0, t_end=0.5, h=0.002, rtol=1e-6, atol=1e-9, problem=STIFF, trajectory=False):
+	"""
+	Integrate a batch of ODEs from t = 0 to t_end with one method
+
+	y0 and h are broadcast against each other, and for the adaptive methods rtol and atol as well;
+	h is the initial step of the adaptive methods. Returns a dict of arrays of the batch shape:
+	y (at t_end), error (largest absolute error over the run), end_error (at t_end), steps, rejected, rhs_evals and
+	jac_evals, and the wall time of the whole batch. With trajectory = True it also has t and Y,
+	one row per step and nan where an element had finished or rejected the step.
+	"""
+	if method not in METHODS:
+		raise ValueError('Unknown integration method: {0}'.format(method))
+	y0, h, rtol, atol = (np.array(x, dtype = float) for x in np.broadcast_arrays(y0, h, rtol, atol))
+
+	start = time.perf_counter()
+	if method in FIXED:
+		y, error, end_error, steps, rejected, counter, path = _fixed(method, problem, y0, h, t_end, trajectory)
+	else:
+		y, error, end_error, steps, rejected, counter, path = _adaptive(method, problem, y0, h, t_end, rtol, atol, trajectory)
+	result = {'y': y, 'error': error, 'end_error': end_error, 'steps': steps, 'rejected': rejected, 'rhs_evals': counter.rhs,
+		'jac_evals': counter.jac_evals, 'time': time.perf_counter() - start}
+
+	if trajectory:
+		if method in FIXED:
+			result['Y'] = np.array(path)
+			result['t'] = np.arange(len(path))[:, None]*h.ravel()[None, :]
+			result['t'] = result['t'].reshape((len(path),) + h.shape)
+		else:
+			result['t'] = np.array([p[0] for p in path])
+			result['Y'] = np.array([p[1] for p in path])
+	return result
+
+
+def compare(methods=METHODS, h=(0.0005, 0.001, 0.002, 0.005, 0.01), rtol=(1e-3, 1e-5, 1e-7), y0=0.0, t_end=0.5, problem=STIFF):
+	"""
+	Error and cost of every method, the fixed step ones for every h and the adaptive ones for every rtol
+
+	Returns a dict of arrays with one entry per run: method, h (nan for adaptive runs), rtol (nan
+	for fixed step runs), error, end_error, steps, rejected, rhs_evals and jac_evals.
+	"""
+	rows = {key: [] for key in ('method', 'h', 'rtol', 'error', 'end_error', 'steps', 'rejected', 'rhs_evals', 'jac_evals')}
+	for method in methods:
+		if method in FIXED:
+			res = integrate(method, y0, t_end, h = np.array(h, dtype = float), problem = problem)
+			settings = {'h': np.array(h, dtype = float), 'rtol': np.full(len(h), np.nan)}
+		else:
+			res = integrate(method, y0, t_end, h = 1e-6, rtol = np.array(rtol), atol = 1e-3*np.array(rtol), problem = problem)
+			settings = {'h': np.full(len(rtol), np.nan), 'rtol': np.array(rtol, dtype = float)}
+		rows['method'].extend([method]*len(res['error']))
+		for key in ('h', 'rtol'):
+			rows[key].extend(settings[key])
+		for key in ('error', 'end_error', 'steps', 'rejected', 'rhs_evals', 'jac_evals'):
+			rows[key].extend(res[key])
+	return {key: np.array(value) for key, value in rows.items()}
+
+
+def print_comparison(table):
+	print('%-12s %10s %10s %12s %12s %8s %8s %10s %10s' %('method', 'h', 'rtol', 'max error', 'end error', 'steps', 'rejected',
+		'rhs evals', 'jac evals'))
+	for j in range(len(table['method'])):
+		print('%-12s %10.4g %10.4g %12.4e %12.4e %8d %8d %10d %10d' %(table['method'][j], table['h'][j], table['rtol'][j],
+			table['error'][j], table['end_error'][j], table['steps'][j], table['rejected'][j], table['rhs_evals'][j], table['jac_evals'][j]))
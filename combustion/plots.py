@@ -0,0 +1,196 @@
+"""
+Plots of the results of combustion.analyses
+
+matplotlib is only imported when a plot is drawn, so the analyses and the pool workers they start
+never load it. Every function draws into new figures and returns them; show() displays all open figures.
+"""
+
+import numpy as np
+
+
+def _pyplot():
+	import matplotlib.pyplot as plt
+	return plt
+
+
+def show():
+	_pyplot().show()
+
+
+def aft_comparison(x, result, xlabel, title, loc='upper right'):
+	# adiabatic flame temperature of an AFTResult against x, with the Cantera values if present
+	plt = _pyplot()
+	fig = plt.figure()
+	plt.plot(x, result.T_newton, color = 'blue', label = 'Without using Cantera')
+	if result.T_equilibrium is not None:
+		plt.plot(x, result.T_equilibrium, color = 'red', label = 'Using Cantera')
+		plt.legend(loc = loc)
+	plt.xlabel(xlabel)
+	plt.ylabel('Temperature (K)')
+	plt.title(title)
+	return fig
+
+
+def _preheat(result, y, marker, interval, ylabel, title):
+	plt = _pyplot()
+	fig = plt.figure()
+	shown = (result.T_air % interval == 0)
+	plt.plot(result.T_air[shown], y[shown], marker)
+	plt.title(title)
+	plt.xlabel('Temperature of preheated air at inlet (K)')
+	plt.ylabel(ylabel)
+	return fig
+
+
+def preheat_temperature(result, interval=10):
+	# flame temperature of a PreheatResult at every interval K of air temperature
+	return _preheat(result, result.T_ad, '*', interval, 'Adiabatic flame temperature (K)',
+		'Effect of Preheating on Adiabatic Flame Temperature')
+
+
+def preheat_efficiency(result, interval=10, fuel='CH4'):
+	# efficiency of a PreheatResult at every interval K of air temperature
+	return _preheat(result, result.efficiency, 'o', interval, 'Efficiency',
+		'Effect of preheating on the efficiency of combustion of %s in air' %fuel)
+
+
+def ignition_delay(x, result, xlabel, title):
+	# ignition delay of an IgnitionResult in ms against x
+	plt = _pyplot()
+	fig = plt.figure()
+	plt.plot(x, result.t_ign*1e3)
+	plt.xlabel(xlabel)
+	plt.ylabel('Ignition time delay (ms)')
+	plt.title(title)
+	return fig
+
+
+def ignition_table(table, T, P, phi=1.0, fuel='CH4'):
+	# ignition delay in ms looked up in an IgnitionTable against T (K), one line per pressure of P (Pa)
+	plt = _pyplot()
+	fig = plt.figure()
+	for P_i in np.atleast_1d(P):
+		plt.semilogy(T, table.lookup(T, P_i, phi)*1e3, label = 'P = %g atm' %(P_i/101325.0))
+	plt.xlabel('Temperature (K)')
+	plt.ylabel('Ignition time delay (ms)')
+	plt.title('Tabulated ignition time delay of %s-air mixtures at phi = %g' %(fuel, phi))
+	plt.legend(loc = 'upper right')
+	return fig
+
+
+def species_history(history, moles=1.0, fuel='CH4'):
+	# moles of every species of a SpeciesHistory, for a mixture of the given total moles
+	plt = _pyplot()
+	fig = plt.figure()
+	for name, X in history.X.items():
+		plt.plot(history.time, moles*X, alpha = 0.5, label = '[%s]' %name)
+	plt.xlabel('Time (s)')
+	plt.ylabel('Molar concentration (moles)')
+	plt.title('Rate of change of molar concentrations of %s\nfor auto-ignition of %s at %g K' %(', '.join(history.X), fuel, history.T0))
+	plt.legend(loc = 'center right')
+	return fig
+
+
+def flame(result, fuel):
+	# temperature and velocity profiles of a FlameResult, and one figure per recorded concentration
+	plt = _pyplot()
+	figures = [plt.figure()]
+	plt.subplot(2,1,1)
+	plt.plot(result.grid, result.T)
+	plt.ylabel('Temperature (K)')
+	plt.xlabel('Domain length (m)')
+	plt.title('Flame Speed analysis for combustion of %s' %fuel)
+	plt.subplot(2,1,2)
+	plt.plot(result.grid, result.velocity)
+	plt.ylabel('Velocity (m/s)')
+	plt.xlabel('Domain length (m)')
+	figures[0].tight_layout()
+
+	for name, conc in result.concentrations.items():
+		figures.append(plt.figure())
+		plt.plot(result.grid, conc)
+		plt.xlabel('Domain length (m)')
+		plt.ylabel('Concentration of %s (kmol/m^3)' %name)
+		figures[-1].suptitle('Variation in concentration of %s across the domain' %name)
+	return figures
+
+
+def flame_speed_map(phi, T, Su, P, fuel='CH4'):
+	# flame speed of a flame map Su[phi, T] at one pressure P (Pa) against phi, one line per temperature of T (K)
+	plt = _pyplot()
+	fig = plt.figure()
+	for j in range(len(T)):
+		plt.plot(phi, Su[:, j], 'o-', label = 'T = %g K' %T[j])
+	plt.xlabel('Equivalence ratio ($\\phi$)')
+	plt.ylabel('Laminar flame speed (m/s)')
+	plt.title('Flame speed of %s-air mixtures at %g atm' %(fuel, P/101325.0))
+	plt.legend(loc = 'best')
+	return fig
+
+
+def sensitivity(result, fuel='CH4', quantity='Temperature', xlabel='Temperature sensitivity'):
+	# horizontal bars of the signed sensitivities of a SensitivityResult
+	plt = _pyplot()
+	fig = plt.figure()
+	ax = fig.add_subplot(111)
+	ax.tick_params(axis = 'y', labelsize = 8)
+	plt.title('Most sensitive reaction parameters to %s\nin the auto-ignition of %s' %(quantity, fuel))
+	plt.barh(list(result.equation), result.S)
+	plt.xlabel(xlabel)
+	plt.tight_layout()
+	return fig
+
+
+def reduction_curves(result, min_size=1):
+	# ignition delay and maximum temperature against mechanism size, one figure per state of a ReductionResult
+	plt = _pyplot()
+	figures = []
+	mech_size = range(min_size, result.curve_ign_delay.shape[1] + 1)
+
+	for j, (T, P, phi) in enumerate(result.states):
+		figures.append(plt.figure())
+		plt.subplot(2,1,1)
+		plt.title('State Values: T = %g K, P = %g bar, phi = %g' %(T, P/100000, phi))
+		plt.plot(mech_size, result.curve_ign_delay[j, min_size-1:], color = 'green')
+		plt.axhline(y = result.ign_delay_ref[j], color = 'red', linestyle = 'dotted', label = 'Reference Ignition Delay')
+		plt.xlabel('No. of reactions most sensitive to Temperature')
+		plt.ylabel('Ignition Delay (s)')
+		plt.legend(loc = 'best')
+
+		plt.subplot(2,1,2)
+		plt.plot(mech_size, result.curve_T_max[j, min_size-1:], color = 'blue')
+		plt.axhline(y = result.T_max_ref[j], color = 'red', linestyle = 'dotted', label = 'Reference Max Temperature')
+		plt.xlabel('No. of reactions most sensitive to Temperature')
+		plt.ylabel('Maximum Temperature (K)')
+		plt.legend(loc = 'best')
+		plt.tight_layout()
+	return figures
+
+
+def ode_stability(result):
+	# numerical and analytical solutions of an ODEResult
+	plt = _pyplot()
+	fig = plt.figure()
+	plt.plot(result.t, result.y_numerical, alpha = 0.7, label = 'Numerical Sol')
+	plt.plot(result.t, result.y_analytical, alpha = 0.7, label = 'Analytical Sol')
+	plt.legend(loc = 'best')
+	plt.xlabel('time')
+	plt.ylabel('y = f(t)')
+	fig.suptitle('Stability analysis for a simple ODE for time step h = {}'.format(result.h))
+	return fig
+
+
+def ode_methods(result):
+	# largest error against right-hand side evaluations of every method of an ODEComparison
+	plt = _pyplot()
+	fig = plt.figure()
+	for method in dict.fromkeys(result.method):
+		runs = result.method == method
+		order = np.argsort(result.rhs_evals[runs])
+		plt.loglog(result.rhs_evals[runs][order], result.error[runs][order], 'o-', label = method)
+	plt.ylim(top = 10)
+	plt.legend(loc = 'best')
+	plt.xlabel('Right-hand side evaluations')
+	plt.ylabel('Largest absolute error')
+	plt.title('Error against cost of the integrators')
+	return fig
@@ -0,0 +1,108 @@
+"""
+Air preheating sweeps
+
+A preheated air stream and a fuel stream are mixed adiabatically at constant pressure, then burnt.
+The enthalpies of the air at every preheat temperature are evaluated at once with a SolutionArray,
+so the mixtures of a whole sweep are known before anything is burnt.
+
+flame_temperature() equilibrates each mixture at constant (U, V) on one gas object. Every point
+starts from the equilibrium composition of the previous one. The element totals do not change
+along the sweep, so only the energy and volume have to be moved. Equilibria are kept in the result
+cache (combustion.cache) when gas comes from combustion.mechanism.solution().
+
+efficiency() is the energy balance of the preheating scripts in closed form: the heat released per
+kg of fuel when the products leave at T_flue, divided by the lower heating value.
+
+Fuels are CxHy burnt in air (O2 + 3.76 N2), as in combustion.aft, and results are dicts of arrays.
+"""
+
+import cantera as ct
+import numpy as np
+
+from combustion.aft import PRODUCTS, fuel_atoms, products
+from combustion.cache import make_key, result_cache
+from combustion.mechanism import solution_key
+
+AIR = 'O2:1, N2:3.76'
+
+
+def _streams(gas, fuel, T_air, P, phi, T_fuel):
+	# moles of air per mole of fuel, molar enthalpies of the air at every T_air and of the fuel,
+	# and the molecular weights of both streams
+	x, y = fuel_atoms(fuel)
+	n_air = 4.76*(x + y/4)/phi
+
+	# a SolutionArray works through gas, so its properties are read before gas is set to the fuel
+	air = ct.SolutionArray(gas, len(T_air))
+	air.TPX = T_air, P, AIR
+	h_air = air.enthalpy_mole
+	M_air = air.mean_molecular_weight[0]
+
+	gas.TPX = T_fuel, P, {fuel: 1}
+	return n_air, h_air, gas.enthalpy_mole, M_air, gas.mean_molecular_weight
+
+
+def flame_temperature(gas, fuel, T_air, P=ct.one_atm, phi=1.0, T_fuel=298.0, cache=True):
+	"""
+	Constant volume adiabatic flame temperature of fuel burnt with air preheated to each of T_air (K)
+
+	Returns T_air, the temperature of the unburnt mixture T_mix, the flame temperature T_ad and the
+	specific enthalpy of the burnt mixture h (J/kg). The state of gas is changed.
+	"""
+	T_air = np.atleast_1d(np.asarray(T_air, dtype = float))
+	n_air, h_air, h_fuel, M_air, M_fuel = _streams(gas, fuel, T_air, P, phi, T_fuel)
+
+	# unburnt mixtures, per kg
+	h_mix = (n_air*h_air + h_fuel)/(n_air*M_air + M_fuel)
+	gas.TPX = T_fuel, P, {fuel: 1, 'O2': n_air/4.76, 'N2': 3.76*n_air/4.76}
+	X_mix = gas.X
+	mix = ct.SolutionArray(gas, len(T_air))
+	mix.HPX = h_mix, P, X_mix
+	u = mix.int_energy_mass
+	v = mix.volume_mass
+
+	T_ad = np.zeros(len(T_air))
+	h = np.zeros(len(T_air))
+	todo = list(range(len(T_air)))
+
+	store = result_cache() if cache and solution_key(gas) is not None else None
+	if store is not None:
+		keys = [make_key('preheat', solution_key(gas), fuel, T_air[k], P, phi, T_fuel) for k in todo]
+		found = store.get_many(keys)
+		for k, key in enumerate(keys):
+			if key in found:
+				T_ad[k], h[k] = found[key]
+		todo = [k for k in todo if keys[k] not in found]
+
+	if todo:
+		gas.HPX = h_mix[todo[0]], P, X_mix
+
+	for k in todo:
+		gas.UV = u[k], v[k]
+		gas.equilibrate('UV')
+		T_ad[k] = gas.T
+		h[k] = gas.enthalpy_mass
+
+	if store is not None:
+		store.put_many((keys[k], (T_ad[k], h[k])) for k in todo)
+
+	return {'T_air': T_air, 'T_mix': mix.T, 'T_ad': T_ad, 'h': h}
+
+
+def efficiency(gas, fuel, T_air, P=ct.one_atm, phi=1.0, T_fuel=298.0, T_flue=1700.0, LHV=50e6):
+	"""
+	Combustion efficiency of fuel burnt with air preheated to each of T_air (K)
+
+	Products are those of combustion.aft.products() leaving at T_flue. LHV is in J/kg.
+	Returns T_air, the heat released per kg of fuel Q (J/kg) and the efficiency Q/LHV.
+	"""
+	T_air = np.atleast_1d(np.asarray(T_air, dtype = float))
+	n_air, h_air, h_fuel, M_air, M_fuel = _streams(gas, fuel, T_air, P, phi, T_fuel)
+
+	x, y = fuel_atoms(fuel)
+	N = products(x, y, phi)
+	gas.TPX = T_flue, P, {name: n for name, n in zip(PRODUCTS, N) if n > 0}
+	H_flue = N.sum()*gas.enthalpy_mole
+
+	Q = (n_air*h_air + h_fuel - H_flue)/M_fuel
+	return {'T_air': T_air, 'Q': Q, 'efficiency': Q/LHV}
@@ -0,0 +1,157 @@
+"""
+Solver statistics and profiling of the reactor loops
+
+With the COMBUSTION_STATS_LOG environment variable set to a file name, every reactor run of the
+ignition, sensitivity and reduction drivers appends one JSON line to that file with:
+
+	kind, pid, T0 (K), P0 (Pa)           what was run, and in which process
+	steps                                integrator steps taken by the driver loop
+	solver                               CVODES counters of the network (rhs_evals, jac_evals, ...),
+	                                     from ReactorNet.solver_stats where Cantera has it (3.0 and later)
+	time, time_cantera, time_python      wall time of the loop, the part spent inside ReactorNet.step()
+	                                     and the rest, which is the Python overhead of the loop
+	peak_rss_mb                          peak resident memory of the process so far
+	result                               the result of the run (t_ign, T_max, ...)
+
+Pool workers append to the same file, so a whole sweep lands in one log; summary() aggregates it,
+and python -m combustion.profiling <log> prints the totals.
+Without the variable nothing is timed and nothing is written.
+
+With COMBUSTION_PROFILE set to a directory, every task of a driver (one ignition point, one
+reduction state, one sensitivity run) runs under cProfile, and each process keeps its accumulated
+statistics in <directory>/<driver>-<pid>.prof for pstats or snakeviz. A driver run inside the task
+of another (the sensitivity runs of a reduction) is part of the outer profile. For sampling
+profilers such as py-spy, run the driver with processes = 1 so that the whole loop stays in one process.
+"""
+
+import cProfile
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+STATS_LOG = os.environ.get('COMBUSTION_STATS_LOG')
+PROFILE_DIR = os.environ.get('COMBUSTION_PROFILE')
+
+_profiles = {}
+_active = None # driver whose profile is enabled in this process
+
+
+def enabled():
+	return bool(STATS_LOG)
+
+
+def _peak_rss_mb():
+	try:
+		import resource
+	except ImportError:
+		return None
+	peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	return peak/2**20 if sys.platform == 'darwin' else peak/2**10
+
+
+class StepClock:
+
+	# stands in for sim.step and sim.advance in a driver loop and adds up the time spent inside them
+
+	def __init__(self, sim):
+		self.sim = sim
+		self.cantera = 0.0
+		self.start = time.perf_counter()
+
+	def step(self):
+		start = time.perf_counter()
+		t = self.sim.step()
+		self.cantera = self.cantera + time.perf_counter() - start
+		return t
+
+	def advance(self, t):
+		start = time.perf_counter()
+		self.sim.advance(t)
+		self.cantera = self.cantera + time.perf_counter() - start
+
+
+def clock(sim):
+	# StepClock for sim when statistics are logged, otherwise None
+	return StepClock(sim) if enabled() else None
+
+
+def record(kind, clock, steps, T0, P0, **result):
+	# append the statistics of one finished run to STATS_LOG; does nothing without a clock
+	# steps is None for runs driven by ReactorNet.advance(), which count their steps in the solver
+	if clock is None:
+		return
+
+	elapsed = time.perf_counter() - clock.start
+	# CVODES reports errors for statistics asked before the first step
+	solver = getattr(clock.sim, 'solver_stats', None) if clock.sim.time > 0 else None
+	solver = dict(solver or {})
+	if steps is None:
+		steps = solver.get('steps', 0)
+	entry = {'kind': kind, 'pid': os.getpid(), 'T0': T0, 'P0': P0, 'steps': int(steps), 'solver': solver,
+		'time': elapsed, 'time_cantera': clock.cantera, 'time_python': elapsed - clock.cantera,
+		'peak_rss_mb': _peak_rss_mb(), 'result': {key: float(value) for key, value in result.items()}}
+
+	# one write per line, so that lines of different processes do not interleave
+	with open(STATS_LOG, 'a') as f:
+		f.write(json.dumps(entry) + '\n')
+
+
+@contextmanager
+def profiled(driver):
+	# run the body under this process's cProfile of driver when COMBUSTION_PROFILE is set
+	# only one profiler can be active per process: a driver called inside another one's task (the
+	# sensitivity runs of a reduction state) is counted in the profile of the outer task
+	global _active
+	if not PROFILE_DIR or _active is not None:
+		yield
+		return
+
+	if driver not in _profiles:
+		os.makedirs(PROFILE_DIR, exist_ok = True)
+		_profiles[driver] = cProfile.Profile()
+	profile = _profiles[driver]
+
+	_active = driver
+	profile.enable()
+	try:
+		yield
+	finally:
+		profile.disable()
+		_active = None
+		profile.dump_stats(os.path.join(PROFILE_DIR, '%s-%d.prof' %(driver, os.getpid())))
+
+
+def summary(path=None):
+	# totals of a statistics log per kind of run: runs, steps, solver counters and times
+	totals = defaultdict(lambda: defaultdict(float))
+	with open(path or STATS_LOG) as f:
+		for line in f:
+			entry = json.loads(line)
+			total = totals[entry['kind']]
+			total['runs'] += 1
+			total['steps'] += entry['steps']
+			for key in ('time', 'time_cantera', 'time_python'):
+				total[key] += entry[key]
+			# the solver's own step count is the same as that of the driver
+			for key, value in entry['solver'].items():
+				if key not in ('steps', 'last_order'):
+					total[key] += value
+			total['peak_rss_mb'] = max(total['peak_rss_mb'], entry['peak_rss_mb'] or 0)
+	return {kind: dict(total) for kind, total in totals.items()}
+
+
+def print_summary(path=None):
+	for kind, total in summary(path).items():
+		runs = total['runs']
+		print('%s: %d runs, %d steps (%.0f per run), %d rhs and %d Jacobian evaluations' %(kind, runs, total['steps'],
+			total['steps']/runs, total.get('rhs_evals', 0), total.get('jac_evals', 0)))
+		print('    %.3f s in total, %.1f %% inside Cantera, %.1f %% Python overhead, peak memory %.0f MB' %(total['time'],
+			100*total['time_cantera']/total['time'], 100*total['time_python']/total['time'], total['peak_rss_mb']))
+
+
+if __name__ == '__main__':
+	# python -m combustion.profiling [log.jsonl]
+	print_summary(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,92 @@
+"""
+Reactor networks with a selectable integration mode
+
+	dense     IdealGasReactor (or IdealGasConstPressureReactor) integrated by CVODES with a dense
+	          direct solve of the Jacobian, the Cantera default
+	sparse    IdealGasMoleReactor (or IdealGasConstPressureMoleReactor) with an AdaptivePreconditioner,
+	          which makes CVODES use the GMRES Krylov solver with a sparse approximate Jacobian as the
+	          preconditioner (Cantera 3.0 and later)
+	auto      sparse for mechanisms with at least SPARSE_SPECIES species where Cantera has it, dense otherwise
+
+The dense solve costs O(n_species^3) per Jacobian factorization, so sparse wins on large mechanisms
+and loses on small ones. SPARSE_SPECIES is the crossover measured by benchmarks/integration_modes.py.
+Its built-in value comes from ignition runs of h2o2 (10 species), GRI30 (53), n-dodecane (100) and
+n-hexane (1268), where sparse was 10 % slower on GRI30 and 1.6 and 3.8 times faster on the two
+larger ones. The benchmark can store the crossover of the machine it ran on in INTEGRATION_SETTINGS,
+and the COMBUSTION_SPARSE_SPECIES environment variable overrides both.
+"""
+
+import json
+import os
+
+import cantera as ct
+import numpy as np
+
+MODES = ('auto', 'dense', 'sparse')
+
+INTEGRATION_SETTINGS = os.path.join(os.path.expanduser('~'), '.cache', 'combustion', 'integration.json')
+
+
+def _sparse_species():
+	if os.environ.get('COMBUSTION_SPARSE_SPECIES'):
+		return int(os.environ['COMBUSTION_SPARSE_SPECIES'])
+	if os.path.isfile(INTEGRATION_SETTINGS):
+		with open(INTEGRATION_SETTINGS) as f:
+			return int(json.load(f)['sparse_species'])
+	return 75
+
+SPARSE_SPECIES = _sparse_species()
+
+
+def sparse_available():
+	return hasattr(ct, 'AdaptivePreconditioner') and hasattr(ct, 'IdealGasMoleReactor')
+
+
+def resolve(mode, gas):
+	# 'dense' or 'sparse' for the integration mode of a network of gas
+	if mode not in MODES:
+		raise ValueError('Unknown integration mode: {0}'.format(mode))
+	if mode == 'dense':
+		return mode
+	if not sparse_available():
+		if mode == 'sparse':
+			raise RuntimeError('Sparse integration needs Cantera 3.0 or later, this is %s' %ct.__version__)
+		return 'dense'
+	if mode == 'auto' and gas.n_species < SPARSE_SPECIES:
+		return 'dense'
+	return 'sparse'
+
+
+def reactor_network(gas, integration='auto', constant_pressure=False):
+	# reactor started from the state of gas and its network, integrated in the given mode
+	if resolve(integration, gas) == 'dense':
+		r = ct.IdealGasConstPressureReactor(gas) if constant_pressure else ct.IdealGasReactor(gas)
+		return r, ct.ReactorNet([r])
+
+	r = ct.IdealGasConstPressureMoleReactor(gas) if constant_pressure else ct.IdealGasMoleReactor(gas)
+	sim = ct.ReactorNet([r])
+	sim.preconditioner = ct.AdaptivePreconditioner()
+	# the preconditioner only needs the main terms of the Jacobian
+	sim.derivative_settings = {'skip-third-bodies': True, 'skip-falloff': True}
+	return r, sim
+
+
+def crossover(n_species, t_dense, t_sparse):
+	"""
+	Smallest mechanism size from which sparse integration is faster
+
+	Takes the wall times of both modes for mechanisms of the given sizes and returns the geometric
+	mean of the largest size where dense wins and the next size, from which sparse wins for all
+	larger mechanisms. Returns the smallest size if sparse always wins, None if it never does.
+	"""
+	order = np.argsort(n_species)
+	n_species = np.asarray(n_species)[order]
+	faster = (np.asarray(t_sparse) < np.asarray(t_dense))[order]
+
+	if not faster[-1]:
+		return None
+	slower = np.nonzero(~faster)[0]
+	if len(slower) == 0:
+		return int(n_species[0])
+	i = slower[-1]
+	return int(round(np.sqrt(n_species[i]*n_species[i+1])))
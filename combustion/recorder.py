@@ -0,0 +1,116 @@
+"""
+Streaming reactor trajectory recorder
+
+Records time, temperature, pressure and the mole fractions of a chosen set of species into a
+preallocated NumPy buffer instead of growing a SolutionArray one state at a time. For long runs
+the buffer is flushed in chunks to a raw binary file and read back as a memory map, so memory use
+stays at one chunk however many steps are recorded. Samples can be decimated adaptively: a state
+is only kept when some recorded quantity has moved by more than a relative tolerance since the
+last kept state.
+"""
+
+import numpy as np
+
+from combustion import counters
+
+
+class TrajectoryRecorder:
+
+	def __init__(self, gas, species, capacity=10000, path=None, decimate=None, atol=1e-12):
+		# gas is only used to look up the species indices; capacity is the buffer (or chunk) size in rows
+		self.species = list(species)
+		self.columns = ['time', 'T', 'P'] + self.species
+		self.index = np.array([gas.species_index(name) for name in self.species], dtype = int)
+		self.path = path
+		self.decimate = decimate
+		self.atol = atol
+
+		self._buffer = np.empty((capacity, len(self.columns)))
+		self._rows = 0 # rows in the buffer
+		self._flushed = 0 # rows already written to path
+		self._last = None # last kept sample
+		self._pending = None # last skipped sample, kept at the end of the run
+
+		if path is not None:
+			open(path, 'wb').close()
+
+	def append(self, t, phase):
+		# add the current state of a phase (usually reactor.thermo) at time t
+		row = np.empty(len(self.columns))
+		row[0] = t
+		row[1] = phase.T
+		row[2] = phase.P
+		row[3:] = phase.X[self.index]
+
+		if self.decimate is not None and self._last is not None:
+			change = np.abs(row[1:] - self._last[1:])/(np.abs(self._last[1:]) + self.atol)
+			if change.max() <= self.decimate:
+				self._pending = row
+				return
+
+		self._keep(row)
+
+	def record(self, sim, phase, t_end):
+		# step the integrator up to t_end, appending the state after every internal step
+		if self._last is None:
+			self.append(sim.time, phase)
+		steps = 0
+		while sim.time < t_end:
+			self.append(sim.step(), phase)
+			steps = steps + 1
+		counters.add('steps', steps)
+		self.finish()
+
+	def finish(self):
+		# keep the last state seen even if decimation skipped it, and flush to file
+		if self._pending is not None:
+			self._keep(self._pending)
+		if self.path is not None:
+			self._flush()
+
+	def _keep(self, row):
+		if self._rows == len(self._buffer):
+			if self.path is not None:
+				self._flush()
+			else:
+				self._buffer = np.concatenate([self._buffer, np.empty_like(self._buffer)])
+
+		self._buffer[self._rows] = row
+		self._rows = self._rows + 1
+		self._last = row
+		self._pending = None
+
+	def _flush(self):
+		with open(self.path, 'ab') as f:
+			f.write(self._buffer[:self._rows].tobytes())
+		self._flushed = self._flushed + self._rows
+		self._rows = 0
+
+	def __len__(self):
+		return self._flushed + self._rows
+
+	@property
+	def data(self):
+		# all recorded rows, one column per entry of self.columns
+		if self.path is None:
+			return self._buffer[:self._rows]
+		self._flush()
+		if self._flushed == 0:
+			return np.empty((0, len(self.columns)))
+		return np.memmap(self.path, dtype = float, mode = 'r', shape = (self._flushed, len(self.columns)))
+
+	@property
+	def time(self):
+		return self.data[:, 0]
+
+	@property
+	def T(self):
+		return self.data[:, 1]
+
+	@property
+	def P(self):
+		return self.data[:, 2]
+
+	def X(self, name):
+		# recorded mole fraction history of one species
+		return self.data[:, 3 + self.species.index(name)]
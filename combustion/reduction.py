@@ -0,0 +1,265 @@
+"""
+Mechanism reduction over a matrix of (T, P, phi) states
+
+Every state is an independent task in two phases:
+
+	rank   - reaction order of the state and the reference ignition delay and maximum temperature
+	         of the full mechanism; the order comes from the maximum temperature sensitivity of every
+	         reaction (method = 'sensitivity'), or from the species importance of a directed relation
+	         graph sampled along the reference run (method = 'drg' or 'drgep', see combustion.drg),
+	         which needs no sensitivity integration
+	search - smallest number of leading reactions of the merged order R_ordered that keeps the
+	         ignition delay and maximum temperature within tolerance, found by bisection
+	reduce - ignition delay and maximum temperature of the mechanisms made of the first
+	         1, 2, ... reactions of R_ordered, only needed when the full curve is plotted
+
+A reduced mechanism is never built as a new Solution: every trial runs on the full mechanism of the
+worker with the multipliers of the excluded reactions set to zero. The reference and trial runs use
+the integration mode of combustion.reactors given by integration; the sensitivity runs are always dense.
+
+The states of a phase run on a process pool, and each finished state is written to its own file in a
+checkpoint directory. A rerun loads the finished states from there and only computes the missing ones.
+Checkpoints store the inputs they were computed for (mechanism, oxidizer, t_end, R_ordered, ...) and are
+recomputed when they change.
+Sensitivities and trial results are also kept in the result cache (combustion.cache), so a search with new
+tolerances or a longer R_ordered repeats no trial that was already run.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from combustion import drg, profiling
+from combustion.cache import cached, make_key, result_cache
+from combustion.ignition import detect_ignition
+from combustion.mechanism import mechanism_key, solution, solution_key
+from combustion.reactors import reactor_network, resolve
+from combustion.sensitivity import max_temperature_sensitivity
+
+# full mechanism gas object owned by the current worker process
+_gas = None
+
+
+def _init_worker(mech):
+	global _gas
+	_gas = solution(mech)
+
+
+def rank_state(gas, fuel, air, T, P, phi, t_end, integration='auto', method='sensitivity', n_samples=50):
+	# reaction ranking and reference ignition delay / maximum temperature of one state
+	gas.TP = T, P
+	gas.set_equivalence_ratio(phi, fuel, air)
+	if method == 'sensitivity':
+		S_max = np.abs(max_temperature_sensitivity(gas, range(gas.n_reactions), t_end))
+		result = {'S_max': S_max, 'order': np.argsort(-S_max, kind = 'stable')}
+	else:
+		states = drg.sample_states(gas, t_end, n_samples, integration)
+		importance = drg.species_importance(gas, states, drg.targets(gas, fuel, air), method)
+		order, score = drg.reaction_order(gas, importance)
+		result = {'importance': importance, 'score': score, 'order': order}
+
+	gas.TP = T, P
+	gas.set_equivalence_ratio(phi, fuel, air)
+	r, sim = reactor_network(gas, integration)
+	result['ign_delay_ref'], result['T_max_ref'] = detect_ignition(sim, r, T + 400, t_end = t_end, full = True, kind = 'reduction')
+	return result
+
+
+def _trial(gas, fuel, air, T, P, phi, t_end, reactions, integration='auto'):
+	# ignition delay and maximum temperature of the mechanism made of the given reaction indices,
+	# with all other reactions of gas switched off for the duration of the run
+	reactions = [int(i) for i in reactions]
+
+	def compute():
+		gas.set_multiplier(0.0)
+		for i in reactions:
+			gas.set_multiplier(1.0, i)
+
+		try:
+			gas.TP = T, P
+			gas.set_equivalence_ratio(phi, fuel, air)
+			r1, sim1 = reactor_network(gas, integration)
+			return detect_ignition(sim1, r1, T + 400, t_end = t_end, full = True, kind = 'reduction')
+		finally:
+			gas.set_multiplier(1.0)
+
+	key = None
+	if solution_key(gas) is not None:
+		key = make_key('trial', solution_key(gas), resolve(integration, gas), fuel, air, T, P, phi, t_end, sorted(reactions))
+
+	return cached(result_cache(), key, compute)
+
+
+def reduction_curve(gas, fuel, air, T, P, phi, t_end, R_ordered, integration='auto'):
+	# ignition delay and maximum temperature of the mechanisms made of the first 1, 2, ... reactions of R_ordered
+	ign_delay = np.zeros(len(R_ordered))
+	T_max = np.zeros(len(R_ordered))
+
+	for i in range(len(R_ordered)):
+
+		ign_delay[i], T_max[i] = _trial(gas, fuel, air, T, P, phi, t_end, R_ordered[:i+1], integration)
+
+	return {'ign_delay': ign_delay, 'T_max': T_max}
+
+
+def search_size(gas, fuel, air, T, P, phi, t_end, R_ordered, ign_delay_ref, T_max_ref,
+		tol_ign_delay, tol_T_max, gallop=False, integration='auto'):
+	"""
+	Smallest number of leading reactions of R_ordered within tolerance of the reference results
+
+	Bisection between a size that fails (initially 0) and one that passes (initially all of R_ordered),
+	about log2(len(R_ordered)) trial simulations. With gallop = True the sizes 1, 2, 4, ... are tried first,
+	which is cheaper when the reduced mechanism is much smaller than the full one. Accuracy is assumed
+	to improve with size, so the result is a size that passes while the one below it fails.
+	Size 0 means that not even the whole of R_ordered is within tolerance.
+	"""
+	trials = {}
+
+	def passes(n):
+		trials[n] = _trial(gas, fuel, air, T, P, phi, t_end, R_ordered[:n], integration)
+		return _within_tol(trials[n][0], trials[n][1], ign_delay_ref, T_max_ref, tol_ign_delay, tol_T_max)
+
+	lo = 0
+	hi = len(R_ordered)
+
+	if gallop:
+		n = 1
+		while n < hi:
+			if passes(n):
+				hi = n
+				break
+			lo = n
+			n = 2*n
+
+	while hi - lo > 1:
+		mid = (lo + hi)//2
+		if passes(mid):
+			hi = mid
+		else:
+			lo = mid
+
+	if hi not in trials and not passes(hi):
+		hi = 0
+
+	ign_delay, T_max = trials.get(hi, (np.nan, np.nan))
+	return {'size': hi, 'ign_delay': ign_delay, 'T_max': T_max, 'n_trials': len(trials)}
+
+
+def merge_rankings(orders):
+	# single reaction order taking the most sensitive reaction of every state, then the second, and so on
+	R_set = set()
+	R_ordered = []
+
+	for i in range(len(orders[0])):
+		for order in orders:
+			if order[i] not in R_set:
+				R_ordered.append(int(order[i]))
+				R_set.add(order[i])
+
+	return R_ordered
+
+
+def _within_tol(ign_delay, T_max, ign_delay_ref, T_max_ref, tol_ign_delay, tol_T_max):
+	# % errors in ignition delay and T_max both within tolerance, False while the mechanism does not ignite
+	with np.errstate(invalid = 'ignore'):
+		err_T_max = np.abs((T_max_ref - T_max)/T_max_ref)*100
+		err_ign_delay = np.abs((ign_delay_ref - ign_delay)/ign_delay_ref)*100
+		return (err_T_max < tol_T_max) & (err_ign_delay < tol_ign_delay)
+
+
+def reduced_size(curve, ign_delay_ref, T_max_ref, tol_ign_delay, tol_T_max):
+	# smallest number of reactions on a reduction curve that is within tolerance, 0 if none
+	ok = np.flatnonzero(_within_tol(curve['ign_delay'], curve['T_max'], ign_delay_ref, T_max_ref, tol_ign_delay, tol_T_max))
+	return int(ok[0]) + 1 if len(ok) else 0
+
+
+def print_sizes(result):
+	# reduced size and errors (%) of every state of a ReductionResult that has a reduced mechanism within tolerance
+	err_T_max = 100*np.abs(result.T_max/result.T_max_ref - 1)
+	err_ign_delay = 100*np.abs(result.ign_delay/result.ign_delay_ref - 1)
+	for j in np.flatnonzero(result.size > 0):
+		T, P, phi = result.states[j]
+		print('T = %g, P = %g, phi = %g, T_max_ref = %g, ign_delay_ref = %g, T_max = %g, ign_delay = %g, T_max_error = %g, Ign_delay_error = %g, red_mech_size = %g'
+			%(T, P, phi, result.T_max_ref[j], result.ign_delay_ref[j], result.T_max[j], result.ign_delay[j], err_T_max[j], err_ign_delay[j],
+			result.size[j]))
+
+
+def _checkpoint_path(checkpoint_dir, phase, fuel, state):
+	T, P, phi = state
+	return os.path.join(checkpoint_dir, '%s_%s_T%g_P%g_phi%g.npz' %(phase, fuel, T, P, phi))
+
+
+def _load_checkpoint(path, inputs):
+	# stored result, or None if it is missing or was computed for different inputs
+	if not os.path.isfile(path):
+		return None
+
+	with np.load(path) as data:
+		result = {key: data[key] for key in data.files}
+
+	for key, value in inputs.items():
+		if key not in result or not np.array_equal(result[key], value):
+			return None
+
+	return result
+
+
+def _save_checkpoint(path, result):
+	# write to a temporary file first so that a crash never leaves a truncated checkpoint
+	tmp = path + '.tmp.npz'
+	np.savez(tmp, **result)
+	os.replace(tmp, path)
+
+
+def _run_task(task):
+	phase, state, kwargs = task
+	with profiling.profiled('reduction'):
+		if phase == 'rank':
+			return rank_state(_gas, *state, **kwargs)
+		if phase == 'search':
+			return search_size(_gas, *state, **kwargs)
+		return reduction_curve(_gas, *state, **kwargs)
+
+
+def run_states(mech, phase, fuel, air, states, checkpoint_dir, processes=None, state_kwargs=None, **kwargs):
+	"""
+	Results of one phase ('rank', 'search' or 'reduce') for every (T, P, phi) in states, in the order of states
+
+	Keyword arguments are passed to the phase function of every state (t_end, R_ordered, tolerances, ...),
+	and state_kwargs is an optional list with extra keyword arguments for each state (reference results).
+	Both are stored with each checkpoint, together with the mechanism hash and the oxidizer, and a
+	checkpoint is only reused when they all match.
+	"""
+	os.makedirs(checkpoint_dir, exist_ok = True)
+	inputs = [dict(kwargs, **(state_kwargs[j] if state_kwargs else {})) for j in range(len(states))]
+	stored = [dict(inputs[j], mechanism = mechanism_key(mech)[0], air = air) for j in range(len(states))]
+	results = [None]*len(states)
+	tasks = {}
+
+	for j, state in enumerate(states):
+		results[j] = _load_checkpoint(_checkpoint_path(checkpoint_dir, phase, fuel, state), stored[j])
+		if results[j] is None:
+			tasks[j] = (phase, (fuel, air) + tuple(state), inputs[j])
+
+	def finish(j, result):
+		result.update(stored[j])
+		_save_checkpoint(_checkpoint_path(checkpoint_dir, phase, fuel, states[j]), result)
+		results[j] = result
+
+	if processes is None:
+		processes = os.cpu_count() or 1
+	processes = min(processes, len(tasks))
+
+	if processes <= 1:
+		if tasks:
+			_init_worker(mech)
+		for j, task in tasks.items():
+			finish(j, _run_task(task))
+	else:
+		with ProcessPoolExecutor(max_workers = processes, initializer = _init_worker, initargs = (mech,)) as pool:
+			futures = {pool.submit(_run_task, task): j for j, task in tasks.items()}
+			for future in as_completed(futures):
+				finish(futures[future], future.result())
+
+	return results
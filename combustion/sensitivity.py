@@ -0,0 +1,125 @@
+"""
+Temperature sensitivity ranking of reactions
+
+Integrates a reactor with a set of reaction sensitivity parameters and keeps, for every parameter,
+the largest temperature sensitivity seen over the run. The whole sensitivity vector is fetched with one
+ReactorNet.sensitivities() call per sample, and the running maximum is kept as a NumPy array.
+The sensitivity system has n_species x n_params equations, so large parameter sets are split into
+chunks that are integrated on separate worker processes, and the maxima of the chunks are joined.
+The maximum of every parameter is independent of the others, so joining needs no reduction; the
+chunks only differ from one run with all parameters through the integrator's step sequence, which
+is controlled to the same tolerances.
+Results are kept in the result cache (combustion.cache) when the gas object comes from
+combustion.mechanism.solution().
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import cantera as ct
+import numpy as np
+
+from combustion import counters, profiling
+from combustion.cache import cached, make_key, result_cache, state
+from combustion.mechanism import solution, solution_key, source
+
+# smallest number of sensitivity parameters worth a worker process of their own
+MIN_CHUNK = 10
+
+
+def max_sensitivity(sim, r, t_end, dt=None, component='temperature'):
+	"""
+	Signed value of the largest |S| of one reactor component for every sensitivity parameter of sim
+
+	Samples are taken on a fixed grid of spacing dt up to t_end, or at every internal integrator
+	step if dt is None. The run is logged when solver statistics are on (combustion.profiling).
+	"""
+	clock = profiling.clock(sim)
+	T0, P0 = r.T, r.thermo.P
+	k = r.component_index(component)
+	S_max = np.zeros(sim.n_sensitivity_params)
+
+	def sample():
+		S = sim.sensitivities()[k]
+		larger = np.abs(S) > np.abs(S_max)
+		S_max[larger] = S[larger]
+
+	if dt is None:
+		step = clock.step if clock else sim.step
+		steps = 0
+		while sim.time < t_end:
+			step()
+			sample()
+			steps = steps + 1
+		counters.add('steps', steps)
+	else:
+		advance = clock.advance if clock else sim.advance
+		steps = None
+		for t in np.arange(0, t_end+dt, dt):
+			advance(t)
+			sample()
+
+	profiling.record('sensitivity', clock, steps, T0, P0, n_params = len(S_max), S_abs_max = np.max(np.abs(S_max), initial = 0))
+	return S_max
+
+
+def _integrate(gas, reactor, reactions, t_end, dt, tolerances):
+	# max_sensitivity() of a reactor started from the state of gas with the given sensitivity reactions
+	r = reactor(gas)
+	sim = ct.ReactorNet([r])
+
+	for i in reactions:
+		r.add_sensitivity_reaction(i)
+
+	sim.rtol, sim.atol, sim.rtol_sensitivity, sim.atol_sensitivity = tolerances
+
+	with profiling.profiled('sensitivity'):
+		return max_sensitivity(sim, r, t_end, dt = dt)
+
+
+def _run_chunk(task):
+	mech, phase, TDY, reactor, reactions, t_end, dt, tolerances = task
+	gas = solution(mech, phase)
+	gas.TDY = TDY
+	return _integrate(gas, reactor, reactions, t_end, dt, tolerances)
+
+
+def _chunks(reactions, gas, processes):
+	# reactions split into one chunk per worker, or a single chunk where the run stays in this process
+	if processes is None:
+		processes = os.cpu_count() or 1
+	# pool workers (of the reduction driver, ...) already run in parallel, and Solutions that
+	# did not come from solution() cannot be loaded by another process
+	if multiprocessing.parent_process() is not None or source(gas) is None:
+		processes = 1
+	n = max(1, min(processes, len(reactions)//MIN_CHUNK))
+	return [list(chunk) for chunk in np.array_split(reactions, n)] if n > 1 else [reactions]
+
+
+def max_temperature_sensitivity(gas, reactions, t_end, dt=None, reactor=ct.IdealGasReactor,
+		rtol=1e-6, atol=1e-15, rtol_sensitivity=1e-6, atol_sensitivity=1e-6, cache=True, processes=None):
+	"""
+	Largest temperature sensitivity to each of the given reactions for a reactor started from the state of gas
+
+	The reactions are split into one chunk per worker process (all cores by default), and every
+	worker integrates the same reactor with the sensitivity parameters of its chunk only.
+	"""
+	reactions = [int(i) for i in reactions]
+	tolerances = (rtol, atol, rtol_sensitivity, atol_sensitivity)
+
+	def compute():
+		chunks = _chunks(reactions, gas, processes)
+		if len(chunks) == 1:
+			return _integrate(gas, reactor, reactions, t_end, dt, tolerances)
+
+		tasks = [source(gas) + (gas.TDY, reactor, chunk, t_end, dt, tolerances) for chunk in chunks]
+		with ProcessPoolExecutor(max_workers = len(chunks)) as pool:
+			return np.concatenate(list(pool.map(_run_chunk, tasks)))
+
+	key = None
+	if solution_key(gas) is not None:
+		key = make_key('sensitivity', solution_key(gas), reactor.__name__, state(gas), reactions, t_end, dt,
+			rtol, atol, rtol_sensitivity, atol_sensitivity)
+
+	return cached(result_cache() if cache else None, key, compute)
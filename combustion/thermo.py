@@ -0,0 +1,92 @@
+"""
+Vectorized NASA 7-coefficient species properties
+
+Molar cp, h, s and u of the species used by the flame temperature scripts, evaluated in Horner form
+for a whole array of temperatures in one call. Each property function returns an array of shape
+T.shape + (n_species,), so the enthalpy of a mixture at every temperature is a single matrix product
+with the vector of species moles:
+
+	h_products = thermo.h(T, ['CO2', 'H2O', 'N2']) @ [1, 2, 7.52]
+
+Passing a single species name instead of a list drops the last axis.
+Coefficients are those of the GRI-Mech 3.0 thermo data; row i of both matrices belongs to SPECIES[i].
+"""
+
+import numpy as np
+
+R = 8.314 # J/mol-K
+T_MID = 1000.0 # K, switch between the low and the high temperature range
+
+SPECIES = ('CH4', 'C2H6', 'C3H8', 'C2H4', 'C2H2', 'O2', 'N2', 'CO2', 'H2O', 'CO', 'H2')
+
+# coefficients a1 ... a7 for the low temperature range (< 1000 K)
+COEFFS_LOW = np.array([
+	[5.14987613E+00, -1.36709788E-02, 4.91800599E-05, -4.84743026E-08, 1.66693956E-11, -1.02466476E+04, -4.64130376E+00], # CH4
+	[4.29142492E+00, -5.50154270E-03, 5.99438288E-05, -7.08466285E-08, 2.68685771E-11, -1.15222055E+04, 2.66682316E+00], # C2H6
+	[9.33553810E-01, 2.64245790E-02, 6.10597270E-06, -2.19774990E-08, 9.51492530E-12, -1.39585200E+04, 1.92016910E+01], # C3H8
+	[3.95920148E+00, -7.57052247E-03, 5.70990292E-05, -6.91588753E-08, 2.69884373E-11, 5.08977593E+03, 4.09733096E+00], # C2H4
+	[8.08681094E-01, 2.33615629E-02, -3.55171815E-05, 2.80152437E-08, -8.50072974E-12, 2.64289807E+04, 1.39397051E+01], # C2H2
+	[3.78245636E+00, -2.99673416E-03, 9.84730201E-06, -9.68129509E-09, 3.24372837E-12, -1.06394356E+03, 3.65767573E+00], # O2
+	[3.29867700E+00, 1.40824040E-03, -3.96322200E-06, 5.64151500E-09, -2.44485400E-12, -1.02089990E+03, 3.95037200E+00], # N2
+	[2.35677352E+00, 8.98459677E-03, -7.12356269E-06, 2.45919022E-09, -1.43699548E-13, -4.83719697E+04, 9.90105222E+00], # CO2
+	[4.19864056E+00, -2.03643410E-03, 6.52040211E-06, -5.48797062E-09, 1.77197817E-12, -3.02937267E+04, -8.49032208E-01], # H2O
+	[3.57953347E+00, -6.10353680E-04, 1.01681433E-06, 9.07005884E-10, -9.04424499E-13, -1.43440860E+04, 3.50840928E+00], # CO
+	[2.34433112E+00, 7.98052075E-03, -1.94781510E-05, 2.01572094E-08, -7.37611761E-12, -9.17935173E+02, 6.83010238E-01], # H2
+])
+
+# coefficients a1 ... a7 for the high temperature range (> 1000 K)
+COEFFS_HIGH = np.array([
+	[7.48514950E-02, 1.33909467E-02, -5.73285809E-06, 1.22292535E-09, -1.01815230E-13, -9.46834459E+03, 1.84373180E+01], # CH4
+	[1.07188150E+00, 2.16852677E-02, -1.00256067E-05, 2.21412001E-09, -1.90002890E-13, -1.14263932E+04, 1.51156107E+01], # C2H6
+	[7.53413680E+00, 1.88722390E-02, -6.27184910E-06, 9.14756490E-10, -4.78380690E-14, -1.64675160E+04, -1.78923490E+01], # C3H8
+	[2.03611116E+00, 1.46454151E-02, -6.71077915E-06, 1.47222923E-09, -1.25706061E-13, 4.93988614E+03, 1.03053693E+01], # C2H4
+	[4.14756964E+00, 5.96166664E-03, -2.37294852E-06, 4.67412171E-10, -3.61235213E-14, 2.59359992E+04, -1.23028121E+00], # C2H2
+	[3.28253784E+00, 1.48308754E-03, -7.57966669E-07, 2.09470555E-10, -2.16717794E-14, -1.08845772E+03, 5.45323129E+00], # O2
+	[2.92664000E+00, 1.48797680E-03, -5.68476000E-07, 1.00970380E-10, -6.75335100E-15, -9.22797700E+02, 5.98052800E+00], # N2
+	[3.85746029E+00, 4.41437026E-03, -2.21481404E-06, 5.23490188E-10, -4.72084164E-14, -4.87591660E+04, 2.27163806E+00], # CO2
+	[3.03399249E+00, 2.17691804E-03, -1.64072518E-07, -9.70419870E-11, 1.68200992E-14, -3.00042971E+04, 4.96677010E+00], # H2O
+	[2.71518561E+00, 2.06252743E-03, -9.98825771E-07, 2.30053008E-10, -2.03647716E-14, -1.41518724E+04, 7.81868772E+00], # CO
+	[3.33727920E+00, -4.94024731E-05, 4.99456778E-07, -1.79566394E-10, 2.00255376E-14, -9.50158922E+02, -3.20502331E+00], # H2
+])
+
+
+def index(species):
+	# row indices of one species name or a sequence of names
+	if isinstance(species, str):
+		return SPECIES.index(species)
+	return np.array([SPECIES.index(name) for name in species], dtype = int)
+
+
+def _coeffs(T, species):
+	# temperature broadcast against the species axis, and the coefficients a1 ... a7 picked from the
+	# right temperature range as a (7, ...) array; a single species name drops the species axis
+	T = np.asarray(T, dtype = float)
+	idx = slice(None) if species is None else index(species)
+	if not isinstance(species, str):
+		T = T[..., None]
+	a = np.where((T < T_MID)[..., None], COEFFS_LOW[idx], COEFFS_HIGH[idx])
+	return T, np.moveaxis(a, -1, 0)
+
+
+def cp(T, species=None):
+	# molar specific heat at constant pressure (J/mol-K)
+	T, a = _coeffs(T, species)
+	return R*(a[0] + T*(a[1] + T*(a[2] + T*(a[3] + T*a[4]))))
+
+
+def h(T, species=None):
+	# molar enthalpy (J/mol)
+	T, a = _coeffs(T, species)
+	return R*(a[5] + T*(a[0] + T*(a[1]/2 + T*(a[2]/3 + T*(a[3]/4 + T*a[4]/5)))))
+
+
+def u(T, species=None):
+	# molar internal energy (J/mol)
+	T, a = _coeffs(T, species)
+	return R*(a[5] + T*(a[0] - 1 + T*(a[1]/2 + T*(a[2]/3 + T*(a[3]/4 + T*a[4]/5)))))
+
+
+def s(T, species=None):
+	# molar entropy at the standard pressure (J/mol-K)
+	T, a = _coeffs(T, species)
+	return R*(a[0]*np.log(T) + T*(a[1] + T*(a[2]/2 + T*(a[3]/3 + T*a[4]/4))) + a[6])
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# the checks run on fresh results only and import the package from the repository, as the scripts do
+os.environ['COMBUSTION_RESULT_CACHE'] = ''
+os.environ.setdefault('MPLBACKEND', 'Agg')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
@@ -0,0 +1,57 @@
+import numpy as np
+import cantera as ct
+import pytest
+
+from combustion.aft import PRODUCTS, adiabatic_flame_temperature, fuel_atoms, products
+
+T_STD = 298.15
+
+
+@pytest.fixture(scope = 'module')
+def gas():
+	return ct.Solution('gri30.yaml')
+
+
+def _cantera(gas, fuel, phi, mode):
+	# flame temperature of the same frozen products with Cantera's gri30 thermo
+	x, y = fuel_atoms(fuel)
+	n_o2 = (x + y/4)/phi
+	gas.TPX = T_STD, ct.one_atm, {fuel: 1, 'O2': n_o2, 'N2': 3.76*n_o2}
+	h, u, v = gas.enthalpy_mass, gas.int_energy_mass, gas.volume_mass
+	gas.TPX = T_STD, ct.one_atm, dict(zip(PRODUCTS, products(x, y, phi)))
+	if mode == 'UV':
+		gas.UV = u, v
+	else:
+		gas.HP = h, ct.one_atm
+	return gas.T
+
+
+@pytest.mark.parametrize('mode', ['HP', 'UV'])
+@pytest.mark.parametrize('fuel', ['CH4', 'C3H8', 'C2H4'])
+def test_against_cantera(gas, fuel, mode):
+	phi = np.array([0.7, 1.0, 1.3])
+	T = adiabatic_flame_temperature(fuel, phi, mode = mode)
+	assert np.allclose(T, [_cantera(gas, fuel, p, mode) for p in phi], atol = 0.01)
+
+
+def test_heat_loss_and_broadcasting():
+	T = adiabatic_flame_temperature(['CH4', 'C2H6'], 1.0, heat_loss = [[0.0], [0.2]])
+	assert T.shape == (2, 2)
+	assert np.all(T[1] < T[0])
+
+
+def test_unknown_mode():
+	with pytest.raises(ValueError):
+		adiabatic_flame_temperature('CH4', 1.0, mode = 'hp')
+
+
+def test_rich_limit():
+	# C2H2 has enough oxygen for CO up to phi = 2.5, richer mixtures have no valid products
+	phi = np.array([1.5, 2.4, 2.6, 3.0])
+	N = products(2, 2, phi)
+	assert np.all(N[:2] >= 0)
+	assert np.all(np.isnan(N[2:]))
+
+	T = adiabatic_flame_temperature('C2H2', phi)
+	assert np.all(np.isfinite(T[:2])) and np.all(np.isnan(T[2:]))
+	assert np.isfinite(adiabatic_flame_temperature('CH4', 3.9))
@@ -0,0 +1,33 @@
+import numpy as np
+
+from combustion.cache import ResultCache, cached, composition, make_key
+
+
+def test_keys():
+	assert composition('CH4:1, O2:2') == composition({'O2': 4, 'CH4': 2})
+	assert make_key('a', {'x': 1, 'y': np.arange(3)}) == make_key('a', {'y': np.arange(3), 'x': 1})
+	assert make_key('a', 1.0) != make_key('b', 1.0)
+	assert make_key('a', np.arange(3)) != make_key('a', np.arange(4))
+
+
+def test_round_trip_and_cached(tmp_path):
+	cache = ResultCache(str(tmp_path/'results.sqlite'))
+	cache.put('k', {'t_ign': np.array([1.0, 2.0])})
+	assert np.array_equal(cache.get('k')['t_ign'], [1.0, 2.0])
+	assert cache.get('missing') is None
+
+	calls = []
+	for i in range(2):
+		assert cached(cache, 'c', lambda: calls.append(1) or 42) == 42
+	assert len(calls) == 1
+
+
+def test_evicts_least_recently_used(tmp_path):
+	cache = ResultCache(str(tmp_path/'results.sqlite'), max_bytes = 5000)
+	for name in ['old%d' %i for i in range(10)] + ['new%d' %i for i in range(10)]:
+		cache.put(name, b'x'*400)
+		cache.get('old0') # keeps one old row in use
+
+	assert cache._total() <= cache.max_bytes
+	assert cache.get('old0') is not None and cache.get('old1') is None
+	assert cache.get('new9') is not None
@@ -0,0 +1,48 @@
+import cantera as ct
+import numpy as np
+import pytest
+
+from combustion.delay_sensitivity import ignition_delay_sensitivity
+from combustion.ignition import ignition_delay
+from combustion.mechanism import solution
+
+STATE = (1000.0, ct.one_atm, 'H2:2, O2:1, N2:3.76')
+T_END = 0.05
+
+
+@pytest.fixture(scope = 'module')
+def gas():
+	return solution('h2o2.yaml')
+
+
+@pytest.fixture(scope = 'module')
+def reactions(gas):
+	return [gas.reaction_equations().index(equation) for equation in ('H + O2 <=> O + OH', 'H + O2 + M <=> HO2 + M', 'H2 + OH <=> H + H2O')]
+
+
+def test_central_differences(gas, reactions):
+	result = ignition_delay_sensitivity('h2o2.yaml', *STATE, reactions = reactions, t_end = T_END, processes = 1, cache = False)
+	assert result['tau'] == pytest.approx(ignition_delay(gas, *STATE, t_end = T_END))
+
+	# the perturbed runs are plain ignition delays of the mechanism with one multiplier changed
+	for i, tau_plus in zip(reactions, result['tau_plus']):
+		gas.set_multiplier(1.05, i)
+		try:
+			assert tau_plus == pytest.approx(ignition_delay(gas, *STATE, t_end = T_END))
+		finally:
+			gas.set_multiplier(1.0, i)
+
+	# chain branching speeds ignition up, the HO2 recombination slows it down
+	S = result['S']
+	assert S[0] < -0.5 and S[1] > 0 and abs(S[0]) > abs(S[2])
+
+
+def test_pool_matches_single_process(reactions):
+	single = ignition_delay_sensitivity('h2o2.yaml', *STATE, reactions = reactions, t_end = T_END, processes = 1, cache = False)
+	pool = ignition_delay_sensitivity('h2o2.yaml', *STATE, reactions = reactions, t_end = T_END, processes = 2, cache = False)
+	assert np.array_equal(pool['S'], single['S'])
+
+
+def test_no_ignition():
+	with pytest.raises(ValueError):
+		ignition_delay_sensitivity('h2o2.yaml', 600.0, ct.one_atm, STATE[2], reactions = [0], t_end = 1e-3, processes = 1, cache = False)
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from combustion.equilibrium import equilibrium_sweep
+from combustion.mechanism import solution
+
+PHI = np.array([0.6, 0.9, 1.0, 1.3, 1.6])
+SPECIES = ('CO', 'OH', 'H2')
+
+
+@pytest.fixture(scope = 'module')
+def gas():
+	return solution('gri30.yaml')
+
+
+@pytest.mark.parametrize('mode', ['HP', 'UV'])
+@pytest.mark.parametrize('seed', ['products', 'continuation'])
+def test_seeds_match_fresh_reactants(gas, mode, seed):
+	# warm-started solves end on the equilibria of cold starts, in the order of the arguments
+	fuel = np.array([['CH4'], ['C3H8']])
+	fresh = equilibrium_sweep(gas, fuel, PHI, mode = mode, seed = 'reactants', species = SPECIES, cache = False)
+	seeded = equilibrium_sweep(gas, fuel, PHI, mode = mode, seed = seed, species = SPECIES, cache = False)
+	assert seeded['T'].shape == (2, len(PHI))
+	assert np.allclose(seeded['T'], fresh['T'], rtol = 0, atol = 1e-3)
+	for name in SPECIES:
+		assert np.allclose(seeded[name], fresh[name], rtol = 1e-4, atol = 1e-9)
+
+
+def test_beyond_rich_limit(gas):
+	# C2H2 above phi = 2.5 has no major-product seed and is solved from the reactants
+	phi = np.array([2.0, 2.8])
+	fresh = equilibrium_sweep(gas, 'C2H2', phi, seed = 'reactants', cache = False)['T']
+	for seed in ('products', 'continuation'):
+		assert np.allclose(equilibrium_sweep(gas, 'C2H2', phi, seed = seed, cache = False)['T'], fresh, rtol = 0, atol = 1e-3)
+
+
+def test_unknown_seed(gas):
+	with pytest.raises(ValueError):
+		equilibrium_sweep(gas, 'CH4', 1.0, seed = 'previous')
@@ -0,0 +1,64 @@
+import numpy as np
+import cantera as ct
+import pytest
+
+from combustion import drg
+from combustion.export import reduced_solution, used_species, validate, write_mechanism
+from combustion.mechanism import solution
+
+AIR = 'O2:1, N2:3.76'
+
+
+@pytest.fixture(scope = 'module')
+def gas():
+	return solution('gri30.yaml')
+
+
+@pytest.fixture(scope = 'module')
+def reactions(gas):
+	# a closed DRGEP skeleton of methane ignition
+	gas.TP = 1150.0, 5e5
+	gas.set_equivalence_ratio(1.0, 'CH4', AIR)
+	states = drg.sample_states(gas, 5.0)
+	importance = drg.species_importance(gas, states, drg.targets(gas, 'CH4', AIR), 'drgep')
+	return drg.skeleton(gas, importance, 1e-3)[1]
+
+
+def test_explicit_third_bodies_kept(gas):
+	i = gas.reaction_equations().index('H + O2 + AR <=> HO2 + AR')
+	assert 'AR' in used_species(gas, [i])
+	reduced = reduced_solution(gas, [i])
+	assert reduced.n_reactions == 1 and 'AR' in reduced.species_names
+
+
+def test_keep_unused_species(gas):
+	i = gas.reaction_equations().index('2 O + M <=> O2 + M')
+	reduced = reduced_solution(gas, [i], keep = drg.mixture_species(gas, 'CH4') + drg.mixture_species(gas, AIR))
+	assert set(reduced.species_names) == {'O', 'O2', 'CH4', 'N2'}
+	reduced.set_equivalence_ratio(1.0, 'CH4', AIR)
+
+
+def test_round_trip(gas, reactions, tmp_path):
+	keep = drg.mixture_species(gas, 'CH4') + drg.mixture_species(gas, AIR)
+	reduced = reduced_solution(gas, reactions, keep = keep)
+	assert reduced.n_reactions == len(reactions) < gas.n_reactions
+	assert reduced.n_species < gas.n_species
+
+	path = str(tmp_path/'reduced.yaml')
+	write_mechanism(reduced, path)
+	loaded = ct.Solution(path)
+	assert loaded.species_names == reduced.species_names
+	assert loaded.reaction_equations() == [gas.reaction(i).equation for i in sorted(reactions)]
+
+	# same rates as the reactions of the full mechanism in the same state
+	gas.TPX = 1500.0, 5e5, 'CH4:1, O2:2, N2:7.52, OH:0.01, H:0.01, HO2:0.001'
+	loaded.TPX = gas.T, gas.P, {name: x for name, x in gas.mole_fraction_dict().items() if name in loaded.species_names}
+	assert np.allclose(loaded.net_rates_of_progress, gas.net_rates_of_progress[sorted(reactions)], rtol = 1e-8, atol = 1e-20)
+
+	# the reloaded file ignites like the in-memory mechanism (errors in %), and within 1 % of the full one
+	states = [(1150.0, 5e5, 1.0), (1050.0, 3e5, 0.5)]
+	report = validate(reduced, loaded, 'CH4', AIR, states, 5.0, 1e-3, 1e-3)
+	assert report['passed'].all()
+	report = validate(gas, loaded, 'CH4', AIR, states, 5.0, 1, 1)
+	assert report['passed'].all()
+	assert list(report['n_species']) == [gas.n_species, loaded.n_species]
@@ -0,0 +1,26 @@
+import cantera as ct
+import pytest
+
+from combustion.flame import STAGES, staged_solve
+from combustion.mechanism import solution
+
+STAGES_COARSE = STAGES[:2]
+
+
+def _h2_air():
+	gas = solution('h2o2.yaml')
+	gas.TP = 300.0, ct.one_atm
+	gas.set_equivalence_ratio(1.0, 'H2', 'O2:1, N2:3.76')
+	return gas
+
+
+def test_multicomponent_stage_restores_transport():
+	# the multicomponent stage must not leave the shared Solution of the registry with multicomponent transport
+	gas = _h2_air()
+	transport_model = gas.transport_model
+	Su = staged_solve(gas, stages = STAGES_COARSE)[1][-1][3]
+
+	report = staged_solve(_h2_air(), stages = STAGES_COARSE, multicomponent = True)[1]
+	assert report[-1][0] == 'multicomponent'
+	assert solution('h2o2.yaml').transport_model == transport_model
+	assert staged_solve(_h2_air(), stages = STAGES_COARSE)[1][-1][3] == pytest.approx(Su, rel = 1e-6)
@@ -0,0 +1,75 @@
+import numpy as np
+import cantera as ct
+import pytest
+
+from combustion.ignition import detect_ignition, ignition_delay, sweep
+from combustion.mechanism import solution
+
+X = 'CH4:1, O2:2, N2:7.52'
+
+
+def _reference(gas, T, P, dT_ign=400, dt=1e-6, t_end=0.05):
+	# threshold crossing on a fine uniform time grid
+	gas.TPX = T, P, X
+	r = ct.IdealGasReactor(gas)
+	sim = ct.ReactorNet([r])
+	t = T_old = 0
+	while t < t_end:
+		sim.advance(t + dt)
+		if r.T >= T + dT_ign:
+			return t + dt*(T + dT_ign - T_old)/(r.T - T_old)
+		t = t + dt
+		T_old = r.T
+	return np.nan
+
+
+@pytest.fixture(scope = 'module')
+def gas():
+	return solution('gri30.yaml')
+
+
+@pytest.mark.parametrize('T', [1300.0, 1500.0])
+def test_threshold_against_fine_grid(gas, T):
+	t_ign = ignition_delay(gas, T, 20*ct.one_atm, X, t_end = 0.05)
+	assert t_ign == pytest.approx(_reference(gas, T, 20*ct.one_atm), rel = 5e-3)
+
+
+def test_dTdt_after_threshold(gas):
+	# the fastest temperature rise comes shortly after T0 + 400 K for a methane ignition
+	t_threshold = ignition_delay(gas, 1400.0, 20*ct.one_atm, X, t_end = 0.05)
+	t_peak = ignition_delay(gas, 1400.0, 20*ct.one_atm, X, t_end = 0.05, method = 'dTdt')
+	assert t_threshold < t_peak < 1.1*t_threshold
+
+
+def test_no_ignition(gas):
+	gas.TPX = 600.0, ct.one_atm, X
+	r = ct.IdealGasReactor(gas)
+	t_ign, T_max = detect_ignition(ct.ReactorNet([r]), r, 1000.0, t_end = 1e-3, full = True)
+	assert np.isnan(t_ign) and T_max == pytest.approx(600.0, abs = 1)
+
+
+def test_stops_at_t_end(gas):
+	# the run ends exactly at t_end, and an ignition just after it is not seen
+	gas.TPX = 600.0, ct.one_atm, X
+	r = ct.IdealGasReactor(gas)
+	sim = ct.ReactorNet([r])
+	detect_ignition(sim, r, 1000.0, t_end = 1e-3, full = True)
+	assert sim.time == 1e-3
+
+	t_ign = ignition_delay(gas, 1400.0, 20*ct.one_atm, X, t_end = 0.05)
+	for t_end, full in ((0.99*t_ign, True), (1.01*t_ign, False), (1.01*t_ign, True)):
+		gas.TPX = 1400.0, 20*ct.one_atm, X
+		r = ct.IdealGasReactor(gas)
+		sim = ct.ReactorNet([r])
+		t, T_max = detect_ignition(sim, r, 1800.0, t_end = t_end, full = full)
+		assert sim.time <= t_end
+		if t_end < t_ign:
+			assert np.isnan(t) and T_max < 1800.0
+		else:
+			assert t <= t_end and t == pytest.approx(t_ign, rel = 1e-3)
+
+
+def test_sweep_matches_single_runs(gas):
+	T = np.array([1300.0, 1400.0])
+	t_ign = sweep('gri30.yaml', T, 20*ct.one_atm, X, processes = 1, t_end = 0.05)[0]
+	assert np.allclose(t_ign, [ignition_delay(gas, T_i, 20*ct.one_atm, X, t_end = 0.05) for T_i in T])
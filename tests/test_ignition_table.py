@@ -0,0 +1,58 @@
+import numpy as np
+import cantera as ct
+
+from combustion.ignition import ignition_delay
+from combustion.ignition_table import build_table, load_or_build
+from combustion.mechanism import solution
+
+H2_AIR = ('h2o2.yaml', 'H2', 'O2:1, N2:3.76')
+
+
+def test_h2_lookup_within_tolerance():
+	# interpolated delays of random H2-air states against direct reactor runs
+	tol = 0.1
+	T_range, P_range, phi_range = (1000, 1400), (1*ct.one_atm, 10*ct.one_atm), (0.5, 2.0)
+	table = build_table(*H2_AIR, T_range, P_range, phi_range, tol = tol, t_end = 0.1, processes = 1)
+
+	rng = np.random.default_rng(0)
+	T = rng.uniform(*T_range, 20)
+	P = np.exp(rng.uniform(np.log(P_range[0]), np.log(P_range[1]), 20))
+	phi = rng.uniform(*phi_range, 20)
+
+	gas = solution(H2_AIR[0])
+	tau = []
+	for T_i, P_i, phi_i in zip(T, P, phi):
+		gas.set_equivalence_ratio(phi_i, H2_AIR[1], H2_AIR[2])
+		tau.append(ignition_delay(gas, T_i, P_i, gas.X, t_end = 0.1))
+
+	assert np.max(np.abs(np.log(table.lookup(T, P, phi)/np.array(tau)))) <= 2*tol
+
+
+def test_stored_table_rebuilt_for_other_inputs(tmp_path):
+	path = str(tmp_path/'table.npz')
+	args = H2_AIR + ((1000, 1200), (ct.one_atm, 5*ct.one_atm), (1.0, 1.0))
+
+	table = load_or_build(path, *args, n = (3, 2, 1), tol = 10, t_end = 0.1, processes = 1)
+	table.ln_tau[:] = 0
+	table.save(path)
+
+	# same inputs: the stored table, different ones: a new table
+	assert np.all(load_or_build(path, *args, n = (3, 2, 1), tol = 10, t_end = 0.1, processes = 1).ln_tau == 0)
+	rebuilt = load_or_build(path, *args, n = (3, 2, 1), tol = 10, t_end = 0.05, processes = 1)
+	assert np.all(rebuilt.ln_tau < 0)
+	assert rebuilt.inputs['t_end'] == 0.05
+
+
+def test_stored_table_rebuilt_for_default_settings(tmp_path):
+	# a table built with non-default ignition settings is not reused by a call that leaves them out
+	path = str(tmp_path/'table.npz')
+	args = H2_AIR + ((1000, 1200), (ct.one_atm, ct.one_atm), (1.0, 1.0))
+
+	table = load_or_build(path, *args, n = (2, 1, 1), tol = 10, t_end = 0.5, dT_ign = 100, processes = 1)
+	table.ln_tau[:] = 0
+	table.save(path)
+
+	assert np.all(load_or_build(path, *args, n = (2, 1, 1), tol = 10, t_end = 0.5, dT_ign = 100, processes = 1).ln_tau == 0)
+	rebuilt = load_or_build(path, *args, n = (2, 1, 1), tol = 10, processes = 1)
+	assert np.all(rebuilt.ln_tau < 0)
+	assert rebuilt.inputs['t_end'] == 10 and rebuilt.inputs['dT_ign'] == 400
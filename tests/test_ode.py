@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from combustion import ode
+
+# dy/dt = -y, y(0) = 1, a non-stiff problem for the explicit Runge-Kutta pair
+DECAY = ode.Problem(f = lambda t, y: -y, jac = lambda t, y: -np.ones_like(y), dfdt = lambda t, y: np.zeros_like(y),
+	exact = lambda t, y0: y0*np.exp(-t))
+
+
+def _order(h, error):
+	# observed order of convergence from errors at step sizes h, h/2, h/4, ...
+	return np.log(error[:-1]/error[1:])/np.log(h[:-1]/h[1:])
+
+
+@pytest.mark.parametrize('method, order', [('euler', 1), ('backward', 1), ('trapezoidal', 2), ('bdf2', 2)])
+def test_fixed_step_orders(method, order):
+	# step sizes within the stability limit of explicit Euler, error at t_end where the transient has died out
+	h = np.array([0.001, 0.0005, 0.00025])
+	res = ode.integrate(method, h = h, t_end = 0.5)
+	assert np.allclose(_order(h, res['end_error']), order, atol = 0.1)
+
+
+def _fixed_pair(step, problem, h, t_end, y0):
+	# end error of an adaptive method's step run with fixed step sizes
+	y = np.full(len(h), float(y0))
+	t = np.zeros(len(h))
+	counter = ode._Counter(problem, y.shape)
+	while True:
+		active = t < t_end - 1e-9
+		if not active.any():
+			break
+		y = np.where(active, step(problem, counter, t, y, h, active)[0], y)
+		t = np.where(active, t + h, t)
+	return np.abs(y - problem.exact(t, y0))
+
+
+def test_rosenbrock_order():
+	h = np.array([0.025, 0.0125, 0.00625])
+	error = _fixed_pair(ode._rosenbrock_step, DECAY, h, 1.0, 1.0)
+	assert np.allclose(_order(h, error), 2, atol = 0.1)
+
+	# L-stable: steps far beyond the explicit stability limit (h = 0.002) stay accurate on the stiff problem
+	assert np.all(_fixed_pair(ode._rosenbrock_step, ode.STIFF, np.array([0.01, 0.05, 0.1]), 0.5, 0.0) < 1e-2)
+
+
+def test_rk23_order():
+	h = np.array([0.1, 0.05, 0.025])
+	error = _fixed_pair(ode._rk23_step, DECAY, h, 1.0, 1.0)
+	assert np.allclose(_order(h, error), 3, atol = 0.1)
+
+
+@pytest.mark.parametrize('method', ode.ADAPTIVE)
+def test_adaptive_tolerances(method):
+	rtol = np.array([1e-3, 1e-5, 1e-7])
+	res = ode.integrate(method, h = 1e-6, rtol = rtol, atol = 1e-3*rtol, t_end = 0.5)
+	assert np.all(np.diff(res['error']) < 0) and np.all(np.diff(res['steps']) > 0)
+	assert np.all(res['error'] < 10*rtol)
+
+
+def test_bdf2_start_differs_from_backward_euler():
+	h = np.array([0.001, 0.002, 0.005, 0.01])
+	assert np.all(ode.integrate('bdf2', h = h)['error'] < ode.integrate('backward', h = h)['error'])
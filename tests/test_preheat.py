@@ -0,0 +1,62 @@
+import cantera as ct
+import numpy as np
+
+from combustion.analyses import preheating
+from combustion.mechanism import solution
+from combustion.preheat import efficiency, flame_temperature
+
+T_AIR = np.array([298.0, 400.0, 500.0])
+
+
+def test_efficiency_without_flame_sweep():
+	full = preheating('gri30.yaml', T_AIR)
+	quick = preheating('gri30.yaml', T_AIR, flame = False)
+	assert quick.T_mix is None and quick.T_ad is None
+	assert np.array_equal(quick.T_air, full.T_air)
+	assert np.array_equal(quick.efficiency, full.efficiency)
+
+
+def _quantities(gas, T_air):
+	# the loop of the original scripts: new air and fuel Quantity objects for every air temperature
+	air = ct.Quantity(gas)
+	air.TPX = T_air, ct.one_atm, 'O2:1, N2:3.76'
+	air.moles = 9.52
+	fuel = ct.Quantity(gas)
+	fuel.TPX = 298.0, ct.one_atm, 'CH4:1'
+	fuel.moles = 1
+	return air, fuel
+
+
+def test_efficiency_matches_quantity_balance():
+	gas = solution('gri30.yaml')
+	flue = ct.Quantity(gas)
+	flue.TPX = 1700.0, ct.one_atm, 'CO2:1, H2O:2, N2:7.52'
+	flue.moles = 10.52
+
+	expected = []
+	for T in T_AIR:
+		air, fuel = _quantities(gas, T)
+		Q = (air.enthalpy + fuel.enthalpy - flue.enthalpy)/fuel.mass
+		expected.append(Q/50e6)
+
+	assert np.allclose(efficiency(gas, 'CH4', T_AIR)['efficiency'], expected, rtol = 1e-9)
+
+
+def test_flame_temperature_matches_cold_equilibria():
+	# the sweep starts every point from the previous equilibrium, the reference from the unburnt mixture
+	# (mixed by hand: Quantity + Quantity on one shared Solution reads the state of the last one set)
+	gas = solution('gri30.yaml')
+	T_mix = []
+	T_ad = []
+	for T in T_AIR:
+		air, fuel = _quantities(gas, T)
+		H = air.enthalpy + fuel.enthalpy
+		m = air.mass + fuel.mass
+		gas.HPX = H/m, ct.one_atm, 'CH4:1, O2:2, N2:7.52'
+		T_mix.append(gas.T)
+		gas.equilibrate('UV')
+		T_ad.append(gas.T)
+
+	result = flame_temperature(gas, 'CH4', T_AIR, cache = False)
+	assert np.allclose(result['T_mix'], T_mix, rtol = 1e-9)
+	assert np.allclose(result['T_ad'], T_ad, rtol = 1e-6)
@@ -0,0 +1,48 @@
+import cantera as ct
+import numpy as np
+import pytest
+
+from combustion.mechanism import solution
+from combustion.recorder import TrajectoryRecorder
+
+SPECIES = ['H2', 'O2', 'H2O', 'OH']
+
+
+def _record(**kwargs):
+	gas = solution('h2o2.yaml')
+	gas.TPX = 1000.0, ct.one_atm, 'H2:2, O2:1, N2:3.76'
+	r = ct.IdealGasReactor(gas)
+	rec = TrajectoryRecorder(gas, SPECIES, **kwargs)
+	rec.record(ct.ReactorNet([r]), r.thermo, 1e-3)
+	return rec
+
+
+@pytest.fixture(scope = 'module')
+def full():
+	return _record()
+
+
+def test_memmap_round_trip(tmp_path, full):
+	# chunks of 16 rows flushed to a file and read back as a memory map
+	path = str(tmp_path/'trajectory.bin')
+	rec = _record(capacity = 16, path = path)
+	assert len(rec) == len(full) > 16
+	assert isinstance(rec.data, np.memmap)
+	assert np.array_equal(rec.data, full.data)
+	assert np.array_equal(rec.X('OH'), full.X('OH'))
+	assert np.fromfile(path).size == len(full)*len(rec.columns)
+
+
+def test_decimation(full):
+	tol = 0.05
+	rec = _record(decimate = tol)
+	kept = rec.data
+	assert 1 < len(kept) < len(full)/2
+	# first and last states are always kept
+	assert np.array_equal(kept[[0, -1]], full.data[[0, -1]])
+
+	# every dropped state is within tol of the last state kept before it
+	previous = np.searchsorted(kept[:, 0], full.time, side = 'right') - 1
+	change = np.abs(full.data[:, 1:] - kept[previous, 1:])/(np.abs(kept[previous, 1:]) + rec.atol)
+	dropped = ~np.isin(full.time, kept[:, 0])
+	assert dropped.any() and np.all(change[dropped].max(axis = 1) <= tol)
@@ -0,0 +1,59 @@
+import cantera as ct
+import numpy as np
+import pytest
+
+from combustion import reduction
+from combustion.export import reduced_solution
+from combustion.ignition import detect_ignition
+from combustion.mechanism import solution
+from combustion.reactors import reactor_network
+
+STATES = [(1000.0, 101325.0, 1.0)]
+KWARGS = {'t_end': 0.05, 'method': 'drgep'}
+
+
+@pytest.fixture
+def runs(monkeypatch):
+	# phase tasks that were computed, not loaded from a checkpoint
+	calls = []
+	run_task = reduction._run_task
+	monkeypatch.setattr(reduction, '_run_task', lambda task: calls.append(task) or run_task(task))
+	return calls
+
+
+def test_checkpoints_follow_air_and_mechanism(tmp_path, runs):
+	ck = str(tmp_path/'checkpoints')
+	n2 = reduction.run_states('h2o2.yaml', 'rank', 'H2', 'O2:1, N2:3.76', STATES, ck, processes = 1, **KWARGS)
+	assert len(runs) == 1
+
+	# same inputs: loaded from the checkpoint
+	again = reduction.run_states('h2o2.yaml', 'rank', 'H2', 'O2:1, N2:3.76', STATES, ck, processes = 1, **KWARGS)
+	assert len(runs) == 1 and again[0]['ign_delay_ref'] == n2[0]['ign_delay_ref']
+
+	# another oxidizer: recomputed
+	ar = reduction.run_states('h2o2.yaml', 'rank', 'H2', 'O2:1, AR:3.76', STATES, ck, processes = 1, **KWARGS)
+	assert len(runs) == 2 and ar[0]['ign_delay_ref'] != n2[0]['ign_delay_ref']
+
+	# another mechanism file: recomputed
+	mech = str(tmp_path/'h2o2_copy.yaml')
+	ct.Solution('h2o2.yaml').write_yaml(mech)
+	reduction.run_states(mech, 'rank', 'H2', 'O2:1, AR:3.76', STATES, ck, processes = 1, **KWARGS)
+	assert len(runs) == 3
+
+
+def test_multiplier_trials_match_rebuilt_mechanism():
+	# trials on the full mechanism with the other reactions switched off against a reduced Solution built from scratch
+	gas = solution('h2o2.yaml')
+	T, P, phi = STATES[0]
+	order = reduction.rank_state(gas, 'H2', 'O2:1, N2:3.76', T, P, phi, 0.05, integration = 'dense', method = 'drgep')['order']
+
+	for n in (16, 20, 28): # no ignition, a wrong delay, close to the full mechanism
+		trial = reduction._trial(gas, 'H2', 'O2:1, N2:3.76', T, P, phi, 0.05, order[:n], integration = 'dense')
+		assert np.all(gas.forward_rate_constants > 0) # multipliers are back to 1
+
+		reduced = reduced_solution(gas, order[:n], keep = ('H2', 'O2', 'N2'))
+		reduced.TP = T, P
+		reduced.set_equivalence_ratio(phi, 'H2', 'O2:1, N2:3.76')
+		r, sim = reactor_network(reduced, 'dense')
+		rebuilt = detect_ignition(sim, r, T + 400, t_end = 0.05, full = True)
+		assert np.allclose(trial, rebuilt, rtol = 1e-4, equal_nan = True)
@@ -0,0 +1,52 @@
+import cantera as ct
+import numpy as np
+import pytest
+
+from combustion.mechanism import solution
+from combustion.sensitivity import max_temperature_sensitivity
+
+T_END = 1e-3
+
+
+@pytest.fixture
+def gas():
+	gas = solution('h2o2.yaml')
+	gas.TP = 1000.0, ct.one_atm
+	gas.set_equivalence_ratio(1.0, 'H2', 'O2:1, N2:3.76')
+	return gas
+
+
+def _per_reaction(gas):
+	# the old ranking loop: one sim.sensitivity() call per reaction and step
+	r = ct.IdealGasReactor(gas)
+	sim = ct.ReactorNet([r])
+	for i in range(gas.n_reactions):
+		r.add_sensitivity_reaction(i)
+	sim.rtol, sim.atol, sim.rtol_sensitivity, sim.atol_sensitivity = 1e-6, 1e-15, 1e-6, 1e-6
+
+	S_max = np.zeros(gas.n_reactions)
+	while sim.time < T_END:
+		sim.step()
+		for i in range(gas.n_reactions):
+			S = sim.sensitivity('temperature', i)
+			if abs(S) > abs(S_max[i]):
+				S_max[i] = S
+	return S_max
+
+
+def test_bulk_fetch_matches_per_reaction_loop(gas):
+	state = gas.TDY
+	S_max = max_temperature_sensitivity(gas, range(gas.n_reactions), T_END, processes = 1)
+	gas.TDY = state
+	assert np.allclose(S_max, _per_reaction(gas), rtol = 1e-9, atol = 0)
+
+
+def test_chunks_match_single_process(gas):
+	# two worker processes with half of the parameters each against one run with all of them
+	reactions = range(gas.n_reactions)
+	state = gas.TDY
+	single = max_temperature_sensitivity(gas, reactions, T_END, processes = 1)
+	gas.TDY = state # the run leaves gas in its final state
+	chunked = max_temperature_sensitivity(gas, reactions, T_END, processes = 2)
+	assert np.allclose(chunked, single, rtol = 1e-3, atol = 1e-3*np.abs(single).max())
+	assert np.array_equal(np.argsort(-np.abs(chunked))[:5], np.argsort(-np.abs(single))[:5])
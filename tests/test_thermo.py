@@ -0,0 +1,29 @@
+import numpy as np
+import cantera as ct
+import pytest
+
+from combustion import thermo
+
+T = np.array([300.0, 700.0, 999.0, 1001.0, 1500.0, 2500.0])
+
+
+@pytest.fixture(scope = 'module')
+def gas():
+	return ct.Solution('gri30.yaml')
+
+
+@pytest.mark.parametrize('name', thermo.SPECIES)
+def test_nasa7_against_cantera(gas, name):
+	# dimensionless cp, h and s of the GRI-Mech 3.0 coefficients against Cantera's gri30
+	k = gas.species_index(name)
+	for T_i, cp, h, s in zip(T, thermo.cp(T, name), thermo.h(T, name), thermo.s(T, name)):
+		gas.TP = T_i, ct.one_atm
+		assert cp/thermo.R == pytest.approx(gas.standard_cp_R[k], rel = 1e-6)
+		assert h/(thermo.R*T_i) == pytest.approx(gas.standard_enthalpies_RT[k], rel = 1e-6)
+		assert s/thermo.R == pytest.approx(gas.standard_entropies_R[k], rel = 1e-6)
+
+
+def test_u_and_shapes():
+	assert thermo.h(T).shape == T.shape + (len(thermo.SPECIES),)
+	assert thermo.h(T, ['CO2', 'H2O']).shape == T.shape + (2,)
+	assert np.allclose(thermo.u(T, 'N2'), thermo.h(T, 'N2') - thermo.R*T)